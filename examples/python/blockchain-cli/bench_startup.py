@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+CLI Startup Benchmark
+Times every blockchain_cli.py subcommand against a local stub JSON-RPC node,
+so the numbers reflect interpreter, import and connection cost, not the network
+"""
+
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+CLI = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'blockchain_cli.py')
+
+ADDRESS = '0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb0'
+TX_HASH = '0x' + 'ab' * 32
+BLOCK = {
+    'number': '0x112a880', 'hash': '0x' + '11' * 32, 'parentHash': '0x' + '22' * 32,
+    'timestamp': '0x65000000', 'transactions': [], 'gasUsed': '0xe4e1c0',
+    'gasLimit': '0x1c9c380', 'baseFeePerGas': '0x3b9aca00', 'nonce': '0x' + '00' * 8,
+    'sha3Uncles': '0x' + '00' * 32, 'logsBloom': '0x' + '00' * 256,
+    'transactionsRoot': '0x' + '00' * 32, 'stateRoot': '0x' + '00' * 32,
+    'receiptsRoot': '0x' + '00' * 32, 'miner': '0x' + '00' * 20, 'difficulty': '0x0',
+    'totalDifficulty': '0x0', 'extraData': '0x', 'size': '0x100', 'uncles': [],
+    'mixHash': '0x' + '00' * 32,
+}
+TRANSACTION = {
+    'hash': TX_HASH, 'from': ADDRESS, 'to': ADDRESS, 'value': '0xde0b6b3a7640000',
+    'gasPrice': '0x3b9aca00', 'gas': '0x5208', 'nonce': '0x1', 'blockNumber': '0x112a880',
+    'blockHash': '0x' + '11' * 32, 'transactionIndex': '0x0', 'input': '0x',
+    'v': '0x25', 'r': '0x1', 's': '0x1', 'type': '0x0',
+}
+RECEIPT = {
+    'transactionHash': TX_HASH, 'transactionIndex': '0x0', 'blockHash': '0x' + '11' * 32,
+    'blockNumber': '0x112a880', 'from': ADDRESS, 'to': ADDRESS, 'cumulativeGasUsed': '0x5208',
+    'gasUsed': '0x5208', 'effectiveGasPrice': '0x3b9aca00', 'contractAddress': None, 'logs': [],
+    'logsBloom': '0x' + '00' * 256, 'status': '0x1', 'type': '0x0',
+}
+FEE_HISTORY = {
+    'oldestBlock': '0x112a880', 'baseFeePerGas': ['0x3b9aca00', '0x3b9aca00'],
+    'gasUsedRatio': [0.5], 'reward': [['0x3b9aca00', '0x3b9aca00', '0x3b9aca00']],
+}
+RESPONSES = {
+    'web3_clientVersion': 'stub/1.0',
+    'eth_chainId': '0x1',
+    'eth_blockNumber': '0x112a880',
+    'eth_gasPrice': '0x3b9aca00',
+    'eth_getBalance': '0xde0b6b3a7640000',
+    'eth_getBlockByNumber': BLOCK,
+    'eth_getTransactionByHash': TRANSACTION,
+    'eth_getTransactionReceipt': RECEIPT,
+    'eth_feeHistory': FEE_HISTORY,
+}
+
+
+def benchmark_commands(hash_file: str) -> Dict[str, Tuple[List[str], str]]:
+    """
+    Subcommands to time, with text their output must contain
+
+    The CLI reports most failures as "✗ Error: ..." and still exits 0, so
+    a command only counts when its output looks like success.
+
+    Args:
+        hash_file: File of transaction hashes for `txs`
+    """
+    return {
+        'balance': (['balance', ADDRESS], '1.000000 ETH'),
+        'block': (['block', '18000000'], 'Block #18000000'),
+        'blocks': (['blocks', '18000000..18000009'], '"number": 18000000'),
+        'tx': (['tx', TX_HASH], 'Nonce: 1'),
+        'txs': (['txs', '--from-file', hash_file], f'"hash": "{TX_HASH}"'),
+        'wait': (['wait', TX_HASH, '--poll-interval', '0.05'], 'mined in block 18000000'),
+        'gas': (['gas'], '1.00 gwei'),
+        'gas --oracle': (['gas', '--oracle'], 'Next Base Fee'),
+        'info': (['info'], 'Connected: True'),
+        'endpoints': (['endpoints'], 'Single endpoint'),
+        'cache': (['cache'], 'Hit Rate'),
+        'generate-wallet': (['generate-wallet'], 'Address: 0x'),
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answer single and batched JSON-RPC requests from RESPONSES"""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        requests = body if isinstance(body, list) else [body]
+        replies = [
+            {'jsonrpc': '2.0', 'id': r['id'], 'result': RESPONSES.get(r['method'])}
+            for r in requests
+        ]
+        payload = json.dumps(replies if isinstance(body, list) else replies[0]).encode()
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub() -> Tuple[ThreadingHTTPServer, str]:
+    """Stub JSON-RPC node on a free local port; returns (server, url)"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def time_command(rpc_url: str, args: list, expected: str, runs: int, env: dict) -> list:
+    """
+    Wall-clock seconds of `runs` fresh CLI processes
+
+    Raises RuntimeError when a run exits nonzero, reports an error or does
+    not print `expected`, so a broken command is never timed as a fast one.
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, CLI, '--rpc', rpc_url, *args],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env
+        )
+        timings.append(time.perf_counter() - start)
+
+        output = result.stdout.decode() + result.stderr.decode()
+        if result.returncode != 0 or '✗' in output or expected not in output:
+            raise RuntimeError(f"{' '.join(args)} failed (exit {result.returncode}): {output[-500:]}")
+    return timings
+
+
+def start_daemon(env: dict) -> subprocess.Popen:
+    """Start `blockchain_cli.py serve` and wait for its socket"""
+    daemon = subprocess.Popen([sys.executable, CLI, 'serve'], env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while not os.path.exists(env['BLOCKCHAIN_CLI_SOCKET']):
+        if time.time() > deadline or daemon.poll() is not None:
+            raise RuntimeError("serve daemon did not start")
+        time.sleep(0.05)
+    return daemon
+
+
+def main():
+    """Run the benchmark; pass --daemon to time thin clients of a running `serve`"""
+    args = [arg for arg in sys.argv[1:] if arg != '--daemon']
+    use_daemon = '--daemon' in sys.argv[1:]
+    runs = int(args[0]) if args else 5
+
+    server, rpc_url = start_stub()
+
+    # Keep the user's response cache out of it; runs after the first hit a warm cache
+    cache_dir = tempfile.TemporaryDirectory()
+    env = dict(os.environ, BLOCKCHAIN_CLI_CACHE=os.path.join(cache_dir.name, 'rpc_cache.db'),
+               BLOCKCHAIN_CLI_SOCKET=os.path.join(cache_dir.name, 'daemon.sock'))
+    hash_file = os.path.join(cache_dir.name, 'hashes.txt')
+    with open(hash_file, 'w') as f:
+        f.write(TX_HASH + '\n')
+    daemon = start_daemon(env) if use_daemon else None
+
+    baseline = time_command(rpc_url, ['--help'], 'Usage:', runs, env)
+    mode = 'thin client -> serve daemon' if use_daemon else 'standalone'
+    print(f"⏱  CLI startup ({runs} runs each, {mode}, stub node at {rpc_url})\n")
+    print(f"   {'command':<16} {'median':>9} {'min':>9}")
+    print(f"   {'--help':<16} {statistics.median(baseline) * 1000:>7.0f}ms "
+          f"{min(baseline) * 1000:>7.0f}ms")
+
+    for name, (args, expected) in benchmark_commands(hash_file).items():
+        timings = time_command(rpc_url, args, expected, runs, env)
+        print(f"   {name:<16} {statistics.median(timings) * 1000:>7.0f}ms "
+              f"{min(timings) * 1000:>7.0f}ms")
+
+    if daemon is not None:
+        daemon.send_signal(signal.SIGINT)
+        daemon.wait()
+    server.shutdown()
+    cache_dir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -4,68 +4,622 @@ Blockchain CLI Tool
 A command-line interface for interacting with Ethereum blockchain
 """
 
+import os
+import sys
+
+# Thin client: if a `serve` daemon is running, hand it the command before
+# paying for click and the rest of the imports
+if __name__ == '__main__':
+    from cli_client import forward
+    status = forward(sys.argv[1:])
+    if status is not None:
+        sys.exit(status)
+
 import click
-from web3 import Web3
-from eth_account import Account
+import csv
+import io
 import json
-from typing import Optional
+import re
+import shlex
+import socket
+import socketserver
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import redirect_stderr, redirect_stdout
+from decimal import Decimal, localcontext
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Shared RPC helpers live next to the web3.py scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'web3py-scripts'))
+
+from cli_client import DEFAULT_SOCKET_PATH, EXIT_FRAME, STDERR_FRAME, STDOUT_FRAME, send_frame
+from gas_oracle import GasOracle
+from rpc_cache import CACHEABLE, HEAD_DEPENDENT, RPCCache, cache_ttl
+
+# web3 and eth_account take seconds to import, so commands import them only
+# when they need them; batched commands talk JSON-RPC directly.
+
+ADDRESS_PATTERN = re.compile(r'^0x[0-9a-fA-F]{40}$')
+TX_HASH_PATTERN = re.compile(r'^0x[0-9a-fA-F]{64}$')
+WEI_PER_UNIT = {'ether': 10 ** 18, 'gwei': 10 ** 9, 'wei': 1}
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'blockchain-cli', 'rpc_cache.db')
+
+BLOCK_QUANTITIES = ('number', 'timestamp', 'gasUsed', 'gasLimit', 'baseFeePerGas', 'size')
+TX_QUANTITIES = ('value', 'gasPrice', 'gas', 'nonce', 'blockNumber', 'transactionIndex',
+                 'maxFeePerGas', 'maxPriorityFeePerGas', 'chainId', 'type')
+RECEIPT_QUANTITIES = ('status', 'gasUsed', 'cumulativeGasUsed', 'effectiveGasPrice')
+# Columns of a `txs` row: the hash, then transaction fields, then receipt fields
+TX_RECORD_TX_FIELDS = ('blockNumber', 'transactionIndex', 'from', 'to', 'value', 'nonce', 'gas', 'gasPrice')
+TX_RECORD_RECEIPT_FIELDS = ('status', 'gasUsed', 'effectiveGasPrice', 'contractAddress')
+TX_RECORD_FIELDS = ('hash',) + TX_RECORD_TX_FIELDS + TX_RECORD_RECEIPT_FIELDS
+
+
+def from_wei(value: int, unit: str) -> Decimal:
+    """Same result as Web3.from_wei without importing web3"""
+    with localcontext() as ctx:
+        ctx.prec = 999
+        return Decimal(value) / Decimal(WEI_PER_UNIT[unit])
+
+
+def validate_address(address: str) -> str:
+    if not ADDRESS_PATTERN.match(address):
+        raise ValueError(f"Invalid address: {address}")
+    return address
+
+
+def parse_block_range(block_range: str) -> Tuple[int, str]:
+    """Split 'START..END' (END may be 'latest') into (start, end)"""
+    start, sep, end = block_range.partition('..')
+    if not sep or not start.isdigit() or not (end.isdigit() or end == 'latest'):
+        raise ValueError(f"Invalid block range: {block_range} (expected START..END)")
+    return int(start), end
+
+
+def block_summary(block: dict) -> Dict[str, Any]:
+    """Compact NDJSON row for a decoded block"""
+    return {
+        'number': block['number'],
+        'hash': block['hash'],
+        'timestamp': block['timestamp'],
+        'transactions': len(block['transactions']),
+        'gasUsed': block['gasUsed'],
+        'gasLimit': block['gasLimit'],
+        'baseFeePerGas': block.get('baseFeePerGas', 0),
+    }
+
+
+def read_tx_hashes(lines: Iterable[str]) -> Iterator[str]:
+    """Yield hashes from lines of text, one per line; blank lines and # comments are skipped"""
+    for line_number, line in enumerate(lines, 1):
+        tx_hash = line.split('#', 1)[0].strip()
+        if not tx_hash:
+            continue
+        if not TX_HASH_PATTERN.match(tx_hash):
+            raise ValueError(f"Line {line_number}: invalid transaction hash: {tx_hash}")
+        yield tx_hash.lower()
+
+
+def tx_record(tx_hash: str, tx: Optional[dict], receipt: Optional[dict]) -> Dict[str, Any]:
+    """Flat row joining a raw transaction and its receipt (None while pending)"""
+    record = dict.fromkeys(TX_RECORD_FIELDS)
+    record['hash'] = tx_hash
+    if tx is not None:
+        tx = decode_quantities(tx, TX_QUANTITIES)
+        record.update((field, tx.get(field)) for field in TX_RECORD_TX_FIELDS)
+    if receipt is not None:
+        receipt = decode_quantities(receipt, RECEIPT_QUANTITIES)
+        record.update((field, receipt.get(field)) for field in TX_RECORD_RECEIPT_FIELDS)
+    return record
+
+
+def decode_quantities(data: dict, fields: Sequence[str]) -> dict:
+    """Copy of a raw JSON-RPC object with hex quantity fields as ints"""
+    decoded = dict(data)
+    for field in fields:
+        if isinstance(decoded.get(field), str):
+            decoded[field] = int(decoded[field], 16)
+    return decoded
 
 
 class BlockchainCLI:
     """CLI tool for blockchain operations"""
 
-    def __init__(self, rpc_url: str):
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+    def __init__(self, rpc_url: Union[str, Sequence[str]], check_connection: bool = False,
+                 cache: Optional[RPCCache] = None, rate_limit: Optional[float] = None,
+                 cache_path: Optional[str] = None):
+        """
+        Initialize without touching the network or the disk
+
+        The web3 provider is created on first use of `w3`, the response
+        cache on first use of `cache`.
 
-        if not self.w3.is_connected():
+        Args:
+            rpc_url: Ethereum RPC endpoint, or several endpoints of one chain
+                to route across (see rpc_router.RPCRouter)
+            check_connection: Probe the endpoint now and exit if unreachable
+            cache: Persistent response cache; None always asks the node
+            rate_limit: Provider's requests-per-second limit (None = unlimited)
+            cache_path: Without `cache`, open an RPCCache at this path when first needed
+        """
+        self.endpoints = [rpc_url] if isinstance(rpc_url, str) else list(rpc_url)
+        # Also the cache namespace: every endpoint listed serves the same chain
+        self.rpc_url = ','.join(self.endpoints)
+        self._cache = cache
+        self.cache_path = cache_path
+        self._w3 = None
+        self._session = None
+        self._router = None
+        self._scheduler = None
+        self.rate_limit = rate_limit
+
+        if check_connection and not self.is_connected():
             click.echo(click.style(f"✗ Failed to connect to {rpc_url}", fg='red'))
             raise SystemExit(1)
 
+    @property
+    def w3(self):
+        """web3 instance, imported and connected on first access"""
+        if self._w3 is None:
+            from web3 import Web3
+            if self.router is None:
+                self._w3 = Web3(Web3.HTTPProvider(self.endpoints[0]))
+            else:
+                from rpc_router import web3_provider
+                self._w3 = Web3(web3_provider(self.router))
+        return self._w3
+
+    @property
+    def cache(self) -> Optional[RPCCache]:
+        """Response cache, opened on first lookup; commands that never call the node skip the SQLite setup"""
+        if self._cache is None and self.cache_path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+            self._cache = RPCCache(self.cache_path)
+        return self._cache
+
+    @property
+    def session(self):
+        """Pooled HTTP session shared by every request"""
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
+
+    @property
+    def router(self):
+        """RPCRouter over the endpoints, or None with a single endpoint"""
+        if self._router is None and len(self.endpoints) > 1:
+            from rpc_router import RPCRouter
+            self._router = RPCRouter(self.endpoints, session=self.session)
+        return self._router
+
+    @property
+    def scheduler(self):
+        """RequestScheduler pacing every network round trip (rate limit, AIMD, retries)"""
+        if self._scheduler is None:
+            from rpc_scheduler import RequestScheduler
+            self._scheduler = RequestScheduler(rate=self.rate_limit)
+        return self._scheduler
+
+    def close(self):
+        if self._cache is not None:
+            self._cache.close()
+        if self._router is not None:
+            self._router.close()
+
+    def is_connected(self) -> bool:
+        """Ask the node itself: no cache (eth_chainId is cached forever) and no retries"""
+        try:
+            sent, _ = self._send([('eth_chainId', ())], [0], {})
+            sent[0].result
+            return True
+        except Exception:
+            return False
+
+    def batch(self):
+        """Start a JSON-RPC batch; calls are sent as one HTTP request on flush"""
+        from rpc_batch import RPCBatch
+
+        return RPCBatch(self.router or self.endpoints[0], session=self.session)
+
+    def call(self, method: str, *params):
+        """Single raw JSON-RPC call, served from the cache when possible"""
+        return self.call_many([(method, params)])[0]
+
+    def call_many(self, calls: Sequence[Tuple[str, Sequence[Any]]]) -> List[Any]:
+        """
+        Several raw JSON-RPC calls; cache misses go out as one batch
+
+        A batch with finality-dependent calls also asks for eth_blockNumber,
+        so deciding whether an answer is final costs no extra round trip.
+
+        Args:
+            calls: (method, params) pairs
+
+        Returns:
+            Results in the order of calls
+        """
+        results, keys, pending = self._lookup(calls)
+        if pending:
+            self._store(results, keys, pending,
+                        *self.scheduler.call(self._send, calls, pending, keys))
+        return results
+
+    def send_many(self, calls: Sequence[Tuple[str, Sequence[Any]]]) -> List[Any]:
+        """Several raw JSON-RPC calls as one batch, always from the node; safe in worker threads"""
+        sent, _ = self.scheduler.call(self._send, calls, list(range(len(calls))), {})
+        return [call.result for call in sent]
+
+    def _lookup(self, calls: Sequence[Tuple[str, Sequence[Any]]]) -> Tuple[List[Any], dict, List[int]]:
+        """Fill results from the cache; returns (results, cache keys, indexes still to fetch)"""
+        results: List[Any] = [None] * len(calls)
+        keys = {}
+
+        if self.cache is not None:
+            keys = {i: self.cache.key(self.rpc_url, method, params)
+                    for i, (method, params) in enumerate(calls) if method in CACHEABLE}
+            for i, result in zip(keys, self.cache.get_many(list(keys.values()))):
+                results[i] = result
+
+        pending = [i for i, result in enumerate(results) if result is None]
+        return results, keys, pending
+
+    def _send(self, calls, pending: List[int], keys: dict) -> tuple:
+        """Network half of call_many; touches no cache, so it is safe in worker threads"""
+        needs_head = any(calls[i][0] in HEAD_DEPENDENT for i in pending if i in keys)
+        with self.batch() as batch:
+            sent = [batch.add(calls[i][0], *calls[i][1]) for i in pending]
+            head_call = batch.add('eth_blockNumber') if needs_head else None
+
+        from rpc_scheduler import is_rate_limited
+
+        # Providers may throttle single calls of a batch; retry the whole batch
+        for call in sent:
+            try:
+                call.result
+            except ValueError as e:
+                if is_rate_limited(e):
+                    raise
+        return sent, head_call
+
+    def _store(self, results: List[Any], keys: dict, pending: List[int], sent: list, head_call):
+        """Copy fetched results into place and cache what may be cached"""
+        head = None
+        to_cache = []
+        if head_call is not None:
+            head = int(head_call.result, 16)
+            to_cache.append((self.cache.key(self.rpc_url, 'eth_blockNumber', ()), head_call.result,
+                             cache_ttl('eth_blockNumber', (), head_call.result, head)))
+
+        for i, call in zip(pending, sent):
+            results[i] = call.result
+            if i in keys:
+                ttl = cache_ttl(call.method, call.params, results[i], head)
+                if ttl is not None:
+                    to_cache.append((keys[i], results[i], ttl))
+
+        if to_cache:
+            self.cache.put_many(to_cache)
+
     def get_balance(self, address: str) -> float:
         """Get ETH balance for address"""
-        balance_wei = self.w3.eth.get_balance(Web3.to_checksum_address(address))
-        return self.w3.from_wei(balance_wei, 'ether')
+        return self.get_balances([address])[0]
+
+    def get_balances(self, addresses: List[str]) -> List[float]:
+        """Get ETH balances for many addresses in one batched request"""
+        results = self.call_many([
+            ('eth_getBalance', (validate_address(address), 'latest'))
+            for address in addresses
+        ])
+        return [from_wei(int(result, 16), 'ether') for result in results]
+
+    def get_network_info(self) -> dict:
+        """Get chain id, latest block and gas price in one batched request"""
+        chain_id, block_number, gas_price = self.call_many([
+            ('eth_chainId', ()),
+            ('eth_blockNumber', ()),
+            ('eth_gasPrice', ()),
+        ])
+
+        return {
+            'chain_id': int(chain_id, 16),
+            'block_number': int(block_number, 16),
+            'gas_price': from_wei(int(gas_price, 16), 'gwei'),
+        }
 
     def get_block_info(self, block_number: str = 'latest') -> dict:
         """Get block information"""
-        if block_number == 'latest':
-            block = self.w3.eth.get_block('latest')
-        else:
-            block = self.w3.eth.get_block(int(block_number))
+        tag = block_number if block_number == 'latest' else hex(int(block_number))
+        block = self.call('eth_getBlockByNumber', tag, False)
+        if block is None:
+            raise ValueError(f"Block {block_number} not found")
+        return decode_quantities(block, BLOCK_QUANTITIES)
+
+    def iter_batched(
+        self,
+        chunks: Iterable[Sequence[Tuple[str, Sequence[Any]]]],
+        concurrency: int = 8
+    ) -> Iterator[Tuple[Sequence[Tuple[str, Sequence[Any]]], List[Any]]]:
+        """
+        Run chunks of calls as concurrent batches, yielding results in order
+
+        A chunk is pulled from the iterable only when a slot in the
+        window of `concurrency` batches frees up. Each chunk is answered
+        from the cache first; only its misses go to a worker thread, and
+        the cache is written back on the calling thread as results are
+        yielded.
+
+        Args:
+            chunks: Lists of (method, params) pairs, one batch each
+            concurrency: Batches in flight
+
+        Yields:
+            (calls, results) per chunk, in input order
+        """
+        window = deque()
+        # Create the shared session / router / scheduler before the workers race for them
+        self.batch()
+        scheduler = self.scheduler
+        pool = ThreadPoolExecutor(max_workers=concurrency)
+
+        def drain():
+            calls, results, keys, pending, future = window.popleft()
+            if future is not None:
+                self._store(results, keys, pending, *future.result())
+            return calls, results
+
+        try:
+            for calls in chunks:
+                results, keys, pending = self._lookup(calls)
+                future = pool.submit(scheduler.call, self._send, calls, pending, keys) if pending else None
+                window.append((calls, results, keys, pending, future))
 
-        return dict(block)
+                if len(window) >= concurrency:
+                    yield drain()
+
+            while window:
+                yield drain()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def iter_blocks(
+        self,
+        start: int,
+        end: int,
+        batch_size: int = 50,
+        concurrency: int = 8
+    ) -> Iterator[dict]:
+        """
+        Stream decoded blocks start..end (inclusive) in order
+
+        Args:
+            start: First block
+            end: Last block
+            batch_size: Blocks per JSON-RPC batch
+            concurrency: Batches in flight
+
+        Yields:
+            Blocks with quantities decoded, in block order
+        """
+        chunks = (
+            [('eth_getBlockByNumber', (hex(number), False))
+             for number in range(lo, min(lo + batch_size - 1, end) + 1)]
+            for lo in range(start, end + 1, batch_size)
+        )
+        for calls, results in self.iter_batched(chunks, concurrency):
+            for (_, params), block in zip(calls, results):
+                if block is None:
+                    raise ValueError(f"Block {int(params[0], 16)} not found")
+                yield decode_quantities(block, BLOCK_QUANTITIES)
+
+    def iter_transactions(
+        self,
+        tx_hashes: Iterable[str],
+        batch_size: int = 50,
+        concurrency: int = 8
+    ) -> Iterator[dict]:
+        """
+        Stream transactions joined with their receipts, in input order
+
+        Each batch asks for the transaction and the receipt of batch_size
+        hashes, interleaved, so one row needs no second round trip. Hashes
+        are read from the iterable only as batches go out.
+
+        Args:
+            tx_hashes: Transaction hashes, e.g. lines of a file
+            batch_size: Hashes per JSON-RPC batch
+            concurrency: Batches in flight
+
+        Yields:
+            tx_record() rows; unknown hashes come back with only 'hash' set
+        """
+        hashes = iter(tx_hashes)
+        chunks = (
+            [call for tx_hash in chunk
+             for call in (('eth_getTransactionByHash', (tx_hash,)),
+                          ('eth_getTransactionReceipt', (tx_hash,)))]
+            for chunk in iter(lambda: list(islice(hashes, batch_size)), [])
+        )
+        for calls, results in self.iter_batched(chunks, concurrency):
+            for i in range(0, len(calls), 2):
+                yield tx_record(calls[i][1][0], results[i], results[i + 1])
 
     def get_transaction(self, tx_hash: str) -> dict:
         """Get transaction details"""
-        tx = self.w3.eth.get_transaction(tx_hash)
-        return dict(tx)
+        tx = self.call('eth_getTransactionByHash', tx_hash)
+        if tx is None:
+            raise ValueError(f"Transaction {tx_hash} not found")
+        return decode_quantities(tx, TX_QUANTITIES)
 
     def get_gas_price(self) -> float:
         """Get current gas price in gwei"""
-        return self.w3.from_wei(self.w3.eth.gas_price, 'gwei')
+        return from_wei(int(self.call('eth_gasPrice'), 16), 'gwei')
+
+    def receipt_tracker(self, poll_interval: float = 2.0):
+        """ReceiptTracker polling this CLI's endpoints (bypasses the cache, which is not thread-safe)"""
+        from receipt_tracker import ReceiptTracker
+
+        self.batch()
+        return ReceiptTracker(self.send_many, poll_interval=poll_interval)
+
+    def gas_oracle(self, window: int = 20, cached: bool = True) -> GasOracle:
+        """
+        EIP-1559 fee oracle over raw eth_feeHistory calls
+
+        Args:
+            window: Blocks of fee history
+            cached: Serve the head and fee history from the response cache;
+                pass False when polling, or refreshes can repeat stale data
+        """
+        call = self.call if cached else lambda method, *params: self.send_many([(method, params)])[0]
+        return GasOracle(
+            lambda count, newest, percentiles: call(
+                'eth_feeHistory', hex(count), hex(newest), percentiles),
+            lambda: call('eth_blockNumber'),
+            window
+        )
+
+
+class BlockStats:
+    """Column buffers for block statistics, summarized with numpy"""
+
+    PERCENTILES = (50, 90, 99)
+
+    def __init__(self, size: int):
+        try:
+            import numpy as np
+        except ImportError:
+            raise click.ClickException("--stats needs numpy (pip install numpy)")
+
+        self.np = np
+        self.gas_used = np.empty(size, dtype=np.float64)
+        self.gas_limit = np.empty(size, dtype=np.float64)
+        self.base_fee = np.empty(size, dtype=np.float64)
+        self.tx_count = np.empty(size, dtype=np.float64)
+        self.count = 0
+
+    def add(self, block: dict):
+        i = self.count
+        self.gas_used[i] = block['gasUsed']
+        self.gas_limit[i] = block['gasLimit']
+        self.base_fee[i] = block.get('baseFeePerGas', 0)
+        self.tx_count[i] = len(block['transactions'])
+        self.count += 1
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """min / mean / percentiles / max of each metric"""
+        np = self.np
+        n = self.count
+        metrics = {
+            'gas_utilization_pct': 100 * self.gas_used[:n] / np.maximum(self.gas_limit[:n], 1),
+            'base_fee_gwei': self.base_fee[:n] / 1e9,
+            'transactions': self.tx_count[:n],
+        }
+
+        result = {}
+        for name, values in metrics.items():
+            percentiles = np.percentile(values, self.PERCENTILES)
+            result[name] = {
+                'min': float(values.min()),
+                'mean': float(values.mean()),
+                **{f"p{p}": float(v) for p, v in zip(self.PERCENTILES, percentiles)},
+                'max': float(values.max()),
+            }
+        return result
+
+    def report(self, err: bool = False):
+        columns = ['min', 'mean'] + [f"p{p}" for p in self.PERCENTILES] + ['max']
+        click.echo(f"\n📊 Block Stats ({self.count:,} blocks)", err=err)
+        click.echo(f"   {'metric':<20}" + ''.join(f"{c:>12}" for c in columns), err=err)
+        for name, values in self.summary().items():
+            click.echo(f"   {name:<20}" + ''.join(f"{values[c]:>12,.2f}" for c in columns), err=err)
 
 
 @click.group()
-@click.option('--rpc', default='https://eth-mainnet.g.alchemy.com/v2/demo', help='RPC endpoint')
+@click.option('--rpc', multiple=True, default=['https://eth-mainnet.g.alchemy.com/v2/demo'],
+              help='RPC endpoint; repeat to route across several endpoints of one chain')
+@click.option('--check/--no-check', default=False, help='Probe the RPC endpoint before running')
+@click.option('--cache/--no-cache', 'use_cache', default=True, help='Use the on-disk RPC response cache')
+@click.option('--rate-limit', type=float, default=None,
+              help="Provider's requests/second limit; 429s are retried with backoff either way")
+@click.option('--cache-path', envvar='BLOCKCHAIN_CLI_CACHE', default=DEFAULT_CACHE_PATH,
+              show_default=True, help='RPC response cache file')
 @click.pass_context
-def cli(ctx, rpc):
+def cli(ctx, rpc, check, use_cache, rate_limit, cache_path):
     """Blockchain CLI - Interact with Ethereum from command line"""
     ctx.ensure_object(dict)
-    ctx.obj['cli'] = BlockchainCLI(rpc)
-    ctx.obj['rpc'] = rpc
+    ctx.obj['rpc'] = ', '.join(rpc)
+
+    # shell/serve keep one warm instance per endpoint and cache settings
+    pool = ctx.obj.get('pool')
+    key = (rpc, use_cache, rate_limit, os.path.abspath(cache_path))
+    if pool is not None and key in pool:
+        ctx.obj['cli'] = pool[key]
+        return
+
+    ctx.obj['cli'] = BlockchainCLI(rpc, check_connection=check, rate_limit=rate_limit,
+                                   cache_path=cache_path if use_cache else None)
+    if pool is not None:
+        pool[key] = ctx.obj['cli']
+    else:
+        ctx.call_on_close(ctx.obj['cli'].close)
+
+
+def run_pooled(args: List[str], pool: dict, color: Optional[bool] = None) -> int:
+    """
+    Run one command line against pooled BlockchainCLI instances
+
+    Returns:
+        Exit status the command would have had as its own process
+    """
+    try:
+        # Outside standalone mode, ctx.exit() (e.g. --help) comes back as a return value
+        status = cli.main(args=args, obj={'pool': pool}, prog_name='blockchain_cli.py',
+                          standalone_mode=False, color=color)
+        return status if isinstance(status, int) else 0
+    except click.ClickException as e:
+        e.show()
+        return e.exit_code
+    except click.exceptions.Abort:
+        click.echo("Aborted!", err=True)
+        return 1
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else int(e.code is not None)
+
+
+def close_pool(pool: dict):
+    for instance in pool.values():
+        instance.close()
+    pool.clear()
+
+
+def global_args(ctx) -> List[str]:
+    """The group options of ctx, as arguments for a nested invocation"""
+    params = ctx.parent.params
+    args = []
+    for rpc in params['rpc']:
+        args += ['--rpc', rpc]
+    if params['rate_limit'] is not None:
+        args += ['--rate-limit', str(params['rate_limit'])]
+    return args + [
+        '--cache' if params['use_cache'] else '--no-cache',
+        '--cache-path', params['cache_path'],
+    ]
 
 
 @cli.command()
-@click.argument('address')
+@click.argument('addresses', nargs=-1, required=True)
 @click.pass_context
-def balance(ctx, address):
-    """Get ETH balance for an address"""
+def balance(ctx, addresses):
+    """Get ETH balance for one or more addresses"""
     cli_obj = ctx.obj['cli']
 
     try:
-        bal = cli_obj.get_balance(address)
-        click.echo(f"\n💰 Balance for {address}")
-        click.echo(f"   {bal:.6f} ETH")
+        balances = cli_obj.get_balances(list(addresses))
+        for address, bal in zip(addresses, balances):
+            click.echo(f"\n💰 Balance for {address}")
+            click.echo(f"   {bal:.6f} ETH")
 
     except Exception as e:
         click.echo(click.style(f"✗ Error: {e}", fg='red'))
@@ -82,7 +636,7 @@ def block(ctx, block_number):
         block_info = cli_obj.get_block_info(block_number)
 
         click.echo(f"\n📦 Block #{block_info['number']}")
-        click.echo(f"   Hash: {block_info['hash'].hex()}")
+        click.echo(f"   Hash: {block_info['hash']}")
         click.echo(f"   Timestamp: {block_info['timestamp']}")
         click.echo(f"   Transactions: {len(block_info['transactions'])}")
         click.echo(f"   Gas Used: {block_info['gasUsed']:,}")
@@ -93,6 +647,48 @@ def block(ctx, block_number):
         click.echo(click.style(f"✗ Error: {e}", fg='red'))
 
 
+@cli.command()
+@click.argument('block_range')
+@click.option('--batch-size', default=50, show_default=True, help='Blocks per JSON-RPC batch')
+@click.option('--concurrency', default=8, show_default=True, help='Batches in flight')
+@click.option('--rows/--no-rows', default=True, help='Stream one NDJSON row per block')
+@click.option('--stats', is_flag=True, help='Print gas utilization, base fee and tx count percentiles')
+@click.pass_context
+def blocks(ctx, block_range, batch_size, concurrency, rows, stats):
+    """Scan START..END (inclusive; END may be 'latest') as NDJSON"""
+    cli_obj = ctx.obj['cli']
+
+    try:
+        start, end = parse_block_range(block_range)
+        end = int(cli_obj.call('eth_blockNumber'), 16) if end == 'latest' else int(end)
+        if start > end:
+            raise ValueError(f"Empty block range: {block_range}")
+
+        collector = BlockStats(end - start + 1) if stats else None
+        for block_info in cli_obj.iter_blocks(start, end, batch_size, concurrency):
+            if rows:
+                click.echo(json.dumps(block_summary(block_info)))
+            if collector is not None:
+                collector.add(block_info)
+
+        if collector is not None:
+            # Keep stdout pure NDJSON when rows are streamed
+            collector.report(err=rows)
+
+        report_retries(cli_obj)
+
+    except Exception as e:
+        click.echo(click.style(f"✗ Error: {e}", fg='red'), err=True)
+
+
+def report_retries(cli_obj: BlockchainCLI):
+    """Note throttling on stderr, so stdout stays pure NDJSON / CSV"""
+    scheduled = cli_obj.scheduler.stats()
+    if scheduled['retries']:
+        click.echo(f"↻ {scheduled['retries']} retries ({scheduled['throttled']} throttled), "
+                   f"settled at concurrency {scheduled['concurrency']}", err=True)
+
+
 @cli.command()
 @click.argument('tx_hash')
 @click.pass_context
@@ -106,8 +702,8 @@ def tx(ctx, tx_hash):
         click.echo(f"\n📤 Transaction {tx_hash}")
         click.echo(f"   From: {tx_info['from']}")
         click.echo(f"   To: {tx_info['to']}")
-        click.echo(f"   Value: {cli_obj.w3.from_wei(tx_info['value'], 'ether')} ETH")
-        click.echo(f"   Gas Price: {cli_obj.w3.from_wei(tx_info['gasPrice'], 'gwei')} gwei")
+        click.echo(f"   Value: {from_wei(tx_info['value'], 'ether')} ETH")
+        click.echo(f"   Gas Price: {from_wei(tx_info['gasPrice'], 'gwei')} gwei")
         click.echo(f"   Gas: {tx_info['gas']:,}")
         click.echo(f"   Nonce: {tx_info['nonce']}")
         click.echo(f"   Block: {tx_info['blockNumber']}")
@@ -117,20 +713,127 @@ def tx(ctx, tx_hash):
 
 
 @cli.command()
+@click.option('--from-file', 'hash_file', type=click.File('r'), required=True,
+              help="File with one transaction hash per line ('-' for stdin)")
+@click.option('--format', 'output_format', type=click.Choice(['ndjson', 'csv']), default='ndjson',
+              show_default=True, help='Output format')
+@click.option('--batch-size', default=50, show_default=True, help='Hashes per JSON-RPC batch')
+@click.option('--concurrency', default=8, show_default=True, help='Batches in flight')
+@click.pass_context
+def txs(ctx, hash_file, output_format, batch_size, concurrency):
+    """Look up transactions and receipts for a file of hashes, in input order"""
+    cli_obj = ctx.obj['cli']
+    writer = None
+    if output_format == 'csv':
+        writer = csv.DictWriter(click.get_text_stream('stdout'), fieldnames=TX_RECORD_FIELDS,
+                                lineterminator='\n')
+        writer.writeheader()
+
+    try:
+        missing = 0
+        records = cli_obj.iter_transactions(read_tx_hashes(hash_file), batch_size, concurrency)
+        for record in records:
+            missing += record['blockNumber'] is None
+            if writer is not None:
+                writer.writerow(record)
+            else:
+                click.echo(json.dumps(record))
+
+        if missing:
+            click.echo(f"👀 {missing} transactions not found or still pending", err=True)
+
+        report_retries(cli_obj)
+
+    except Exception as e:
+        click.echo(click.style(f"✗ Error: {e}", fg='red'), err=True)
+
+
+@cli.command()
+@click.argument('tx_hashes', nargs=-1)
+@click.option('--from-file', 'hash_file', type=click.File('r'), default=None,
+              help="File with one transaction hash per line ('-' for stdin)")
+@click.option('--timeout', default=300.0, show_default=True, help='Seconds to wait for each transaction')
+@click.option('--poll-interval', default=2.0, show_default=True, help='Seconds between head polls')
+@click.pass_context
+def wait(ctx, tx_hashes, hash_file, timeout, poll_interval):
+    """Wait for transactions to be mined, reporting each as it lands"""
+    cli_obj = ctx.obj['cli']
+    if not tx_hashes and hash_file is None:
+        raise click.UsageError('Give transaction hashes or --from-file')
+
+    try:
+        hashes = list(read_tx_hashes(tx_hashes))
+        if hash_file is not None:
+            hashes.extend(read_tx_hashes(hash_file))
+
+        tracker = cli_obj.receipt_tracker(poll_interval)
+        futures = {tracker.watch(tx_hash, timeout): tx_hash for tx_hash in hashes}
+        click.echo(f"👀 Waiting for {len(futures)} transactions...")
+
+        for future in as_completed(futures):
+            tx_hash = futures[future]
+            try:
+                receipt = decode_quantities(future.result(), RECEIPT_QUANTITIES + ('blockNumber',))
+            except TimeoutError:
+                click.echo(click.style(f"✗ {tx_hash} not mined after {timeout:g}s", fg='red'))
+                continue
+
+            if receipt['status'] == 1:
+                click.echo(click.style(f"✓ {tx_hash} mined in block {receipt['blockNumber']} "
+                                       f"(gas used {receipt['gasUsed']:,})", fg='green'))
+            else:
+                click.echo(click.style(f"✗ {tx_hash} reverted in block {receipt['blockNumber']}", fg='red'))
+
+        click.echo(f"   {tracker.blocks_scanned} blocks scanned, "
+                   f"{tracker.receipts_requested} receipts requested")
+        tracker.close()
+
+    except Exception as e:
+        click.echo(click.style(f"✗ Error: {e}", fg='red'))
+
+
+@cli.command()
+@click.option('--oracle', is_flag=True, help='EIP-1559 suggestions from eth_feeHistory')
+@click.option('--window', default=20, show_default=True, help='Blocks of fee history (--oracle)')
+@click.option('--watch', type=float, default=None, help='Refresh every N seconds (--oracle)')
 @click.pass_context
-def gas(ctx):
+def gas(ctx, oracle, window, watch):
     """Get current gas price"""
     cli_obj = ctx.obj['cli']
 
     try:
-        gas_price = cli_obj.get_gas_price()
-        click.echo(f"\n⛽ Current Gas Price")
-        click.echo(f"   {gas_price:.2f} gwei")
+        if not oracle:
+            gas_price = cli_obj.get_gas_price()
+            click.echo(f"\n⛽ Current Gas Price")
+            click.echo(f"   {gas_price:.2f} gwei")
+            return
+
+        # Polls must see every new head, not a cached one
+        fee_oracle = cli_obj.gas_oracle(window, cached=not watch)
+        fee_oracle.refresh()
+        print_fee_suggestions(fee_oracle)
+
+        while watch:
+            time.sleep(watch)
+            # Only blocks mined since the last refresh are fetched
+            if fee_oracle.refresh():
+                print_fee_suggestions(fee_oracle)
 
+    except KeyboardInterrupt:
+        click.echo("\n✓ Stopped watching")
     except Exception as e:
         click.echo(click.style(f"✗ Error: {e}", fg='red'))
 
 
+def print_fee_suggestions(fee_oracle: GasOracle):
+    click.echo(f"\n⛽ Gas Oracle (block {fee_oracle.head:,}, last {fee_oracle.size} blocks "
+               f"{fee_oracle.gas_used_ratio():.0%} full)")
+    click.echo(f"   Next Base Fee: {from_wei(fee_oracle.next_base_fee, 'gwei'):.2f} gwei")
+    for tier, fees in fee_oracle.suggestions().items():
+        click.echo(f"   {tier:<7} max {from_wei(fees['maxFeePerGas'], 'gwei'):>8.2f} gwei   "
+                   f"priority {from_wei(fees['maxPriorityFeePerGas'], 'gwei'):>6.2f} gwei")
+
+
 @cli.command()
 @click.pass_context
 def info(ctx):
@@ -138,30 +841,224 @@ def info(ctx):
     cli_obj = ctx.obj['cli']
 
     try:
-        latest_block = cli_obj.w3.eth.block_number
-        gas_price = cli_obj.get_gas_price()
-        chain_id = cli_obj.w3.eth.chain_id
+        # One batched round trip, possibly answered from the cache
+        network = cli_obj.get_network_info()
 
         click.echo(f"\n🌐 Network Information")
         click.echo(f"   RPC: {ctx.obj['rpc']}")
-        click.echo(f"   Chain ID: {chain_id}")
-        click.echo(f"   Latest Block: {latest_block:,}")
-        click.echo(f"   Gas Price: {gas_price:.2f} gwei")
-        click.echo(f"   Connected: {cli_obj.w3.is_connected()}")
+        click.echo(f"   Chain ID: {network['chain_id']}")
+        click.echo(f"   Latest Block: {network['block_number']:,}")
+        click.echo(f"   Gas Price: {network['gas_price']:.2f} gwei")
+        click.echo(f"   Connected: {cli_obj.is_connected()}")
 
     except Exception as e:
         click.echo(click.style(f"✗ Error: {e}", fg='red'))
 
 
 @cli.command()
-def generate_wallet():
-    """Generate a new Ethereum wallet"""
-    account = Account.create()
-
-    click.echo(f"\n🔐 New Wallet Generated")
-    click.echo(f"   Address: {account.address}")
-    click.echo(f"   Private Key: {account.key.hex()}")
-    click.echo(click.style("\n   ⚠️  KEEP YOUR PRIVATE KEY SAFE!", fg='yellow', bold=True))
+@click.pass_context
+def endpoints(ctx):
+    """Show per-endpoint latency and error rates (with several --rpc)"""
+    router = ctx.obj['cli'].router
+    if router is None:
+        click.echo("Single endpoint; pass --rpc more than once to route across several")
+        return
+
+    click.echo(f"\n🔀 RPC Endpoints (routing order, {router.hedges} hedged requests)")
+    for stats in router.stats():
+        latency = f"{stats['latency_ms']:.0f}ms" if stats['latency_ms'] is not None else '-'
+        p95 = f"{stats['p95_ms']:.0f}ms" if stats['p95_ms'] is not None else '-'
+        status = '✓' if stats['healthy'] else '✗'
+        click.echo(f"   {status} {stats['url']}")
+        click.echo(f"     EWMA {latency}, p95 {p95}, errors {stats['error_rate']:.0%}, "
+                   f"{stats['requests']} requests")
+
+
+@cli.command()
+@click.option('--clear', is_flag=True, help='Drop every cached response')
+@click.pass_context
+def cache(ctx, clear):
+    """Show or clear the RPC response cache"""
+    rpc_cache = ctx.obj['cli'].cache
+    if rpc_cache is None:
+        click.echo("Cache disabled (--no-cache)")
+        return
+
+    if clear:
+        rpc_cache.clear()
+        click.echo(click.style("✓ Cache cleared", fg='green'))
+        return
+
+    stats = rpc_cache.stats()
+    lookups = stats['total_hits'] + stats['total_misses']
+    hit_rate = stats['total_hits'] / lookups if lookups else 0
+
+    click.echo(f"\n🗄  RPC Cache ({rpc_cache.path})")
+    click.echo(f"   Entries: {stats['entries']:,} ({stats['bytes'] / 1024:.1f} KiB)")
+    click.echo(f"   Hits: {stats['total_hits']:,}")
+    click.echo(f"   Misses: {stats['total_misses']:,}")
+    click.echo(f"   Hit Rate: {hit_rate:.1%}")
+
+
+@cli.command()
+@click.option('--count', default=1, show_default=True, help='Wallets to generate')
+@click.option('--out', 'out_dir', type=click.Path(file_okay=False), default=None,
+              help='Write one encrypted keystore file per wallet into this directory')
+@click.option('--batch-file', type=click.Path(dir_okay=False), default=None,
+              help='Write every encrypted keystore to one file, one per line')
+@click.option('--password', envvar='BLOCKCHAIN_CLI_KEYSTORE_PASSWORD', default=None,
+              help='Keystore password (prompted for when not given)')
+@click.option('--seed', default=None, help='Reproducible keys for test fixtures; never for real funds')
+@click.option('--workers', type=int, default=None, help='Processes (default: CPU count)')
+@click.option('--scrypt-n', type=int, default=None, help='scrypt cost per keystore (default: 262144)')
+def generate_wallet(count, out_dir, batch_file, password, seed, workers, scrypt_n):
+    """Generate a new Ethereum wallet, or encrypted keystores in bulk"""
+    if out_dir is None and batch_file is None:
+        if count != 1:
+            raise click.UsageError('--count needs --out or --batch-file')
+        from eth_account import Account
+
+        account = Account.create()
+
+        click.echo(f"\n🔐 New Wallet Generated")
+        click.echo(f"   Address: {account.address}")
+        click.echo(f"   Private Key: {account.key.hex()}")
+        click.echo(click.style("\n   ⚠️  KEEP YOUR PRIVATE KEY SAFE!", fg='yellow', bold=True))
+        return
+
+    if out_dir is not None and batch_file is not None:
+        raise click.UsageError('Use either --out or --batch-file')
+
+    from wallet_batch import DEFAULT_SCRYPT_N, generate_wallets, write_batch, write_keystores
+
+    if password is None:
+        password = click.prompt('Keystore password', hide_input=True, confirmation_prompt=True)
+
+    try:
+        start = time.perf_counter()
+        wallets = generate_wallets(count, password, seed.encode() if seed is not None else None,
+                                   workers, scrypt_n or DEFAULT_SCRYPT_N)
+        if out_dir is not None:
+            written, target = write_keystores(wallets, out_dir), out_dir
+        else:
+            written, target = write_batch(wallets, batch_file), batch_file
+        elapsed = time.perf_counter() - start
+
+        click.echo(click.style(f"✓ {written:,} encrypted keystores written to {target}", fg='green'))
+        click.echo(f"   {elapsed:.1f}s, {written / elapsed:,.1f} keys/sec")
+        if seed is not None:
+            click.echo(click.style("   ⚠️  Seeded keys are for test fixtures only", fg='yellow'))
+
+    except Exception as e:
+        click.echo(click.style(f"✗ Error: {e}", fg='red'))
+
+
+@cli.command()
+@click.pass_context
+def shell(ctx):
+    """Interactive prompt reusing one connection and cache across commands"""
+    prefix = global_args(ctx)
+    pool = {}
+    click.echo(f"🐚 Blockchain shell on {ctx.obj['rpc']} (help, exit)")
+
+    try:
+        while True:
+            try:
+                line = input('> ').strip()
+            except EOFError:
+                break
+            if line in ('exit', 'quit'):
+                break
+            if not line:
+                continue
+            args = ['--help'] if line == 'help' else shlex.split(line)
+            run_pooled(prefix + args, pool)
+
+    except KeyboardInterrupt:
+        click.echo()
+    finally:
+        close_pool(pool)
+
+
+class FrameSink(io.RawIOBase):
+    """Binary stream sending every write to the client as one frame of `kind`"""
+
+    def __init__(self, connection: socket.socket, kind: bytes):
+        self.connection = connection
+        self.kind = kind
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        send_frame(self.connection, self.kind, bytes(data))
+        return len(data)
+
+
+def frame_stream(connection: socket.socket, kind: bytes) -> io.TextIOWrapper:
+    """Line-buffered text stream over FrameSink, so NDJSON rows reach the client as they are printed"""
+    return io.TextIOWrapper(io.BufferedWriter(FrameSink(connection, kind)), encoding='utf-8',
+                            line_buffering=True)
+
+
+class DaemonHandler(socketserver.StreamRequestHandler):
+    """
+    One request per connection: a JSON line in, framed output back
+
+    stdout and stderr go back as separate frames, then an exit frame with
+    the command's status (see cli_client).
+    """
+
+    def handle(self):
+        request = json.loads(self.rfile.readline())
+        out = frame_stream(self.connection, STDOUT_FRAME)
+        err = frame_stream(self.connection, STDERR_FRAME)
+
+        # Relative paths are the client's; the working directory is process-wide, so put it back
+        daemon_cwd = os.getcwd()
+        try:
+            os.chdir(request.get('cwd', daemon_cwd))
+            with redirect_stdout(out), redirect_stderr(err):
+                status = run_pooled(request['args'], self.server.pool, request.get('color'))
+            out.flush()
+            err.flush()
+            send_frame(self.connection, EXIT_FRAME, str(status).encode())
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client went away mid-stream
+        finally:
+            os.chdir(daemon_cwd)
+
+
+@cli.command()
+@click.option('--socket', 'socket_path', envvar='BLOCKCHAIN_CLI_SOCKET',
+              default=DEFAULT_SOCKET_PATH, show_default=True, help='Unix socket to listen on')
+def serve(socket_path):
+    """Run a daemon that answers forwarded commands with warm connections"""
+    if not hasattr(socket, 'AF_UNIX'):
+        raise click.ClickException("serve needs Unix domain sockets")
+
+    os.makedirs(os.path.dirname(os.path.abspath(socket_path)), exist_ok=True)
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    # Commands run one at a time: BlockchainCLI and its SQLite cache are single-threaded.
+    # The socket is created owner-only; a chmod after bind would leave a window open
+    umask = os.umask(0o177)
+    try:
+        server = socketserver.UnixStreamServer(socket_path, DaemonHandler)
+    finally:
+        os.umask(umask)
+    server.pool = {}
+
+    click.echo(f"🛰  Serving on {socket_path} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        click.echo("\n✓ Daemon stopped")
+    finally:
+        server.server_close()
+        close_pool(server.pool)
+        os.unlink(socket_path)
 
 
 if __name__ == '__main__':
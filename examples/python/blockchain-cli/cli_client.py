@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Blockchain CLI Thin Client
+Forwards a command line to a running `blockchain_cli.py serve` daemon.
+Only standard-library imports, so forwarding costs little more than
+interpreter startup.
+"""
+
+import json
+import os
+import socket
+import struct
+import sys
+from typing import List, Optional
+
+DEFAULT_SOCKET_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'blockchain-cli', 'daemon.sock')
+
+# Commands that always run in the invoking process: the REPL, the daemon
+# itself, generate-wallet, whose password prompt needs the caller's terminal,
+# and wait, which would hold the one-command-at-a-time daemon for minutes
+LOCAL_COMMANDS = {'serve', 'shell', 'generate-wallet', 'wait'}
+
+# Daemon replies are frames: kind, payload length, payload. Output frames
+# stream as the command runs; the exit frame (status as ASCII) ends the reply.
+FRAME = struct.Struct('>cI')
+STDOUT_FRAME = b'o'
+STDERR_FRAME = b'e'
+EXIT_FRAME = b'x'
+
+
+def send_frame(conn: socket.socket, kind: bytes, payload: bytes):
+    conn.sendall(FRAME.pack(kind, len(payload)) + payload)
+
+
+def runs_locally(args: List[str]) -> bool:
+    """
+    Whether a command line must run in this process
+
+    Prompts and '-' (stdin) file arguments need the caller's stdin and
+    terminal; wait and gas --watch run until interrupted or timed out.
+    """
+    return (bool(LOCAL_COMMANDS & set(args))
+            or any(arg == '-' or arg.endswith('=-') or arg.split('=')[0] == '--watch' for arg in args))
+
+
+def forward(args: List[str]) -> Optional[int]:
+    """
+    Hand a command line to a running daemon and stream its output
+
+    Args:
+        args: Command-line arguments (without the program name)
+
+    Returns:
+        The command's exit status, or None when no daemon answers or the
+        command must run here, so the caller runs it itself
+    """
+    socket_path = os.environ.get('BLOCKCHAIN_CLI_SOCKET', DEFAULT_SOCKET_PATH)
+    if (os.environ.get('BLOCKCHAIN_CLI_NO_DAEMON') or not hasattr(socket, 'AF_UNIX')
+            or not os.path.exists(socket_path) or runs_locally(args)):
+        return None
+
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(socket_path)
+    except OSError:
+        conn.close()
+        return None  # stale socket file
+
+    streams = {STDOUT_FRAME: sys.stdout.buffer, STDERR_FRAME: sys.stderr.buffer}
+    with conn, conn.makefile('rb') as reply:
+        request = {'args': args, 'cwd': os.getcwd(), 'color': sys.stdout.isatty()}
+        conn.sendall(json.dumps(request).encode() + b'\n')
+        while True:
+            header = reply.read(FRAME.size)
+            if len(header) < FRAME.size:
+                sys.stderr.write("✗ Daemon closed the connection before the command finished\n")
+                return 1
+
+            kind, length = FRAME.unpack(header)
+            payload = reply.read(length)
+            if kind == EXIT_FRAME:
+                return int(payload)
+            streams[kind].write(payload)
+            streams[kind].flush()
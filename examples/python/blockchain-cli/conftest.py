@@ -0,0 +1,41 @@
+"""
+Shared test fixtures
+
+The stub JSON-RPC node lives with the web3.py scripts' fixtures; it is
+loaded from there so both suites run against the same server.
+"""
+import importlib.util
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS = os.path.join(HERE, '..', 'web3py-scripts')
+sys.path.insert(0, HERE)
+
+_spec = importlib.util.spec_from_file_location('web3py_scripts_conftest', os.path.join(SCRIPTS, 'conftest.py'))
+_shared = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_shared)
+
+StubRPCServer = _shared.StubRPCServer
+rpc_server = _shared.rpc_server
+
+
+@pytest.fixture
+def make_cli(rpc_server, tmp_path):
+    """Factory fixture: make_cli(handlers, cache=True, **server_kwargs) -> (BlockchainCLI, server)"""
+    from blockchain_cli import BlockchainCLI
+    from rpc_cache import RPCCache
+
+    instances = []
+
+    def make(handlers, cache=True, **kwargs):
+        server = rpc_server(handlers, **kwargs)
+        instance = BlockchainCLI(server.url, cache=RPCCache(str(tmp_path / 'rpc_cache.db')) if cache else None)
+        instances.append(instance)
+        return instance, server
+
+    yield make
+    for instance in instances:
+        instance.close()
@@ -0,0 +1,54 @@
+"""
+Tests for the startup benchmark and the lazy-import discipline it measures
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+from bench_startup import CLI, TX_HASH, benchmark_commands, start_stub, time_command
+
+# Runs the CLI in-process, then reports whether web3 got imported
+IMPORT_PROBE = """
+import runpy, sys
+sys.argv = [{cli!r}] + {args!r}
+try:
+    runpy.run_path({cli!r}, run_name='__main__')
+except SystemExit:
+    pass
+sys.stderr.write('web3 imported: %s\\n' % ('web3' in sys.modules))
+"""
+
+
+@pytest.fixture
+def cli_env(tmp_path):
+    return dict(os.environ, BLOCKCHAIN_CLI_NO_DAEMON='1',
+                BLOCKCHAIN_CLI_CACHE=str(tmp_path / 'rpc_cache.db'))
+
+
+def test_every_benchmarked_command_succeeds(tmp_path, cli_env):
+    hash_file = tmp_path / 'hashes.txt'
+    hash_file.write_text(TX_HASH + '\n')
+    server, rpc_url = start_stub()
+    try:
+        for args, expected in benchmark_commands(str(hash_file)).values():
+            time_command(rpc_url, args, expected, 1, cli_env)
+    finally:
+        server.shutdown()
+
+
+def test_failed_command_is_not_timed(cli_env):
+    server, rpc_url = start_stub()
+    try:
+        with pytest.raises(RuntimeError, match='failed'):
+            time_command(rpc_url, ['balance', '0x1234'], 'ETH', 1, cli_env)
+    finally:
+        server.shutdown()
+
+
+@pytest.mark.parametrize('args', [['--help'], ['generate-wallet']])
+def test_command_does_not_import_web3(args, cli_env):
+    result = subprocess.run([sys.executable, '-c', IMPORT_PROBE.format(cli=CLI, args=args)],
+                            capture_output=True, text=True, env=cli_env)
+
+    assert 'web3 imported: False' in result.stderr, result.stderr
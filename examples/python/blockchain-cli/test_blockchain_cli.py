@@ -0,0 +1,328 @@
+"""
+Tests for the blockchain CLI
+"""
+import csv
+import json
+
+import pytest
+from click.testing import CliRunner
+from blockchain_cli import TX_RECORD_FIELDS, BlockStats, cli, parse_block_range, read_tx_hashes, tx_record
+
+NETWORK = {'eth_chainId': '0x1', 'eth_blockNumber': '0x10', 'eth_gasPrice': '0x3b9aca00'}
+
+
+def run(server, *args, cache_path=None):
+    """Invoke the CLI in-process against a stub node"""
+    options = ['--rpc', server.url] + (['--cache-path', cache_path] if cache_path else ['--no-cache'])
+    return CliRunner(mix_stderr=False).invoke(cli, options + list(args), obj={})
+
+
+class TestConnectivity:
+    """Test the connectivity probe"""
+
+    def test_probe_bypasses_cache(self, make_cli):
+        cli_obj, server = make_cli({'eth_chainId': '0x1'})
+        assert cli_obj.is_connected()
+        # eth_chainId is now cached forever; the probe must still ask the node
+        assert cli_obj.call('eth_chainId') == '0x1'
+
+        server.close()
+        assert not cli_obj.is_connected()
+        assert cli_obj.call('eth_chainId') == '0x1'
+
+    def test_info_reports_probe_result(self, rpc_server, tmp_path):
+        server = rpc_server(NETWORK)
+        cache_path = str(tmp_path / 'rpc_cache.db')
+        assert 'Connected: True' in run(server, 'info', cache_path=cache_path).output
+
+        # The network fields come from the cache; the probe still notices
+        server.close()
+        assert 'Connected: False' in run(server, 'info', cache_path=cache_path).output
+
+
+class TestResponseCache:
+    """Test when the on-disk cache is opened"""
+
+    def test_opened_on_first_call(self, rpc_server, tmp_path):
+        server = rpc_server(NETWORK)
+        cache_path = tmp_path / 'cache' / 'rpc_cache.db'
+
+        assert run(server, 'generate-wallet', cache_path=str(cache_path)).exit_code == 0
+        assert not cache_path.parent.exists()
+
+        assert 'Chain ID: 1' in run(server, 'info', cache_path=str(cache_path)).output
+        assert cache_path.exists()
+
+
+def block_handler(number_hex, full):
+    """eth_getBlockByNumber stub: later blocks answer sooner, so batches finish out of order"""
+    import time
+
+    number = int(number_hex, 16)
+    time.sleep(0.002 * (40 - number % 40))
+    return {
+        'number': hex(number), 'hash': '0x' + f"{number:064x}", 'timestamp': hex(1000 + number),
+        'transactions': ['0x' + '00' * 32] * (number % 3), 'gasUsed': hex(number * 1000),
+        'gasLimit': hex(100000), 'baseFeePerGas': hex(number * 10 ** 9), 'size': '0x100',
+    }
+
+
+class TestBlockRange:
+    """Test START..END parsing"""
+
+    @pytest.mark.parametrize('text,expected', [
+        ('0..10', (0, '10')),
+        ('18000000..latest', (18000000, 'latest')),
+        ('7..7', (7, '7')),
+    ])
+    def test_valid(self, text, expected):
+        assert parse_block_range(text) == expected
+
+    @pytest.mark.parametrize('text', ['10', '..10', '10..', '-1..5', '1...5', 'a..b', '5..earliest', '0x1..0x2'])
+    def test_invalid(self, text):
+        with pytest.raises(ValueError, match='Invalid block range'):
+            parse_block_range(text)
+
+
+class TestBlocks:
+    """Test the concurrent block scan"""
+
+    def test_iter_blocks_in_order_under_prefetch(self, make_cli):
+        cli_obj, server = make_cli({'eth_getBlockByNumber': block_handler}, cache=False)
+
+        numbers = [b['number'] for b in cli_obj.iter_blocks(3, 82, batch_size=3, concurrency=6)]
+
+        assert numbers == list(range(3, 83))
+        assert server.http_requests == 27
+
+    def test_missing_block_raises(self, make_cli):
+        cli_obj, _ = make_cli({'eth_getBlockByNumber': lambda number, full: None}, cache=False)
+
+        with pytest.raises(ValueError, match='Block 5 not found'):
+            list(cli_obj.iter_blocks(5, 6))
+
+    def test_command_streams_ndjson_to_latest(self, rpc_server):
+        server = rpc_server({'eth_getBlockByNumber': block_handler, 'eth_blockNumber': hex(24)})
+
+        result = run(server, 'blocks', '10..latest', '--batch-size', '4')
+
+        rows = [json.loads(line) for line in result.stdout.splitlines()]
+        assert [row['number'] for row in rows] == list(range(10, 25))
+        assert rows[2] == {'number': 12, 'hash': '0x' + f"{12:064x}", 'timestamp': 1012,
+                           'transactions': 0, 'gasUsed': 12000, 'gasLimit': 100000,
+                           'baseFeePerGas': 12 * 10 ** 9}
+
+    def test_command_reports_empty_range(self, rpc_server):
+        server = rpc_server({'eth_getBlockByNumber': block_handler})
+
+        result = run(server, 'blocks', '9..3')
+
+        assert result.stdout == ''
+        assert 'Empty block range' in result.stderr
+
+    def test_stats_go_to_stderr_with_rows(self, rpc_server):
+        server = rpc_server({'eth_getBlockByNumber': block_handler})
+
+        result = run(server, 'blocks', '1..10', '--stats')
+
+        assert len(result.stdout.splitlines()) == 10
+        assert 'Block Stats (10 blocks)' in result.stderr
+        assert 'gas_utilization_pct' in result.stderr
+
+
+def tx_hash(i):
+    return '0x' + f"{i:064x}"
+
+
+class TransactionNode:
+    """Stub transactions and receipts for hashes 1..n; other hashes are unknown, `pending` ones unmined"""
+
+    def __init__(self, n, pending=()):
+        self.n = n
+        self.pending = set(pending)
+
+    def index(self, h):
+        i = int(h, 16)
+        return i if 1 <= i <= self.n else None
+
+    def transaction(self, h):
+        import time
+
+        i = self.index(h)
+        if i is None:
+            return None
+        # Later hashes answer sooner, so batches finish out of order
+        time.sleep(0.001 * (self.n - i))
+        mined = i not in self.pending
+        return {'hash': h, 'blockNumber': hex(100 + i) if mined else None,
+                'transactionIndex': '0x0' if mined else None, 'from': '0x' + '11' * 20,
+                'to': '0x' + '22' * 20, 'value': hex(i * 10 ** 15), 'nonce': hex(i),
+                'gas': '0x5208', 'gasPrice': '0x3b9aca00'}
+
+    def receipt(self, h):
+        i = self.index(h)
+        if i is None or i in self.pending:
+            return None
+        return {'transactionHash': h, 'status': '0x1', 'gasUsed': '0x5208',
+                'effectiveGasPrice': '0x3b9aca00', 'contractAddress': None}
+
+    def handlers(self):
+        return {'eth_getTransactionByHash': self.transaction,
+                'eth_getTransactionReceipt': self.receipt,
+                'eth_blockNumber': hex(1000)}
+
+
+class TestTransactions:
+    """Test bulk transaction + receipt lookups"""
+
+    def test_read_tx_hashes(self):
+        lines = ['0x' + 'AB' * 32 + '\n', '\n', '# header\n', f"  {tx_hash(2)}  # second\n"]
+        assert list(read_tx_hashes(lines)) == ['0x' + 'ab' * 32, tx_hash(2)]
+
+        with pytest.raises(ValueError, match='Line 2: invalid transaction hash: 0x12'):
+            list(read_tx_hashes([tx_hash(1), '0x12']))
+
+    def test_tx_record_joins_and_decodes(self):
+        node = TransactionNode(3)
+
+        record = tx_record(tx_hash(3), node.transaction(tx_hash(3)), node.receipt(tx_hash(3)))
+
+        assert list(record) == list(TX_RECORD_FIELDS)
+        assert record['blockNumber'] == 103 and record['value'] == 3 * 10 ** 15
+        assert record['status'] == 1 and record['gasUsed'] == 21000
+        assert tx_record(tx_hash(9), None, None) == dict.fromkeys(TX_RECORD_FIELDS) | {'hash': tx_hash(9)}
+
+    def test_in_input_order_across_batches(self, make_cli):
+        node = TransactionNode(23)
+        cli_obj, server = make_cli(node.handlers(), cache=False)
+        hashes = [tx_hash(i) for i in range(23, 0, -1)]
+
+        records = list(cli_obj.iter_transactions(hashes, batch_size=4, concurrency=4))
+
+        assert [record['hash'] for record in records] == hashes
+        assert [record['nonce'] for record in records] == list(range(23, 0, -1))
+        # Transaction and receipt share a batch: one request per 4 hashes
+        assert server.http_requests == 6
+
+    def test_hashes_read_as_batches_go_out(self, make_cli):
+        node = TransactionNode(100)
+        cli_obj, _ = make_cli(node.handlers(), cache=False)
+        consumed = []
+
+        def hashes():
+            for i in range(1, 101):
+                consumed.append(i)
+                yield tx_hash(i)
+
+        records = cli_obj.iter_transactions(hashes(), batch_size=5, concurrency=2)
+        next(records)
+
+        assert len(consumed) <= 5 * 3
+
+    def test_unknown_and_pending_hashes_keep_their_row(self, make_cli):
+        node = TransactionNode(3, pending={2})
+        cli_obj, _ = make_cli(node.handlers())
+
+        records = list(cli_obj.iter_transactions([tx_hash(i) for i in (1, 2, 7)]))
+
+        assert [record['blockNumber'] for record in records] == [101, None, None]
+        assert records[1]['nonce'] == 2 and records[1]['status'] is None
+        assert records[2] == dict.fromkeys(TX_RECORD_FIELDS) | {'hash': tx_hash(7)}
+
+    def test_endpoint_without_batch_support(self, make_cli):
+        node = TransactionNode(6)
+        cli_obj, server = make_cli(node.handlers(), cache=False, batching=False)
+        hashes = [tx_hash(i) for i in range(1, 7)]
+
+        records = list(cli_obj.iter_transactions(hashes, batch_size=4, concurrency=2))
+
+        assert [record['hash'] for record in records] == hashes
+        assert all(record['status'] == 1 for record in records)
+        # Each rejected batch is replayed one call at a time
+        assert server.http_requests == 2 + 2 * 6
+
+    def test_command_ndjson(self, rpc_server, tmp_path):
+        server = rpc_server(TransactionNode(5).handlers())
+        hash_file = tmp_path / 'hashes.txt'
+        hash_file.write_text('\n'.join([tx_hash(5), tx_hash(42), '', tx_hash(1)]) + '\n')
+
+        result = run(server, 'txs', '--from-file', str(hash_file), '--batch-size', '2')
+
+        rows = [json.loads(line) for line in result.stdout.splitlines()]
+        assert [row['hash'] for row in rows] == [tx_hash(5), tx_hash(42), tx_hash(1)]
+        assert rows[0]['blockNumber'] == 105 and rows[1]['blockNumber'] is None
+        assert '👀 1 transactions not found or still pending' in result.stderr
+
+    def test_command_csv(self, rpc_server, tmp_path):
+        server = rpc_server(TransactionNode(5).handlers())
+        hash_file = tmp_path / 'hashes.txt'
+        hash_file.write_text('\n'.join(tx_hash(i) for i in (3, 99, 4)))
+
+        result = run(server, 'txs', '--from-file', str(hash_file), '--format', 'csv')
+
+        rows = list(csv.DictReader(result.stdout.splitlines()))
+        assert tuple(rows[0]) == TX_RECORD_FIELDS
+        assert [row['hash'] for row in rows] == [tx_hash(3), tx_hash(99), tx_hash(4)]
+        assert rows[0]['gasUsed'] == '21000' and rows[0]['contractAddress'] == ''
+        assert rows[1]['blockNumber'] == '' and rows[1]['status'] == ''
+
+    def test_command_reports_invalid_hash(self, rpc_server, tmp_path):
+        server = rpc_server(TransactionNode(5).handlers())
+        hash_file = tmp_path / 'hashes.txt'
+        hash_file.write_text(f"{tx_hash(1)}\nnot-a-hash\n")
+
+        result = run(server, 'txs', '--from-file', str(hash_file))
+
+        assert '✗ Error: Line 2: invalid transaction hash: not-a-hash' in result.stderr
+
+
+class TestBlockStats:
+    """Test the numpy block statistics"""
+
+    def test_summary(self):
+        stats = BlockStats(4)
+        for gas_used, base_fee, tx_count in [(10, 1, 0), (20, 2, 1), (30, 3, 2), (40, 4, 3)]:
+            stats.add({'gasUsed': gas_used, 'gasLimit': 100, 'baseFeePerGas': base_fee * 10 ** 9,
+                       'transactions': [None] * tx_count})
+
+        summary = stats.summary()
+
+        assert summary['gas_utilization_pct']['min'] == 10
+        assert summary['gas_utilization_pct']['max'] == 40
+        assert summary['gas_utilization_pct']['mean'] == 25
+        assert summary['base_fee_gwei']['p50'] == 2.5
+        assert summary['transactions']['p90'] == pytest.approx(2.7)
+
+    def test_only_filled_rows_count(self):
+        stats = BlockStats(10)
+        stats.add({'gasUsed': 50, 'gasLimit': 0, 'transactions': []})
+
+        summary = stats.summary()
+
+        # No base fee (pre-London) reads as 0; a zero gas limit does not divide by zero
+        assert summary['base_fee_gwei']['max'] == 0
+        assert summary['gas_utilization_pct']['max'] == 5000
+
+
+class TestGasOracle:
+    """Test fee oracle polling"""
+
+    FEE_HISTORY = {'oldestBlock': '0x10', 'baseFeePerGas': ['0x1', '0x2'], 'gasUsedRatio': [0.5],
+                   'reward': [['0x1', '0x2', '0x3']]}
+
+    def test_watch_oracle_bypasses_cache(self, make_cli):
+        head = {'number': 16}
+        cli_obj, server = make_cli({'eth_blockNumber': lambda: hex(head['number']),
+                                    'eth_feeHistory': lambda *params: self.FEE_HISTORY})
+
+        cached = cli_obj.gas_oracle(cached=True)
+        cached.refresh()
+        head['number'] = 17
+        # eth_blockNumber is cached for a couple of seconds
+        assert cached.refresh() == 0
+
+        polling = cli_obj.gas_oracle(cached=False)
+        polling.refresh()
+        head['number'] = 18
+        assert polling.refresh() == 1
+        assert polling.head == 18
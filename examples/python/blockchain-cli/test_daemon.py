@@ -0,0 +1,149 @@
+"""
+Tests for the shell, the serve daemon and the cli_client forwarder
+"""
+import json
+import os
+import signal
+import socket
+import stat
+import subprocess
+import sys
+import time
+
+import pytest
+from click.testing import CliRunner
+
+import cli_client
+from blockchain_cli import DaemonHandler, cli, close_pool, run_pooled
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+NETWORK = {'eth_chainId': '0x1', 'eth_blockNumber': '0x10', 'eth_gasPrice': '0x3b9aca00',
+           'eth_getBlockByNumber': lambda number, full: {'number': number, 'hash': '0x' + 'ab' * 32,
+                                                         'timestamp': '0x0', 'gasUsed': '0x0',
+                                                         'gasLimit': '0x1', 'transactions': []}}
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """A `serve` process on a temporary socket, stopped with Ctrl+C"""
+    socket_path = str(tmp_path / 'daemon.sock')
+    process = subprocess.Popen([sys.executable, os.path.join(HERE, 'blockchain_cli.py'), 'serve',
+                                '--socket', socket_path], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    deadline = time.monotonic() + 30
+    while not os.path.exists(socket_path):
+        assert process.poll() is None and time.monotonic() < deadline, process.stderr.read()
+        time.sleep(0.05)
+    assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+
+    yield socket_path
+    process.send_signal(signal.SIGINT)
+    output, _ = process.communicate(timeout=10)
+    assert '✓ Daemon stopped' in output.decode()
+    assert not os.path.exists(socket_path)
+
+
+@pytest.fixture
+def forward(daemon, monkeypatch):
+    """cli_client.forward against the test daemon"""
+    monkeypatch.setenv('BLOCKCHAIN_CLI_SOCKET', daemon)
+    monkeypatch.delenv('BLOCKCHAIN_CLI_NO_DAEMON', raising=False)
+    return cli_client.forward
+
+
+class TestRunPooled:
+    """Exit statuses match what the command would exit with as its own process"""
+
+    @pytest.mark.parametrize('args, status', [
+        (['--help'], 0),
+        (['wait'], 2),
+        (['no-such-command'], 2),
+    ])
+    def test_exit_status(self, args, status, capsys):
+        pool = {}
+        assert run_pooled(args, pool) == status
+        close_pool(pool)
+
+    def test_command_status(self, rpc_server, capsys):
+        server = rpc_server(NETWORK)
+        pool = {}
+        assert run_pooled(['--rpc', server.url, '--no-cache', 'info'], pool) == 0
+        assert 'Chain ID: 1' in capsys.readouterr().out
+        close_pool(pool)
+
+
+class TestShell:
+    def test_runs_each_line_until_exit(self, rpc_server):
+        server = rpc_server(NETWORK)
+        result = CliRunner().invoke(cli, ['--rpc', server.url, '--no-cache', 'shell'],
+                                    input='info\nwait\n\ninfo\nexit\ninfo\n', obj={})
+
+        assert result.exit_code == 0
+        assert result.output.count('Chain ID: 1') == 2  # nothing after 'exit'
+        assert 'Usage:' in result.output  # a failing line doesn't end the shell
+
+    def test_end_of_input_leaves_the_shell(self, rpc_server):
+        server = rpc_server(NETWORK)
+        result = CliRunner().invoke(cli, ['--rpc', server.url, 'shell'], input='', obj={})
+        assert result.exit_code == 0
+
+
+class TestForward:
+    def test_no_daemon(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('BLOCKCHAIN_CLI_SOCKET', str(tmp_path / 'missing.sock'))
+        assert cli_client.forward(['info']) is None
+
+    @pytest.mark.parametrize('args', [
+        ['txs', '--from-file', '-'],
+        ['txs', '--from-file=-'],
+        ['generate-wallet'],
+        ['shell'],
+        ['wait', '0x' + 'ab' * 32],
+        ['gas', '--oracle', '--watch', '12'],
+        ['gas', '--oracle', '--watch=12'],
+    ])
+    def test_stdin_prompting_and_long_running_commands_run_locally(self, args):
+        assert cli_client.runs_locally(args)
+
+    @pytest.mark.parametrize('args', [
+        ['txs', '--from-file', 'hashes.txt'],
+        ['gas', '--oracle'],
+        ['info'],
+    ])
+    def test_other_commands_are_forwarded(self, args):
+        assert not cli_client.runs_locally(args)
+
+    def test_output_and_status(self, forward, rpc_server, capfd):
+        server = rpc_server(NETWORK)
+
+        assert forward(['--rpc', server.url, '--no-cache', 'info']) == 0
+        assert 'Chain ID: 1' in capfd.readouterr().out
+
+        assert forward(['no-such-command']) == 2
+        captured = capfd.readouterr()
+        assert captured.out == '' and 'Usage:' in captured.err
+
+    def test_stderr_stays_off_stdout(self, forward, rpc_server, capfd):
+        server = rpc_server(NETWORK)
+
+        assert forward(['--rpc', server.url, '--no-cache', 'blocks', '1..3', '--stats']) == 0
+        captured = capfd.readouterr()
+        assert [json.loads(line)['number'] for line in captured.out.splitlines()] == [1, 2, 3]
+        assert captured.err
+
+
+class TestDaemonHandler:
+    def test_restores_working_directory(self, tmp_path):
+        server = type('Server', (), {'pool': {}})()
+        client, daemon_end = socket.socketpair()
+        request = {'args': ['--help'], 'cwd': str(tmp_path), 'color': False}
+        client.sendall(json.dumps(request).encode() + b'\n')
+        cwd = os.getcwd()
+
+        DaemonHandler(daemon_end, None, server)
+        daemon_end.close()
+
+        assert os.getcwd() == cwd
+        reply = client.makefile('rb').read()
+        client.close()
+        assert reply.endswith(cli_client.FRAME.pack(cli_client.EXIT_FRAME, 1) + b'0')
+        assert b'Usage:' in reply
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Web3.py Async Event Listener
+Native asyncio event monitoring on AsyncWeb3 with websocket subscriptions
+"""
+
+from web3 import AsyncWeb3, Web3
+from web3.providers.websocket import WebsocketProviderV2
+from web3._utils.method_formatters import log_entry_formatter
+from event_listener import event_signature
+import asyncio
+import json
+from typing import Dict, Any, Callable, Optional
+
+
+class AsyncEventListener:
+    """Listen to smart contract events without blocking the event loop"""
+
+    def __init__(
+        self,
+        rpc_url: str,
+        contract_address: str,
+        abi: list,
+        queue_size: int = 1000
+    ):
+        """
+        Initialize async event listener
+
+        Call `await listener.connect()` before watching.
+
+        Args:
+            rpc_url: ws(s):// endpoint for subscriptions, http(s):// for polling
+            contract_address: Contract to monitor
+            abi: Contract ABI
+            queue_size: Logs buffered between receiver and callbacks
+        """
+        self.rpc_url = rpc_url
+        self.contract_address = Web3.to_checksum_address(contract_address)
+        self.abi = abi
+        self.queue_size = queue_size
+        self.w3: Optional[AsyncWeb3] = None
+        self.contract = None
+
+    @property
+    def is_websocket(self) -> bool:
+        return self.rpc_url.startswith(('ws://', 'wss://'))
+
+    async def connect(self):
+        """Open the async provider and bind the contract"""
+        if self.is_websocket:
+            self.w3 = await AsyncWeb3.persistent_websocket(
+                WebsocketProviderV2(self.rpc_url)
+            )
+        else:
+            self.w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(self.rpc_url))
+
+        if not await self.w3.is_connected():
+            raise ConnectionError(f"Failed to connect to {self.rpc_url}")
+
+        self.contract = self.w3.eth.contract(
+            address=self.contract_address,
+            abi=self.abi
+        )
+
+        print(f"✓ Connected to network ({'websocket' if self.is_websocket else 'http'})")
+        print(f"✓ Monitoring contract: {self.contract_address}")
+        print(f"✓ Chain ID: {await self.w3.eth.chain_id}")
+
+    async def disconnect(self):
+        """Close a persistent websocket connection"""
+        if self.w3 is not None and self.is_websocket:
+            await self.w3.provider.disconnect()
+
+    def _log_filter(self, event_name: str) -> Dict[str, Any]:
+        """Address + topic0 filter for one event"""
+        topic = Web3.keccak(text=event_signature(self.abi, event_name)).hex()
+        return {'address': self.contract_address, 'topics': [topic]}
+
+    async def watch_event(
+        self,
+        event_name: str,
+        callback: Callable[[Dict[str, Any]], Any],
+        poll_interval: float = 2,
+        workers: int = 1
+    ):
+        """
+        Watch for new events until cancelled
+
+        Logs flow receiver -> bounded queue -> callback workers. When the
+        queue is full the receiver waits, so a slow callback slows intake
+        instead of stalling the loop. Coroutine callbacks are awaited;
+        plain callbacks run in a worker thread.
+
+        Args:
+            event_name: Name of the event to watch
+            callback: Function or coroutine function called per decoded log
+            poll_interval: Seconds between polls when subscriptions are unavailable
+            workers: Concurrent callback consumers
+        """
+        if self.w3 is None:
+            await self.connect()
+
+        event = getattr(self.contract.events, event_name)()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        consumers = [
+            asyncio.create_task(self._consume(queue, event, callback))
+            for _ in range(workers)
+        ]
+
+        print(f"👀 Watching for {event_name} events (async)...")
+
+        try:
+            await self._receive(event_name, queue, poll_interval)
+            await queue.join()
+        finally:
+            for task in consumers:
+                task.cancel()
+            await asyncio.gather(*consumers, return_exceptions=True)
+
+    async def _receive(
+        self,
+        event_name: str,
+        queue: asyncio.Queue,
+        poll_interval: float
+    ):
+        """Feed raw logs into the queue from a subscription or a poller"""
+        log_filter = self._log_filter(event_name)
+
+        if self.is_websocket:
+            try:
+                subscription_id = await self.w3.eth.subscribe('logs', log_filter)
+            except Exception as e:
+                print(f"⚠ eth_subscribe unavailable ({e}), falling back to polling")
+            else:
+                print(f"   Subscription: {subscription_id}")
+                try:
+                    async for message in self.w3.ws.listen_to_websocket():
+                        params = message.get('params', message)
+                        await queue.put(params.get('result', params))
+                finally:
+                    await self.w3.eth.unsubscribe(subscription_id)
+                return
+
+        print(f"   Poll interval: {poll_interval}s")
+        filter_id = await self.w3.eth.filter({**log_filter, 'fromBlock': 'latest'})
+        try:
+            while True:
+                for raw_log in await self.w3.eth.get_filter_changes(filter_id):
+                    await queue.put(raw_log)
+                await asyncio.sleep(poll_interval)
+        finally:
+            await self.w3.eth.uninstall_filter(filter_id)
+
+    async def _consume(self, queue: asyncio.Queue, event, callback: Callable):
+        """Decode queued logs and hand them to the callback"""
+        is_coroutine = asyncio.iscoroutinefunction(callback)
+
+        while True:
+            raw_log = await queue.get()
+            try:
+                # Subscription payloads arrive hex-encoded; filter results don't
+                event_log = event.process_log(log_entry_formatter(raw_log))
+                if is_coroutine:
+                    await callback(event_log)
+                else:
+                    await asyncio.to_thread(callback, event_log)
+            except Exception as e:
+                print(f"✗ Callback error: {e}")
+            finally:
+                queue.task_done()
+
+
+async def print_transfer(event_log: Dict[str, Any]):
+    """Example coroutine callback for Transfer events"""
+    args = event_log['args']
+    print(f"📤 Transfer {args['from']} → {args['to']}: {args['value']} "
+          f"(block {event_log['blockNumber']})")
+
+
+async def main():
+    """Example usage"""
+
+    ERC20_ABI = json.loads('''[
+        {
+            "anonymous": false,
+            "inputs": [
+                {"indexed": true, "name": "from", "type": "address"},
+                {"indexed": true, "name": "to", "type": "address"},
+                {"indexed": false, "name": "value", "type": "uint256"}
+            ],
+            "name": "Transfer",
+            "type": "event"
+        }
+    ]''')
+
+    WS_URL = "wss://eth-mainnet.g.alchemy.com/v2/YOUR_API_KEY"
+    CONTRACT_ADDRESS = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"  # USDC
+
+    listener = AsyncEventListener(WS_URL, CONTRACT_ADDRESS, ERC20_ABI)
+
+    try:
+        await listener.connect()
+        await listener.watch_event('Transfer', print_transfer)
+    finally:
+        await listener.disconnect()
+
+
+if __name__ == '__main__':
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n✓ Stopped watching events")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Solidity Compilation Cache
+Content-addressed store of solc artifacts, keyed by source, compiler
+version and settings
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, Optional, Sequence
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'solc-artifacts')
+DEFAULT_SOLC_VERSION = '0.8.20'
+
+
+def ensure_solc(version: str):
+    """
+    Install solc `version` unless it is already there
+
+    install_solc always goes to the network for the release list; checking
+    the local install directory first makes repeat runs free.
+    """
+    from solcx import get_installed_solc_versions, install_solc
+
+    if not any(str(installed) == version for installed in get_installed_solc_versions()):
+        install_solc(version)
+
+
+class CompileCache:
+    """Compiled contracts stored on disk, one JSON file per compilation"""
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Initialize cache
+
+        Args:
+            directory: Artifact directory (default: $SOLC_CACHE_DIR or
+                ~/.cache/solc-artifacts)
+        """
+        self.directory = directory or os.getenv('SOLC_CACHE_DIR', DEFAULT_CACHE_DIR)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(source: str, version: str, settings: Dict[str, Any]) -> str:
+        """Hash of everything that changes solc's output"""
+        return hashlib.sha256(json.dumps({
+            'source': hashlib.sha256(source.encode()).hexdigest(),
+            'version': version,
+            'settings': settings,
+        }, sort_keys=True).encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Stored artifacts for key, or None"""
+        try:
+            with open(self._path(key)) as f:
+                artifacts = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return artifacts
+
+    def put(self, key: str, artifacts: Dict[str, Any]):
+        """Store artifacts; written to a temp file and renamed so readers never see half a file"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(artifacts, f)
+        os.replace(tmp, path)
+
+    def compile_source(
+        self,
+        source: str,
+        version: str = DEFAULT_SOLC_VERSION,
+        output_values: Sequence[str] = ('abi', 'bin'),
+        **settings: Any
+    ) -> Dict[str, Any]:
+        """
+        solcx.compile_source, answered from the cache when nothing changed
+
+        solcx is only imported (and solc only checked for) on a miss.
+
+        Args:
+            source: Solidity source code
+            version: solc version
+            output_values: Artifacts to ask solc for
+            settings: Extra compile_source arguments, e.g. optimize=True
+
+        Returns:
+            {'<stdin>:Name': {'abi': ..., 'bin': ...}} as compile_source returns it
+        """
+        key = self.key(source, version, {'output_values': sorted(output_values), **settings})
+        artifacts = self.get(key)
+        if artifacts is None:
+            from solcx import compile_source
+
+            ensure_solc(version)
+            artifacts = compile_source(source, output_values=list(output_values),
+                                       solc_version=version, **settings)
+            self.put(key, artifacts)
+        return artifacts
+
+    def stats(self) -> Dict[str, int]:
+        """Hits and misses since this cache was created"""
+        return {'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,127 @@
+"""
+Shared test fixtures and fakes
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+ERC20_ABI = [{
+    "anonymous": False,
+    "inputs": [
+        {"indexed": True, "name": "from", "type": "address"},
+        {"indexed": True, "name": "to", "type": "address"},
+        {"indexed": False, "name": "value", "type": "uint256"}
+    ],
+    "name": "Transfer",
+    "type": "event"
+}]
+
+CONTRACT_ADDRESS = '0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48'
+
+
+def make_logs(blocks, per_block=2):
+    """Build fake logs, several per block"""
+    return [
+        {'blockNumber': block, 'logIndex': index, 'args': {'value': block}}
+        for block in blocks
+        for index in range(per_block)
+    ]
+
+
+class FakeGetLogs:
+    """getLogs stub that rejects ranges wider than max_span"""
+
+    def __init__(self, max_span):
+        self.max_span = max_span
+        self.calls = []
+
+    def __call__(self, fromBlock, toBlock):
+        self.calls.append((fromBlock, toBlock))
+        if toBlock - fromBlock + 1 > self.max_span:
+            raise ValueError({'code': -32005, 'message': 'query returned more than 10000 results'})
+        # Return in reverse to check ordering is restored
+        return list(reversed(make_logs(range(fromBlock, toBlock + 1))))
+
+
+class StubRPCServer:
+    """Local JSON-RPC endpoint with canned handlers and injectable delay"""
+
+    def __init__(self, handlers, delay=0.0, batching=True):
+        self.handlers = handlers
+        self.delay = delay
+        self.batching = batching
+        self.http_requests = 0
+        self.calls = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                stub.http_requests += 1
+                time.sleep(stub.delay)
+
+                if isinstance(body, list) and not stub.batching:
+                    reply = {'jsonrpc': '2.0', 'id': None,
+                             'error': {'code': -32600, 'message': 'batch not supported'}}
+                elif isinstance(body, list):
+                    reply = [stub.answer(request) for request in body]
+                else:
+                    reply = stub.answer(body)
+
+                payload = json.dumps(reply).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def answer(self, request):
+        self.calls.append(request['method'])
+        handler = self.handlers.get(request['method'])
+        if handler is None:
+            return {'jsonrpc': '2.0', 'id': request['id'],
+                    'error': {'code': -32601, 'message': 'method not found'}}
+        result = handler(*request.get('params', [])) if callable(handler) else handler
+        return {'jsonrpc': '2.0', 'id': request['id'], 'result': result}
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def rpc_server():
+    """Factory fixture: rpc_server(handlers, delay=..., batching=...)"""
+    servers = []
+
+    def start(handlers, **kwargs):
+        server = StubRPCServer(handlers, **kwargs)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+@pytest.fixture
+def listener():
+    """EventListener over a mocked web3 for ERC20_ABI, head at block 1000"""
+    from event_listener import EventListener
+
+    with patch('event_listener.Web3') as mock_web3:
+        mock_web3.return_value.is_connected.return_value = True
+        listener = EventListener('http://localhost:8545', CONTRACT_ADDRESS, ERC20_ABI)
+    listener.w3.eth.block_number = 1000
+    return listener
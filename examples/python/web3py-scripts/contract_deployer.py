@@ -5,63 +5,129 @@ Demonstrates how to deploy smart contracts using Web3.py
 """
 
 from web3 import Web3
-from solcx import compile_source, install_solc
+from web3.exceptions import TransactionNotFound
+from compile_cache import DEFAULT_SOLC_VERSION, CompileCache
+from deploy_manifest import DeploymentManifest, bytecode_hash, create2_address, deployment_key, salt_bytes
+from solc_project import SolcProject
+from gas_oracle import GasOracle
+from nonce_manager import NonceManager
+from receipt_tracker import ReceiptTracker, web3_request_many
+from rpc_router import RPCRouter, web3_provider
 import json
 import os
-from typing import Dict, Any
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
 
 class ContractDeployer:
     """Deploy Ethereum smart contracts using Web3.py"""
 
-    def __init__(self, rpc_url: str, private_key: str):
+    def __init__(
+        self,
+        rpc_url: Union[str, List[str]],
+        private_key: str,
+        compile_cache: Optional[CompileCache] = None
+    ):
         """
         Initialize the deployer
 
         Args:
-            rpc_url: Ethereum RPC endpoint
+            rpc_url: Ethereum RPC endpoint, or a list of endpoints to route across
             private_key: Deployer's private key
+            compile_cache: Artifact cache for compile_contract (default: on-disk cache)
         """
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+        if isinstance(rpc_url, str):
+            self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+        else:
+            self.w3 = Web3(web3_provider(RPCRouter(rpc_url)))
 
         if not self.w3.is_connected():
             raise ConnectionError(f"Failed to connect to {rpc_url}")
 
         self.account = self.w3.eth.account.from_key(private_key)
+        self.gas_oracle = GasOracle.from_web3(self.w3)
+        self.nonces = NonceManager(self.w3, self.account.address)
+        self.receipts = ReceiptTracker.from_web3(self.w3)
+        self.compile_cache = compile_cache or CompileCache()
         print(f"✓ Connected to network")
         print(f"✓ Deployer address: {self.account.address}")
         print(f"✓ Balance: {self.w3.from_wei(self.w3.eth.get_balance(self.account.address), 'ether')} ETH")
 
-    def compile_contract(self, contract_source: str) -> Dict[str, Any]:
+    def compile_contract(
+        self,
+        contract_source: str,
+        solc_version: str = DEFAULT_SOLC_VERSION,
+        contract_name: Optional[str] = None,
+        **settings: Any
+    ) -> Dict[str, Any]:
         """
         Compile Solidity contract
 
+        Unchanged sources come straight from the compile cache; solc is
+        only installed and run on a miss.
+
         Args:
             contract_source: Solidity source code
+            solc_version: Compiler version
+            contract_name: Contract to return (default: the last one in the source)
+            settings: Extra solcx.compile_source arguments, e.g. optimize=True
 
         Returns:
             Compiled contract data (bytecode and ABI)
         """
         print("Compiling contract...")
 
-        # Install Solidity compiler if needed
-        install_solc('0.8.20')
-
-        compiled_sol = compile_source(
+        hits = self.compile_cache.hits
+        compiled_sol = self.compile_cache.compile_source(
             contract_source,
-            output_values=['abi', 'bin']
+            solc_version,
+            output_values=['abi', 'bin'],
+            **settings
         )
 
-        # Get the contract interface
-        contract_id, contract_interface = compiled_sol.popitem()
-
-        print(f"✓ Contract compiled: {contract_id}")
+        # Get the contract interface (the last contract in the source unless named)
+        if contract_name is None:
+            contract_id, contract_interface = list(compiled_sol.items())[-1]
+        else:
+            contract_id = f"<stdin>:{contract_name}"
+            if contract_id not in compiled_sol:
+                raise ValueError(f"Contract {contract_name} not found in source")
+            contract_interface = compiled_sol[contract_id]
+
+        cached = " (cached)" if self.compile_cache.hits > hits else ""
+        print(f"✓ Contract compiled: {contract_id}{cached}")
         return contract_interface
 
+    def compile_project(self, root: str, **options: Any) -> Dict[str, Dict[str, Any]]:
+        """
+        Compile a directory of Solidity files incrementally
+
+        Only files whose own source or imports changed are recompiled; the
+        rest come from the compile cache.
+
+        Args:
+            root: Contracts directory, e.g. 'contracts'
+            options: SolcProject options (remappings, optimize, evm_version, ...)
+
+        Returns:
+            Compiled contract data by fully qualified name,
+            e.g. result['EchoScroll.sol:EchoScroll']
+        """
+        print(f"Compiling project {root}...")
+
+        project = SolcProject(root, cache=self.compile_cache, **options)
+        contracts = project.compile()
+
+        print(f"✓ {len(contracts)} contracts, {len(project.compiled)} of "
+              f"{len(project.sources)} files recompiled")
+        return contracts
+
     def deploy_contract(
         self,
         contract_interface: Dict[str, Any],
         *constructor_args,
-        gas_limit: int = 3000000
+        gas_limit: int = 3000000,
+        fee_speed: Optional[str] = None
     ) -> str:
         """
         Deploy contract to blockchain
@@ -70,6 +136,8 @@ class ContractDeployer:
             contract_interface: Compiled contract data
             constructor_args: Constructor arguments
             gas_limit: Gas limit for deployment
+            fee_speed: 'slow', 'normal' or 'fast' to pay EIP-1559 fees from
+                the gas oracle; None sends a legacy gasPrice transaction
 
         Returns:
             Deployed contract address
@@ -83,14 +151,16 @@ class ContractDeployer:
         )
 
         # Build transaction
-        nonce = self.w3.eth.get_transaction_count(self.account.address)
+        nonce = self.nonces.reserve()
 
-        transaction = Contract.constructor(*constructor_args).build_transaction({
+        tx_params = {
             'chainId': self.w3.eth.chain_id,
             'gas': gas_limit,
-            'gasPrice': self.w3.eth.gas_price,
             'nonce': nonce,
-        })
+            **self._fee_params(fee_speed),
+        }
+
+        transaction = Contract.constructor(*constructor_args).build_transaction(tx_params)
 
         # Sign and send transaction
         signed_txn = self.w3.eth.account.sign_transaction(
@@ -98,12 +168,16 @@ class ContractDeployer:
             private_key=self.account.key
         )
 
-        tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        try:
+            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        except Exception:
+            self.nonces.reset()
+            raise
         print(f"✓ Transaction sent: {tx_hash.hex()}")
 
         # Wait for receipt
         print("Waiting for confirmation...")
-        tx_receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        tx_receipt = self.receipts.wait(tx_hash, timeout=120)
 
         contract_address = tx_receipt.contractAddress
         print(f"✓ Contract deployed at: {contract_address}")
@@ -111,6 +185,327 @@ class ContractDeployer:
 
         return contract_address
 
+    def _fee_params(self, fee_speed: Optional[str]) -> Dict[str, int]:
+        """Legacy gasPrice, or EIP-1559 fees from the gas oracle"""
+        if fee_speed is None:
+            return {'gasPrice': self.w3.eth.gas_price}
+        self.gas_oracle.refresh()
+        return self.gas_oracle.suggest(fee_speed)
+
+    def deploy_batch(
+        self,
+        deployments: Sequence[Tuple[Dict[str, Any], Sequence[Any]]],
+        gas_limit: int = 3000000,
+        fee_speed: Optional[str] = 'normal',
+        **pipeline: Any
+    ) -> List[Optional[str]]:
+        """
+        Deploy many contracts in one pipeline (see send_batch)
+
+        Args:
+            deployments: (contract_interface, constructor_args) pairs
+            gas_limit: Gas limit of each deployment
+            fee_speed: 'slow', 'normal' or 'fast' EIP-1559 fees; None for legacy gasPrice
+            pipeline: send_batch options (timeout, poll_interval, replace_after)
+
+        Returns:
+            Deployed addresses in input order (None for reverted deployments)
+        """
+        print(f"Deploying {len(deployments)} contracts...")
+
+        transactions = []
+        for contract_interface, constructor_args in deployments:
+            Contract = self.w3.eth.contract(
+                abi=contract_interface['abi'],
+                bytecode=contract_interface['bin']
+            )
+            transactions.append({
+                'data': Contract.constructor(*constructor_args).data_in_transaction,
+                'gas': gas_limit,
+            })
+
+        addresses = []
+        for receipt in self.send_batch(transactions, fee_speed, **pipeline):
+            if receipt.status == 1:
+                addresses.append(receipt.contractAddress)
+                print(f"✓ Contract deployed at: {receipt.contractAddress}")
+            else:
+                addresses.append(None)
+                print(f"✗ Deployment in {receipt.transactionHash.hex()} reverted")
+        return addresses
+
+    def send_batch(
+        self,
+        transactions: Sequence[Dict[str, Any]],
+        fee_speed: Optional[str] = 'normal',
+        timeout: float = 300,
+        poll_interval: float = 2.0,
+        replace_after: float = 60.0
+    ) -> List[Any]:
+        """
+        Send many transactions in one pipeline
+
+        Chain id and fees are fetched once and nonces are assigned locally,
+        so every transaction is signed and sent back-to-back; the receipt
+        tracker then waits for all of them at once. A transaction the node
+        no longer knows about after replace_after seconds is re-sent with
+        the same nonce and bumped fees, so one dropped transaction cannot
+        stall those behind it. If another transaction from the account takes
+        one of the nonces, only that transaction is re-sent, with a nonce
+        from the node's pending count.
+
+        Args:
+            transactions: Transactions without chainId, nonce or fees
+                (e.g. {'data': ..., 'gas': ...} or {'to': ..., 'data': ..., 'gas': ...})
+            fee_speed: 'slow', 'normal' or 'fast' EIP-1559 fees; None for legacy gasPrice
+            timeout: Seconds to wait for every receipt
+            poll_interval: Seconds between checks for dropped transactions
+            replace_after: Seconds before a vanished transaction is replaced
+
+        Returns:
+            Receipts in input order
+        """
+        base_params = {'chainId': self.w3.eth.chain_id, **self._fee_params(fee_speed)}
+        first_nonce = self.nonces.reserve(len(transactions))
+
+        pending = {}
+        for i, transaction in enumerate(transactions):
+            nonce = first_nonce + i
+            pending[nonce] = {'index': i, 'tx': {**base_params, **transaction, 'nonce': nonce},
+                              'hashes': [], 'futures': [], 'sent_at': 0.0}
+
+        try:
+            for entry in pending.values():
+                self._send_entry(entry, timeout)
+        except Exception:
+            # Nonces after the failed send were never used; start over from the node
+            self.nonces.reset()
+            raise
+        print(f"✓ {len(pending)} transactions sent (nonces {first_nonce}..{first_nonce + len(pending) - 1})")
+
+        print("Waiting for confirmations...")
+        return self._await_receipts(pending, timeout, poll_interval, replace_after)
+
+    def deploy_manifest(
+        self,
+        contracts: Sequence[Dict[str, Any]],
+        manifest_path: str = 'deployment.json',
+        factory: Optional[str] = None,
+        gas_limit: int = 3000000,
+        fee_speed: Optional[str] = 'normal',
+        **pipeline: Any
+    ) -> Dict[str, str]:
+        """
+        Deploy only what the manifest and the chain do not already have
+
+        Each contract is identified by chain id, creation bytecode hash and
+        constructor arguments (plus salt and factory for CREATE2). Expected
+        addresses come from the manifest, or are precomputed for contracts
+        with a salt when a CREATE2 factory is configured. One batched request
+        reads the chain id and the code at every expected address; contracts
+        with code there are skipped, and the rest go out through send_batch.
+
+        Args:
+            contracts: Dicts with 'name', 'interface' (abi/bin), optional
+                'args' and optional 'salt' (CREATE2, needs factory)
+            manifest_path: Manifest file; created or updated in place
+            factory: CREATE2 factory taking salt ++ init code as calldata,
+                e.g. deploy_manifest.DETERMINISTIC_DEPLOYER
+            gas_limit: Gas limit of each deployment
+            fee_speed: 'slow', 'normal' or 'fast' EIP-1559 fees; None for legacy gasPrice
+            pipeline: send_batch options (timeout, poll_interval, replace_after)
+
+        Returns:
+            Address of every contract by name
+        """
+        manifest = DeploymentManifest(manifest_path)
+        known_chains = {entry['chainId'] for entry in manifest.deployments.values()}
+
+        plans = []
+        for spec in contracts:
+            args = tuple(spec.get('args', ()))
+            Contract = self.w3.eth.contract(abi=spec['interface']['abi'], bytecode=spec['interface']['bin'])
+            init_code = Contract.constructor(*args).data_in_transaction
+            salt = spec.get('salt') if factory else None
+            plans.append({
+                'name': spec['name'],
+                'bytecode': spec['interface']['bin'],
+                'args': args,
+                'init_code': init_code,
+                'salt': salt,
+                'create2': create2_address(factory, salt, init_code) if salt is not None else None,
+                'recorded': {chain_id: manifest.get(deployment_key(chain_id, spec['interface']['bin'],
+                                                                   args, salt, factory))
+                             for chain_id in known_chains},
+            })
+
+        # The whole no-change check is this one batch
+        candidates = sorted({plan['create2'] for plan in plans if plan['create2']} |
+                            {entry['address'] for plan in plans
+                             for entry in plan['recorded'].values() if entry})
+        results = web3_request_many(self.w3)(
+            [('eth_chainId', ())] + [('eth_getCode', (address, 'latest')) for address in candidates]
+        )
+        chain_id = int(results[0], 16)
+        has_code = {address: code not in (None, '0x', '') for address, code in zip(candidates, results[1:])}
+
+        addresses: Dict[str, str] = {}
+        to_deploy = []
+        changed = False
+        for plan in plans:
+            plan['key'] = deployment_key(chain_id, plan['bytecode'], plan['args'], plan['salt'], factory)
+            recorded = plan['recorded'].get(chain_id)
+            expected = plan['create2'] or (recorded['address'] if recorded else None)
+            if expected is not None and has_code.get(expected):
+                addresses[plan['name']] = expected
+                print(f"✓ {plan['name']} already deployed at {expected}")
+                if recorded is None:
+                    manifest.record(plan['key'], self._manifest_entry(plan, chain_id, expected, factory, None))
+                    changed = True
+            else:
+                to_deploy.append(plan)
+
+        if to_deploy:
+            print(f"Deploying {len(to_deploy)} of {len(plans)} contracts...")
+            transactions = [
+                {'to': factory, 'data': '0x' + salt_bytes(plan['salt']).hex() + plan['init_code'][2:],
+                 'gas': gas_limit}
+                if plan['create2'] else {'data': plan['init_code'], 'gas': gas_limit}
+                for plan in to_deploy
+            ]
+            for plan, receipt in zip(to_deploy, self.send_batch(transactions, fee_speed, **pipeline)):
+                if receipt.status != 1:
+                    print(f"✗ {plan['name']} deployment reverted")
+                    continue
+                address = plan['create2'] or receipt.contractAddress
+                addresses[plan['name']] = address
+                manifest.record(plan['key'], self._manifest_entry(
+                    plan, chain_id, address, factory, receipt.transactionHash))
+                changed = True
+                print(f"✓ {plan['name']} deployed at {address}")
+
+        if changed:
+            manifest.save()
+        return addresses
+
+    @staticmethod
+    def _manifest_entry(plan: Dict[str, Any], chain_id: int, address: str,
+                        factory: Optional[str], tx_hash: Any) -> Dict[str, Any]:
+        return {
+            'name': plan['name'],
+            'chainId': chain_id,
+            'address': address,
+            'bytecodeHash': bytecode_hash(plan['bytecode']),
+            'args': plan['args'],
+            'salt': plan['salt'],
+            'factory': factory if plan['salt'] is not None else None,
+            'txHash': tx_hash,
+        }
+
+    def _send_entry(self, entry: Dict[str, Any], timeout: Optional[float] = None):
+        signed_txn = self.w3.eth.account.sign_transaction(entry['tx'], private_key=self.account.key)
+        tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        entry['hashes'].append(tx_hash)
+        entry['futures'].append(self.receipts.watch(tx_hash, timeout))
+        entry['sent_at'] = time.time()
+
+    @staticmethod
+    def _settled_receipt(entry: Dict[str, Any]):
+        """Receipt of whichever of an entry's transactions was mined, or None"""
+        for future in entry['futures']:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                return future.result()
+        return None
+
+    def _is_dropped(self, entry: Dict[str, Any]) -> bool:
+        try:
+            self.w3.eth.get_transaction(entry['hashes'][-1])
+            return False
+        except TransactionNotFound:
+            return True
+
+    def _await_receipts(
+        self,
+        pending: Dict[int, Dict[str, Any]],
+        timeout: float,
+        poll_interval: float,
+        replace_after: float
+    ) -> List[Any]:
+        receipts: List[Any] = [None] * len(pending)
+        deadline = time.time() + timeout
+
+        while pending:
+            wait([future for entry in pending.values() for future in entry['futures']],
+                 timeout=poll_interval, return_when=FIRST_COMPLETED)
+
+            for nonce, entry in list(pending.items()):
+                receipt = self._settled_receipt(entry)
+                if receipt is None:
+                    continue
+                del pending[nonce]
+                receipts[entry['index']] = receipt
+
+            if not pending:
+                break
+            if time.time() > deadline:
+                raise TimeoutError(f"{len(pending)} transactions not mined after {timeout}s")
+
+            confirmed = self.nonces.confirmed()
+            taken = []
+            for nonce, entry in list(pending.items()):
+                if nonce < confirmed:
+                    # Mined: by one of our hashes the tracker has not reported yet, or by another transaction
+                    receipt = self._mined_receipt(entry)
+                    if receipt is not None:
+                        receipts[entry['index']] = receipt
+                    else:
+                        taken.append(entry)
+                    del pending[nonce]
+                elif time.time() - entry['sent_at'] >= replace_after and self._is_dropped(entry):
+                    entry['tx'] = self._bump_fees(entry['tx'])
+                    self._send_entry(entry, deadline - time.time())
+                    print(f"👀 Nonce {nonce} dropped; replacement sent: {entry['hashes'][-1].hex()}")
+
+            if taken:
+                self._renonce(taken, pending, deadline - time.time())
+
+        return receipts
+
+    def _mined_receipt(self, entry: Dict[str, Any]):
+        """Receipt of any of an entry's transactions, asked of the node directly"""
+        for tx_hash in entry['hashes']:
+            try:
+                return self.w3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                continue
+        return None
+
+    def _renonce(self, entries: List[Dict[str, Any]], pending: Dict[int, Dict[str, Any]], timeout: float):
+        """
+        Re-send transactions whose nonce another transaction used
+
+        Only these entries get new nonces, from the node's pending count;
+        ours still in flight keep theirs, and the new ones go above them.
+        """
+        self.nonces.sync(at_least=max(pending, default=-1) + 1)
+        first_nonce = self.nonces.reserve(len(entries))
+        for nonce, entry in enumerate(entries, first_nonce):
+            used = entry['tx']['nonce']
+            entry.update(tx={**entry['tx'], 'nonce': nonce}, hashes=[], futures=[])
+            pending[nonce] = entry
+            self._send_entry(entry, timeout)
+            print(f"👀 Nonce {used} was used by another transaction; "
+                  f"re-sent with nonce {nonce}: {entry['hashes'][-1].hex()}")
+
+    @staticmethod
+    def _bump_fees(transaction: Dict[str, Any], factor: float = 1.125) -> Dict[str, Any]:
+        """Copy of a transaction with fees raised enough for nodes to accept it as a replacement"""
+        bumped = dict(transaction)
+        for field in ('gasPrice', 'maxFeePerGas', 'maxPriorityFeePerGas'):
+            if field in bumped:
+                bumped[field] = int(bumped[field] * factor) + 1
+        return bumped
+
     def verify_deployment(self, address: str, abi: list) -> bool:
         """
         Verify contract deployment
@@ -178,29 +573,25 @@ def main():
 
         # Compile contract
         contract_interface = deployer.compile_contract(contract_source)
-
-        # Deploy contract
-        contract_address = deployer.deploy_contract(
-            contract_interface,
-            "MyToken",  # name
-            "MTK",      # symbol
-            1000000     # total supply
+        cache_stats = deployer.compile_cache.stats()
+        print(f"✓ Compile cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+
+        # Deploy contract, unless deployment.json shows it is already on this chain
+        addresses = deployer.deploy_manifest(
+            [{'name': 'MyToken', 'interface': contract_interface, 'args': ("MyToken", "MTK", 1000000)}],
+            manifest_path='deployment.json',
+            fee_speed='normal'
         )
+        contract_address = addresses['MyToken']
 
         # Verify deployment
         deployer.verify_deployment(contract_address, contract_interface['abi'])
 
-        # Save deployment info
-        deployment_info = {
-            'address': contract_address,
-            'abi': contract_interface['abi'],
-            'deployer': deployer.account.address,
-        }
-
-        with open('deployment.json', 'w') as f:
-            json.dump(deployment_info, f, indent=2)
+        # Save ABI next to the manifest
+        with open('MyToken.abi.json', 'w') as f:
+            json.dump(contract_interface['abi'], f, indent=2)
 
-        print(f"\n✓ Deployment info saved to deployment.json")
+        print(f"\n✓ Deployment recorded in deployment.json")
 
     except Exception as e:
         print(f"\n✗ Error: {e}")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Deployment Manifest
+Records deployments keyed by chain id, bytecode hash and constructor
+arguments so reruns skip what is already on chain
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, Iterator, Optional
+
+# Deterministic deployment proxy (same address on most EVM chains): calldata
+# is salt ++ init code, and it deploys with CREATE2
+DETERMINISTIC_DEPLOYER = '0x4e59b44847b379578588920cA78FbF26c0B4956C'
+
+
+def _hex(data: Any) -> str:
+    if isinstance(data, (bytes, bytearray)):
+        return '0x' + bytes(data).hex()
+    return data if data.startswith('0x') else '0x' + data
+
+
+def bytecode_hash(bytecode: Any) -> str:
+    """keccak256 of creation bytecode"""
+    from eth_utils import keccak
+
+    return '0x' + keccak(hexstr=_hex(bytecode)).hex()
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray)):
+        return '0x' + bytes(value).hex()
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    return value
+
+
+def deployment_key(
+    chain_id: int,
+    bytecode: Any,
+    constructor_args: Any,
+    salt: Optional[str] = None,
+    factory: Optional[str] = None
+) -> str:
+    """Identity of a deployment: same key, same contract at the same place"""
+    return hashlib.sha256(json.dumps({
+        'chainId': chain_id,
+        'bytecodeHash': bytecode_hash(bytecode),
+        'args': _jsonable(list(constructor_args)),
+        'salt': salt,
+        'factory': factory.lower() if factory else None,
+    }, sort_keys=True).encode()).hexdigest()
+
+
+def salt_bytes(salt: Any) -> bytes:
+    """32-byte CREATE2 salt from an int, hex string, bytes or label"""
+    if isinstance(salt, int):
+        return salt.to_bytes(32, 'big')
+    if isinstance(salt, (bytes, bytearray)):
+        return bytes(salt).rjust(32, b'\0')
+    if salt.startswith('0x'):
+        return bytes.fromhex(salt[2:]).rjust(32, b'\0')
+    from eth_utils import keccak
+    return keccak(text=salt)
+
+
+def create2_address(factory: str, salt: Any, init_code: Any) -> str:
+    """
+    Address CREATE2 gives init_code deployed by factory with salt
+
+    keccak256(0xff ++ factory ++ salt ++ keccak256(init_code))[12:]
+    """
+    from eth_utils import keccak, to_checksum_address
+
+    digest = keccak(b'\xff' + bytes.fromhex(factory[2:]) + salt_bytes(salt)
+                    + keccak(hexstr=_hex(init_code)))
+    return to_checksum_address(digest[12:])
+
+
+class DeploymentManifest:
+    """JSON file of deployments across chains, written atomically"""
+
+    def __init__(self, path: str):
+        """
+        Load manifest (a missing file is an empty manifest)
+
+        Args:
+            path: Manifest file, e.g. 'deployment.json'
+        """
+        self.path = path
+        self.deployments: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.deployments = json.load(f).get('deployments', {})
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.deployments.get(key)
+
+    def record(self, key: str, entry: Dict[str, Any]):
+        self.deployments[key] = _jsonable(entry)
+
+    def for_chain(self, chain_id: int) -> Iterator[Dict[str, Any]]:
+        return (entry for entry in self.deployments.values() if entry['chainId'] == chain_id)
+
+    def save(self):
+        """Write to a temp file and rename, so a crash never leaves half a manifest"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'version': 1, 'deployments': self.deployments}, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+EchoScroll Client
+Reads EchoScroll feeds straight from the contract: active ids page by page,
+hydrated with getScrollsBatch in adaptively sized chunks
+"""
+
+from eth_abi import decode as abi_decode, encode as abi_encode
+from eth_utils.abi import collapse_if_tuple, function_abi_to_4byte_selector
+from event_listener import AdaptiveWindow, is_range_too_large
+from receipt_tracker import RequestMany, web3_request_many
+from scroll_indexer import ECHOSCROLL_EVENTS_ABI, Scroll
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import threading
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple, Union
+
+
+ECHOSCROLL_VIEW_ABI = json.loads('''[
+    {
+        "inputs": [],
+        "name": "getActiveScrollCount",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [
+            {"name": "_offset", "type": "uint256"},
+            {"name": "_limit", "type": "uint256"}
+        ],
+        "name": "getActiveScrollsPaginated",
+        "outputs": [
+            {"name": "result", "type": "uint256[]"},
+            {"name": "total", "type": "uint256"}
+        ],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [{"name": "_scrollIds", "type": "uint256[]"}],
+        "name": "getScrollsBatch",
+        "outputs": [{
+            "name": "scrollData",
+            "type": "tuple[]",
+            "components": [
+                {"name": "id", "type": "uint256"},
+                {"name": "author", "type": "address"},
+                {"name": "ipfsHash", "type": "string"},
+                {"name": "spellHash", "type": "bytes32"},
+                {"name": "timestamp", "type": "uint256"},
+                {"name": "exists", "type": "bool"},
+                {"name": "title", "type": "string"}
+            ]
+        }],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]''')
+
+ECHOSCROLL_ABI = ECHOSCROLL_VIEW_ABI + ECHOSCROLL_EVENTS_ABI
+
+# Multicall3 is deployed at this address on most EVM chains
+MULTICALL3_ADDRESS = '0xcA11bde05977b3631167028862bE2a173976CA11'
+
+MULTICALL3_AGGREGATE3_ABI = json.loads('''{
+    "inputs": [{
+        "name": "calls",
+        "type": "tuple[]",
+        "components": [
+            {"name": "target", "type": "address"},
+            {"name": "allowFailure", "type": "bool"},
+            {"name": "callData", "type": "bytes"}
+        ]
+    }],
+    "name": "aggregate3",
+    "outputs": [{
+        "name": "returnData",
+        "type": "tuple[]",
+        "components": [
+            {"name": "success", "type": "bool"},
+            {"name": "returnData", "type": "bytes"}
+        ]
+    }],
+    "stateMutability": "payable",
+    "type": "function"
+}''')
+
+# Substrings nodes use when an eth_call hits the RPC gas cap
+GAS_LIMIT_MARKERS = (
+    'out of gas',
+    'gas required exceeds',
+    'gas limit',
+    'gas cap',
+)
+
+
+def is_call_too_large(error: Exception) -> bool:
+    """Check whether an eth_call failure means it must cover fewer ids"""
+    message = str(error).lower()
+    return is_range_too_large(error) or any(marker in message for marker in GAS_LIMIT_MARKERS)
+
+
+class ABIFunction:
+    """Offline calldata encoder / return data decoder for one ABI function"""
+
+    def __init__(self, abi: Dict[str, Any]):
+        self.name = abi['name']
+        self.selector = function_abi_to_4byte_selector(abi)
+        self.input_types = [collapse_if_tuple(arg) for arg in abi['inputs']]
+        self.output_types = [collapse_if_tuple(arg) for arg in abi['outputs']]
+
+    def encode(self, *args: Any) -> bytes:
+        return self.selector + abi_encode(self.input_types, args)
+
+    def decode(self, data: bytes) -> tuple:
+        return abi_decode(self.output_types, data)
+
+
+def _functions(abi: list) -> Dict[str, ABIFunction]:
+    return {item['name']: ABIFunction(item) for item in abi if item.get('type') == 'function'}
+
+
+def _block_tag(block: Union[int, str]) -> str:
+    return hex(block) if isinstance(block, int) else block
+
+
+def _scroll(data: tuple) -> Optional[Scroll]:
+    """getScrollsBatch entry as an indexer Scroll; deleted ids come back zeroed"""
+    scroll_id, author, ipfs_hash, _spell_hash, timestamp, exists, title = data
+    if not exists:
+        return None
+    return Scroll(scroll_id, author.lower(), ipfs_hash, title, timestamp)
+
+
+class EchoScrollClient:
+    """
+    Batched EchoScroll reads
+
+    A feed page costs one getActiveScrollsPaginated call and one
+    getScrollsBatch call. The number of ids per getScrollsBatch call adapts:
+    it is halved when the node rejects a call (RPC gas cap, response size,
+    timeout), and doubled while responses stay well under the byte target
+    and below any size the node has rejected.
+    """
+
+    def __init__(
+        self,
+        request_many: RequestMany,
+        address: str,
+        multicall: Optional[str] = None,
+        batch_size: int = 100,
+        max_batch_size: int = 1000,
+        target_response_bytes: int = 1000000,
+        concurrency: int = 4
+    ):
+        """
+        Initialize client (no network access until the first read)
+
+        Args:
+            request_many: Sends (method, params) calls, ideally as one JSON-RPC batch
+            address: EchoScroll contract address
+            multicall: Multicall3 address (e.g. MULTICALL3_ADDRESS) to bundle
+                independent reads into one eth_call; None sends them as
+                separate eth_calls in one JSON-RPC batch
+            batch_size: Initial ids per getScrollsBatch call
+            max_batch_size: Largest getScrollsBatch call
+            target_response_bytes: Response size the batch size aims for
+            concurrency: Page groups fetched at once by iter_active_scrolls
+        """
+        self.request_many = request_many
+        self.address = address
+        self.multicall = multicall
+        self.concurrency = concurrency
+        self.functions = _functions(ECHOSCROLL_ABI)
+        self.aggregate3 = ABIFunction(MULTICALL3_AGGREGATE3_ABI)
+        # AdaptiveWindow over ids: observe() gets response bytes, so the
+        # batch grows while responses stay under half the byte target
+        self.window = AdaptiveWindow(batch_size, max_size=max_batch_size,
+                                     target_results=target_response_bytes)
+        self.eth_calls = 0
+        # iter_active_scrolls reads from several threads; they share what the window learns
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_web3(cls, w3, address: str, **kwargs) -> 'EchoScrollClient':
+        """Client over a web3 instance's provider (one JSON-RPC batch per round trip over HTTP)"""
+        return cls(web3_request_many(w3), address, **kwargs)
+
+    def _eth_calls(self, targets_data: Sequence[Tuple[str, bytes]], block: Union[int, str]) -> List[bytes]:
+        tag = _block_tag(block)
+        results = self.request_many([
+            ('eth_call', ({'to': target, 'data': '0x' + data.hex()}, tag))
+            for target, data in targets_data
+        ])
+        with self._lock:
+            self.eth_calls += len(targets_data)
+        return [bytes.fromhex(result[2:]) for result in results]
+
+    def call_many(
+        self,
+        calls: Sequence[Tuple[str, Sequence[Any]]],
+        block: Union[int, str] = 'latest'
+    ) -> List[tuple]:
+        """
+        Call several EchoScroll view functions at one block
+
+        With a multicall address the calls go out as one aggregate3 eth_call;
+        otherwise as one eth_call each, in a single JSON-RPC batch.
+
+        Args:
+            calls: (function name, args) pairs, e.g. ('getActiveScrollCount', ())
+            block: Block number or tag
+
+        Returns:
+            Decoded outputs of each call, in order
+        """
+        functions = [self.functions[name] for name, _ in calls]
+        data = [function.encode(*args) for function, (_, args) in zip(functions, calls)]
+
+        if self.multicall is None or len(calls) == 1:
+            returned = self._eth_calls([(self.address, item) for item in data], block)
+        else:
+            (results,) = self.aggregate3.decode(self._eth_calls(
+                [(self.multicall, self.aggregate3.encode([(self.address, False, item) for item in data]))],
+                block
+            )[0])
+            returned = [return_data for _, return_data in results]
+
+        return [function.decode(item) for function, item in zip(functions, returned)]
+
+    def active_count(self, block: Union[int, str] = 'latest') -> int:
+        """Number of active scrolls"""
+        return self.call_many([('getActiveScrollCount', ())], block)[0][0]
+
+    def active_pages(
+        self,
+        offsets: Sequence[int],
+        limit: int,
+        block: Union[int, str] = 'latest'
+    ) -> List[Tuple[List[int], int]]:
+        """
+        Active ids of several pages in one round trip
+
+        Returns:
+            (ids, total active) per offset, like getActiveScrollsPaginated
+        """
+        pages = self.call_many([('getActiveScrollsPaginated', (offset, limit)) for offset in offsets], block)
+        return [(list(ids), total) for ids, total in pages]
+
+    def get_scrolls(self, scroll_ids: Sequence[int], block: Union[int, str] = 'latest') -> List[Optional[Scroll]]:
+        """
+        Hydrate scrolls with getScrollsBatch
+
+        Ids are split into chunks of the current batch size, sent as one
+        JSON-RPC batch. A rejected round is retried with half the batch size.
+        getScrollsBatch already aggregates, so the chunks are never put back
+        together in a multicall, which would just undo the split.
+
+        Args:
+            scroll_ids: Scroll ids
+            block: Block number or tag
+
+        Returns:
+            Scroll per id, in order (None for deleted or unknown ids)
+        """
+        batch = self.functions['getScrollsBatch']
+        while True:
+            with self._lock:
+                size = self.window.size
+            chunks = [list(scroll_ids[i:i + size]) for i in range(0, len(scroll_ids), size)]
+            if not chunks:
+                return []
+            try:
+                returned = self._eth_calls([(self.address, batch.encode(chunk)) for chunk in chunks], block)
+            except Exception as e:
+                if size == 1 or not is_call_too_large(e):
+                    raise
+                with self._lock:
+                    # Reads rejected at the same size halve it once, not once each
+                    if self.window.size >= size:
+                        self.window.size = size
+                        self.window.shrink()
+                        # The node's limits do not move; never grow back to a rejected size
+                        self.window.max_size = self.window.size
+                continue
+
+            with self._lock:
+                if self.window.size == size:
+                    self.window.observe(max(len(data) for data in returned))
+            return [_scroll(entry) for data in returned for entry in batch.decode(data)[0]]
+
+    def feed(self, offset: int = 0, limit: int = 100, block: Union[int, str] = 'latest') -> Tuple[List[Scroll], int]:
+        """
+        One page of active scrolls, in activeScrollIds order
+
+        Returns:
+            (scrolls, total active); scrolls deleted between the two calls are left out
+        """
+        ((ids, total),) = self.active_pages([offset], limit, block)
+        return [scroll for scroll in self.get_scrolls(ids, block) if scroll is not None], total
+
+    def _feed_group(self, offsets: Sequence[int], limit: int, block: int) -> List[Scroll]:
+        ids = [scroll_id for page_ids, _ in self.active_pages(offsets, limit, block) for scroll_id in page_ids]
+        return [scroll for scroll in self.get_scrolls(ids, block) if scroll is not None]
+
+    def iter_active_scrolls(
+        self,
+        page_size: int = 100,
+        pages_per_call: int = 4,
+        block: Optional[int] = None
+    ) -> Iterator[Scroll]:
+        """
+        Every active scroll, in activeScrollIds order
+
+        All reads are pinned to one block, so a delete (which swaps the last
+        active id into its slot) cannot shift ids between pages mid-walk.
+        Pages are fetched in groups of pages_per_call (one multicall or one
+        JSON-RPC batch for their ids), with up to `concurrency` groups in
+        flight on a thread pool.
+
+        Args:
+            page_size: Ids per getActiveScrollsPaginated call
+            pages_per_call: Pages whose ids are read in one round trip
+            block: Block to read at (default: current head)
+
+        Yields:
+            Scrolls, in order
+        """
+        if block is None:
+            block = int(self.request_many([('eth_blockNumber', ())])[0], 16)
+
+        first, total = self.feed(0, page_size, block)
+        yield from first
+
+        offsets = list(range(page_size, total, page_size))
+        groups = iter([offsets[i:i + pages_per_call] for i in range(0, len(offsets), pages_per_call)])
+        window = deque()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for group in groups:
+                window.append(pool.submit(self._feed_group, group, page_size, block))
+                if len(window) >= self.concurrency:
+                    yield from window.popleft().result()
+
+            while window:
+                yield from window.popleft().result()
+
+
+def main():
+    """Example usage"""
+
+    RPC_URL = os.getenv('RPC_URL', 'http://localhost:8545')
+    ECHOSCROLL_ADDRESS = os.getenv('ECHOSCROLL_ADDRESS', '0x' + '0' * 40)
+    MULTICALL_ADDRESS = os.getenv('MULTICALL_ADDRESS')
+
+    try:
+        from web3 import Web3
+
+        w3 = Web3(Web3.HTTPProvider(RPC_URL))
+        client = EchoScrollClient.from_web3(w3, ECHOSCROLL_ADDRESS, multicall=MULTICALL_ADDRESS)
+
+        scrolls, total = client.feed(0, 20)
+        print(f"✓ {total} active scrolls")
+        for scroll in scrolls:
+            print(f"  #{scroll.id} {scroll.title} by {scroll.author}")
+
+        count = sum(1 for _ in client.iter_active_scrolls())
+        print(f"✓ Hydrated {count} scrolls in {client.eth_calls} eth_calls "
+              f"(batch size now {client.window.size})")
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        raise
+
+
+if __name__ == '__main__':
+    main()
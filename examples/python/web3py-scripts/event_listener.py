@@ -6,25 +6,116 @@ Demonstrates real-time blockchain event monitoring
 
 from web3 import Web3
 from web3.contract import Contract
+from head_tracker import HeadTracker, ReorgAwareWatcher
+from log_store import LogStore
+from rpc_router import RPCRouter, web3_provider
+from rpc_scheduler import RequestScheduler
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import itertools
 import json
 import time
 import asyncio
-from typing import Dict, Any, Callable
+import requests
+from typing import Dict, Any, Callable, Deque, Iterable, Iterator, List, Optional, Tuple, Union
+
+
+# Substrings providers use when a getLogs range is too wide to answer
+RANGE_TOO_LARGE_MARKERS = (
+    'more than',
+    'too many',
+    'limit exceeded',
+    'response size',
+    'block range',
+    'range is too',
+    'query timeout',
+    '-32005',
+)
+
+
+def is_range_too_large(error: Exception) -> bool:
+    """Check whether a getLogs failure means the block range must shrink"""
+    if isinstance(error, requests.exceptions.Timeout):
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in RANGE_TOO_LARGE_MARKERS)
+
+
+def event_signature(abi: list, event_name: str) -> str:
+    """Canonical signature such as Transfer(address,address,uint256)"""
+    for item in abi:
+        if item.get('type') == 'event' and item.get('name') == event_name:
+            types = ','.join(arg['type'] for arg in item['inputs'])
+            return f"{event_name}({types})"
+    raise ValueError(f"Event {event_name} not found in ABI")
+
+
+def log_sort_key(event_log: Dict[str, Any]) -> Tuple[int, int]:
+    """Canonical chain order of a log: (block, logIndex)"""
+    return event_log['blockNumber'], event_log['logIndex']
+
+
+class AdaptiveWindow:
+    """Block window size that shrinks on oversized ranges and grows on sparse ones"""
+
+    def __init__(
+        self,
+        size: int,
+        min_size: int = 1,
+        max_size: int = 100000,
+        target_results: int = 2000
+    ):
+        """
+        Initialize window
+
+        Args:
+            size: Initial number of blocks per getLogs call
+            min_size: Smallest window the provider is asked for
+            max_size: Largest window the provider is asked for
+            target_results: Logs per response the window aims for
+        """
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_results = target_results
+        self.size = max(min_size, min(size, max_size))
+
+    def shrink(self):
+        """Halve the window after the provider rejected a range"""
+        self.size = max(self.min_size, self.size // 2)
+
+    def observe(self, result_count: int):
+        """Double the window while responses stay well under the target"""
+        if result_count < self.target_results // 2:
+            self.size = min(self.max_size, self.size * 2)
 
 
 class EventListener:
     """Listen to smart contract events in real-time"""
 
-    def __init__(self, rpc_url: str, contract_address: str, abi: list):
+    def __init__(
+        self,
+        rpc_url: Union[str, List[str]],
+        contract_address: str,
+        abi: list,
+        rate_limit: Optional[float] = None
+    ):
         """
         Initialize event listener
 
         Args:
-            rpc_url: Ethereum RPC endpoint
+            rpc_url: Ethereum RPC endpoint, or a list of endpoints to route across
             contract_address: Contract to monitor
             abi: Contract ABI
+            rate_limit: Provider's requests-per-second limit for backfills
+                (None = unlimited; concurrency still adapts to 429s)
         """
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+        # Paces getLogs windows; shared by every backfill of this listener
+        self.scheduler = RequestScheduler(rate=rate_limit)
+
+        if isinstance(rpc_url, str):
+            self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+        else:
+            self.w3 = Web3(web3_provider(RPCRouter(rpc_url)))
 
         if not self.w3.is_connected():
             raise ConnectionError(f"Failed to connect to {rpc_url}")
@@ -42,31 +133,314 @@ class EventListener:
         self,
         event_name: str,
         from_block: int = 0,
-        to_block: str = 'latest'
+        to_block: Union[int, str] = 'latest',
+        chunk_size: Optional[int] = None,
+        max_workers: int = 4
     ) -> list:
         """
         Get historical events
 
+        Passing chunk_size switches to backfill mode: the range is split
+        into block windows fetched on a pool of max_workers threads. Windows
+        are halved when the provider rejects a range as too large and
+        doubled again while responses stay small.
+
         Args:
             event_name: Name of the event
-            from_block: Starting block number
+            from_block: Starting block number (negative = blocks before latest)
             to_block: Ending block (or 'latest')
+            chunk_size: Initial blocks per request (None = single request)
+            max_workers: Concurrent requests in backfill mode
 
         Returns:
-            List of event logs
+            List of event logs in (block, logIndex) order
         """
         event = getattr(self.contract.events, event_name)
 
         print(f"Fetching {event_name} events from block {from_block} to {to_block}...")
 
-        events = event.get_logs(
-            fromBlock=from_block,
-            toBlock=to_block
-        )
+        if chunk_size is None:
+            events = event.get_logs(
+                fromBlock=from_block,
+                toBlock=to_block
+            )
+        else:
+            start, end = self._resolve_range(from_block, to_block)
+            pages = self._iter_windows(self._event_fetcher(event), start, end,
+                                       chunk_size, max_workers, max_workers)
+            events = [event_log for _, _, page in pages for event_log in page]
 
         print(f"✓ Found {len(events)} events")
         return events
 
+    def _resolve_range(
+        self,
+        from_block: int,
+        to_block: Union[int, str],
+        latest: Optional[int] = None
+    ) -> Tuple[int, int]:
+        """Turn 'latest' and negative offsets into absolute block numbers"""
+        if latest is None and (to_block == 'latest' or from_block < 0):
+            latest = self.w3.eth.block_number
+
+        end = latest if to_block == 'latest' else int(to_block)
+        start = max(0, latest + from_block) if from_block < 0 else from_block
+        return start, end
+
+    def iter_past_event_pages(
+        self,
+        event_name: str,
+        from_block: int = 0,
+        to_block: Union[int, str] = 'latest',
+        chunk_size: int = 2000,
+        max_workers: int = 4,
+        prefetch: Optional[int] = None,
+        decoder=None
+    ) -> Iterator[list]:
+        """
+        Stream historical events one block window (page) at a time
+
+        Pages are requested up to `prefetch` windows ahead of the
+        consumer and handed out in block order; a slow consumer therefore
+        pauses the requests instead of piling up pages.
+
+        Args:
+            event_name: Name of the event
+            from_block: Starting block number (negative = blocks before latest)
+            to_block: Ending block (or 'latest')
+            chunk_size: Initial blocks per page
+            max_workers: Concurrent requests
+            prefetch: Pages fetched ahead of the consumer (default: max_workers)
+            decoder: Optional log_decoder.LogDecoder; pages then hold its
+                slotted records decoded from raw logs, bypassing web3's
+                event processing
+
+        Yields:
+            Lists of event logs, pages and logs in (block, logIndex) order
+        """
+        # A generator, so 'latest' is resolved on first iteration, not at call time
+        start, end = self._resolve_range(from_block, to_block)
+        windows = self._iter_decoded_windows(event_name, start, end, chunk_size,
+                                             max_workers, prefetch or max_workers, decoder)
+        for _, _, page in windows:
+            yield page
+
+    def iter_past_events(
+        self,
+        event_name: str,
+        from_block: int = 0,
+        to_block: Union[int, str] = 'latest',
+        chunk_size: int = 2000,
+        max_workers: int = 4,
+        prefetch: Optional[int] = None,
+        decoder=None
+    ) -> Iterator[Any]:
+        """
+        Stream historical events one log at a time
+
+        Same arguments as iter_past_event_pages.
+
+        Yields:
+            Event logs in (block, logIndex) order
+        """
+        pages = self.iter_past_event_pages(event_name, from_block, to_block,
+                                           chunk_size, max_workers, prefetch, decoder)
+        for page in pages:
+            yield from page
+
+    def sync_events(
+        self,
+        event_name: str,
+        store,
+        from_block: int = 0,
+        to_block: Union[int, str] = 'latest',
+        chunk_size: int = 2000,
+        max_workers: int = 4,
+        decoder=None,
+        confirmations: int = 12
+    ) -> int:
+        """
+        Backfill an event into a persistent log store, resuming from its checkpoint
+
+        Each page is written together with its last block as one
+        transaction, so after a restart the store's checkpoint is exactly
+        the last fully processed block. A checkpoint is never revisited, so
+        the sync stops `confirmations` blocks behind the head, where a reorg
+        can no longer orphan stored logs.
+
+        Args:
+            event_name: Name of the event
+            store: log_store.LogStore to write into
+            from_block: Starting block when the store has no checkpoint yet
+            to_block: Ending block (or 'latest'); capped at the confirmed head
+            chunk_size: Initial blocks per page
+            max_workers: Concurrent requests
+            decoder: Optional log_decoder.LogDecoder for the fast path
+            confirmations: Blocks a page must be buried under before it is stored
+
+        Returns:
+            Number of logs written
+        """
+        key = self.filter_key(event_name)
+        latest = self.w3.eth.block_number
+        start, end = self._resolve_range(from_block, to_block, latest)
+        end = min(end, latest - confirmations)
+
+        checkpoint = store.checkpoint(key)
+        if checkpoint is not None:
+            start = max(start, checkpoint + 1)
+            print(f"✓ Resuming {event_name} from block {start} (checkpoint {checkpoint})")
+
+        written = 0
+        windows = self._iter_decoded_windows(event_name, start, end, chunk_size,
+                                             max_workers, max_workers, decoder)
+        for _, hi, page in windows:
+            written += store.write_page(key, page, hi)
+
+        print(f"✓ Stored {written} {event_name} events through block {end}")
+        return written
+
+    def filter_key(self, event_name: str) -> str:
+        """Stable identifier of (chain, contract, event) for checkpoints"""
+        return f"{self.w3.eth.chain_id}:{self.contract.address}:{event_name}"
+
+    def _iter_decoded_windows(
+        self,
+        event_name: str,
+        start: int,
+        end: int,
+        chunk_size: int,
+        max_workers: int,
+        prefetch: int,
+        decoder=None
+    ) -> Iterator[Tuple[int, int, list]]:
+        """(lo, hi, logs) windows, decoded by web3 or by a LogDecoder"""
+        if decoder is not None:
+            return self.iter_log_windows(decoder, [event_name], start, end,
+                                         chunk_size, max_workers, prefetch)
+
+        fetch = self._event_fetcher(getattr(self.contract.events, event_name))
+        return self._iter_windows(fetch, start, end, chunk_size, max_workers, prefetch)
+
+    def iter_log_windows(
+        self,
+        decoder,
+        event_names: Optional[List[str]] = None,
+        from_block: int = 0,
+        to_block: Union[int, str] = 'latest',
+        chunk_size: int = 2000,
+        max_workers: int = 4,
+        prefetch: Optional[int] = None
+    ) -> Iterator[Tuple[int, int, list]]:
+        """
+        Stream several events of the contract, interleaved in chain order
+
+        One eth_getLogs per window with a topic0 OR-set; a LogDecoder
+        routes each raw log to its event.
+
+        Args:
+            decoder: log_decoder.LogDecoder for the contract ABI
+            event_names: Events to include (default: every event of the decoder)
+            from_block: Starting block number (negative = blocks before latest)
+            to_block: Ending block (or 'latest')
+            chunk_size: Initial blocks per page
+            max_workers: Concurrent requests
+            prefetch: Pages fetched ahead of the consumer (default: max_workers)
+
+        Yields:
+            (lo, hi, records) for each block window, records in (block, logIndex) order
+        """
+        # A generator: 'latest' is resolved on first iteration, as in iter_past_event_pages
+        start, end = self._resolve_range(from_block, to_block)
+
+        if event_names is None:
+            topics = decoder.topics
+        else:
+            topics = [
+                Web3.keccak(text=event_signature(self.contract.abi, name)).hex()
+                for name in event_names
+            ]
+        fetch = self._raw_log_fetcher({'address': self.contract.address, 'topics': [topics]})
+
+        windows = self._iter_windows(fetch, start, end, chunk_size, max_workers,
+                                     prefetch or max_workers)
+        for lo, hi, page in windows:
+            yield lo, hi, decoder.decode_batch(page)
+
+    def _event_fetcher(self, event) -> Callable[[int, int], list]:
+        """getLogs through web3's contract event (decoded AttributeDicts)"""
+        def fetch(lo: int, hi: int):
+            return event.get_logs(fromBlock=lo, toBlock=hi)
+        return fetch
+
+    def _raw_log_fetcher(self, log_filter: Dict[str, Any]) -> Callable[[int, int], list]:
+        """Plain eth_getLogs for a filter (undecoded logs)"""
+        def fetch(lo: int, hi: int):
+            return self.w3.eth.get_logs({**log_filter, 'fromBlock': lo, 'toBlock': hi})
+        return fetch
+
+    def _iter_windows(
+        self,
+        fetch: Callable[[int, int], list],
+        start: int,
+        end: int,
+        chunk_size: int,
+        max_workers: int,
+        prefetch: int
+    ) -> Iterator[Tuple[int, int, List[Dict[str, Any]]]]:
+        """
+        Fetch [start, end] as adaptive block windows on a thread pool
+
+        Windows are kept in block order; a window the provider rejects as
+        too large is replaced in place by its two halves. Requests go through
+        self.scheduler, so throttled windows are retried with backoff and
+        concurrency settles at what the provider accepts.
+
+        Args:
+            fetch: Function returning the logs of a [lo, hi] block range
+            start: First block (inclusive)
+            end: Last block (inclusive)
+            chunk_size: Initial window size
+            max_workers: Threads issuing requests
+            prefetch: Windows requested ahead of the consumer
+
+        Yields:
+            (lo, hi, logs) per window, logs sorted
+        """
+        window = AdaptiveWindow(chunk_size)
+        # Ordered [lo, hi, future]; future is None until submitted
+        windows: Deque[list] = deque()
+        cursor = start
+
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            while cursor <= end or windows:
+                while len(windows) < prefetch and cursor <= end:
+                    hi = min(cursor + window.size - 1, end)
+                    windows.append([cursor, hi, None])
+                    cursor = hi + 1
+
+                for entry in itertools.islice(windows, prefetch):
+                    if entry[2] is None:
+                        entry[2] = pool.submit(self.scheduler.call, fetch, entry[0], entry[1])
+
+                lo, hi, future = windows.popleft()
+                try:
+                    result = future.result()
+                except Exception as e:
+                    if lo == hi or not is_range_too_large(e):
+                        raise
+                    window.shrink()
+                    mid = (lo + hi) // 2
+                    windows.appendleft([mid + 1, hi, None])
+                    windows.appendleft([lo, mid, None])
+                    continue
+
+                window.observe(len(result))
+                yield lo, hi, sorted(result, key=log_sort_key)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
     def watch_event(
         self,
         event_name: str,
@@ -100,6 +474,52 @@ class EventListener:
         except KeyboardInterrupt:
             print("\n✓ Stopped watching events")
 
+    def watch_event_confirmed(
+        self,
+        event_name: str,
+        callback: Callable[[Dict[str, Any]], None],
+        on_removed: Optional[Callable[[Dict[str, Any]], None]] = None,
+        confirmations: int = 12,
+        poll_interval: int = 2,
+        ring_size: int = 128
+    ):
+        """
+        Watch for events with reorg protection (confirmation-depth mode)
+
+        Recent (number, hash, parentHash) headers are kept in a ring buffer.
+        When a new head does not link to it, only the orphaned window is
+        re-fetched; logs already delivered from orphaned blocks are passed
+        to on_removed.
+
+        Args:
+            event_name: Name of the event to watch
+            callback: Called for each log once it is `confirmations` deep
+            on_removed: Called for each delivered log that was reorged out
+            confirmations: Blocks to wait before delivering a log
+            poll_interval: Seconds between polls
+            ring_size: Recent blocks remembered for reorg detection
+        """
+        event = getattr(self.contract.events, event_name)
+        watcher = ReorgAwareWatcher(
+            HeadTracker(self.w3.eth.get_block, capacity=ring_size, history=confirmations),
+            self._event_fetcher(event),
+            callback,
+            on_removed=on_removed,
+            confirmations=confirmations
+        )
+
+        print(f"👀 Watching for {event_name} events ({confirmations} confirmations)...")
+        print(f"   Poll interval: {poll_interval}s")
+        print("   Press Ctrl+C to stop\n")
+
+        try:
+            while True:
+                watcher.poll(self.w3.eth.block_number)
+                time.sleep(poll_interval)
+
+        except KeyboardInterrupt:
+            print("\n✓ Stopped watching events")
+
     async def watch_event_async(
         self,
         event_name: str,
@@ -109,18 +529,21 @@ class EventListener:
         """
         Async version of event watching
 
+        Polls run in a worker thread so the loop is not blocked; see
+        async_listener.AsyncEventListener for websocket subscriptions.
+
         Args:
             event_name: Event to watch
             callback: Callback function
             poll_interval: Seconds between polls
         """
         event = getattr(self.contract.events, event_name)
-        event_filter = event.create_filter(fromBlock='latest')
+        event_filter = await asyncio.to_thread(event.create_filter, fromBlock='latest')
 
         print(f"👀 Watching for {event_name} events (async)...")
 
         while True:
-            for event_log in event_filter.get_new_entries():
+            for event_log in await asyncio.to_thread(event_filter.get_new_entries):
                 callback(event_log)
 
             await asyncio.sleep(poll_interval)
@@ -130,11 +553,14 @@ class EventListener:
         Decode event log
 
         Args:
-            event_log: Raw event log
+            event_log: Raw event log, or a log_decoder.LogRecord from the decoder path
 
         Returns:
             Decoded event data
         """
+        # Looked up on the type: web3's AttributeDict turns missing attributes into key lookups
+        if getattr(type(event_log), 'as_dict', None) is not None:
+            return event_log.as_dict()
         return {
             'event': event_log['event'],
             'args': dict(event_log['args']),
@@ -143,6 +569,22 @@ class EventListener:
             'log_index': event_log['logIndex'],
         }
 
+    def decode_events(
+        self,
+        event_logs: Iterable[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily decode a stream of event logs
+
+        Args:
+            event_logs: Any iterable of raw logs, e.g. iter_past_events(), with or without a decoder
+
+        Yields:
+            Decoded event data
+        """
+        for event_log in event_logs:
+            yield self.decode_event(event_log)
+
 
 def transfer_callback(event_log: Dict[str, Any]):
     """Example callback for Transfer events"""
@@ -188,13 +630,14 @@ def main():
     try:
         listener = EventListener(RPC_URL, CONTRACT_ADDRESS, ERC20_ABI)
 
-        # Get past events
-        past_events = listener.get_past_events('Transfer', from_block=-100)
+        # Backfill into the local store; restarts resume from its checkpoint
+        with LogStore('usdc_transfers.db') as store:
+            listener.sync_events('Transfer', store, from_block=-100, chunk_size=20)
 
-        print(f"\nRecent Transfers:")
-        for event in past_events[:5]:  # Show last 5
-            decoded = listener.decode_event(event)
-            print(f"  Block {decoded['block_number']}: {decoded['args']['value']}")
+            print(f"\nRecent Transfers:")
+            recent = store.query(listener.filter_key('Transfer'), limit=5, newest_first=True)
+            for decoded in recent:
+                print(f"  Block {decoded['block_number']}: {decoded['args']['value']}")
 
         # Watch for new events
         print("\n" + "="*60)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+EIP-1559 Gas Oracle
+Fee suggestions from eth_feeHistory over a rolling window of recent blocks
+"""
+
+from array import array
+from bisect import bisect_left, insort
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Reward percentile asked for each tier
+TIER_PERCENTILES = {'slow': 10, 'normal': 50, 'fast': 90}
+
+# Base fee headroom per tier: the base fee can rise 12.5% per full block,
+# so 1.125 survives one full block, 1.25 two and 2.0 about six
+BASE_FEE_MULTIPLIERS = {'slow': 1.125, 'normal': 1.25, 'fast': 2.0}
+
+
+def _quantity(value) -> int:
+    """Fee history values are hex strings over raw JSON-RPC and ints through web3"""
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+
+class GasOracle:
+    """
+    Rolling fee-history window kept in fixed-size arrays
+
+    Every refresh only asks for blocks newer than the last one seen, writes
+    them over the oldest ring slots and updates per-tier sorted reward lists,
+    so a refresh costs O(new blocks * log window) whatever the window size.
+    """
+
+    def __init__(
+        self,
+        fee_history: Callable[[int, int, List[int]], Dict[str, Any]],
+        block_number: Callable[[], int],
+        window: int = 20
+    ):
+        """
+        Initialize oracle (no network access until refresh)
+
+        Args:
+            fee_history: (block_count, newest_block, percentiles) -> eth_feeHistory result
+            block_number: Returns the current head
+            window: Blocks kept in the ring
+        """
+        self.fee_history = fee_history
+        self.block_number = block_number
+        self.window = window
+        self.tiers = list(TIER_PERCENTILES)
+        self.percentiles = [TIER_PERCENTILES[tier] for tier in self.tiers]
+
+        self.base_fees = array('Q', [0]) * window
+        self.gas_used_ratios = array('d', [0.0]) * window
+        self.rewards = {tier: array('Q', [0]) * window for tier in self.tiers}
+        self._sorted_rewards: Dict[str, List[int]] = {tier: [] for tier in self.tiers}
+
+        self.size = 0
+        self.pos = 0
+        self.head: Optional[int] = None
+        self.next_base_fee = 0
+
+    @classmethod
+    def from_web3(cls, w3, window: int = 20) -> 'GasOracle':
+        """Oracle backed by a web3 instance"""
+        return cls(
+            lambda count, newest, percentiles: w3.eth.fee_history(count, newest, percentiles),
+            lambda: w3.eth.block_number,
+            window
+        )
+
+    def refresh(self) -> int:
+        """
+        Pull blocks mined since the last refresh
+
+        Returns:
+            Number of new blocks added to the window
+        """
+        latest = _quantity(self.block_number())
+        count = self.window if self.head is None else min(self.window, latest - self.head)
+        if count <= 0:
+            return 0
+
+        history = self.fee_history(count, latest, self.percentiles)
+        base_fees = [_quantity(fee) for fee in history['baseFeePerGas']]
+        rewards = history.get('reward') or [[0] * len(self.percentiles)] * count
+
+        for base_fee, ratio, block_rewards in zip(base_fees, history['gasUsedRatio'], rewards):
+            self._push(base_fee, float(ratio), [_quantity(reward) for reward in block_rewards])
+
+        # baseFeePerGas has one extra entry: the base fee of the next block
+        self.next_base_fee = base_fees[-1]
+        self.head = latest
+        return count
+
+    def _push(self, base_fee: int, gas_used_ratio: float, block_rewards: Sequence[int]):
+        """Write one block over the oldest slot"""
+        slot = self.pos
+        full = self.size == self.window
+
+        self.base_fees[slot] = base_fee
+        self.gas_used_ratios[slot] = gas_used_ratio
+        for tier, reward in zip(self.tiers, block_rewards):
+            ordered = self._sorted_rewards[tier]
+            if full:
+                del ordered[bisect_left(ordered, self.rewards[tier][slot])]
+            self.rewards[tier][slot] = reward
+            insort(ordered, reward)
+
+        self.pos = (slot + 1) % self.window
+        self.size = min(self.size + 1, self.window)
+
+    def priority_fee(self, tier: str) -> int:
+        """Median over the window of the tier's reward percentile"""
+        ordered = self._sorted_rewards[tier]
+        if not ordered:
+            raise RuntimeError("Gas oracle has no fee history yet; call refresh() first")
+        return ordered[len(ordered) // 2]
+
+    def suggest(self, tier: str = 'normal') -> Dict[str, int]:
+        """
+        EIP-1559 fee fields for a tier
+
+        Args:
+            tier: 'slow', 'normal' or 'fast'
+
+        Returns:
+            Dict with maxFeePerGas and maxPriorityFeePerGas (wei)
+        """
+        if tier not in TIER_PERCENTILES:
+            raise ValueError(f"Unknown fee tier: {tier} (expected one of {', '.join(self.tiers)})")
+        if self.head is None:
+            self.refresh()
+
+        priority = self.priority_fee(tier)
+        return {
+            'maxFeePerGas': int(self.next_base_fee * BASE_FEE_MULTIPLIERS[tier]) + priority,
+            'maxPriorityFeePerGas': priority,
+        }
+
+    def suggestions(self) -> Dict[str, Dict[str, int]]:
+        """suggest() for every tier"""
+        return {tier: self.suggest(tier) for tier in self.tiers}
+
+    def gas_used_ratio(self) -> float:
+        """Mean block fullness over the window"""
+        return sum(self.gas_used_ratios[:self.size]) / self.size if self.size else 0.0
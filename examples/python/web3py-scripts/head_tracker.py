@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Reorg-aware chain head tracking
+Keeps recent block hashes in a ring buffer and reports where the chain forked
+"""
+
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+# (number, hash, parentHash)
+Header = Tuple[int, bytes, bytes]
+
+
+class BlockRing:
+    """Fixed-size ring buffer of recent block headers, slotted by number"""
+
+    def __init__(self, capacity: int = 128):
+        """
+        Initialize ring
+
+        Args:
+            capacity: Number of most recent blocks remembered
+        """
+        self.capacity = capacity
+        self._numbers = [-1] * capacity
+        self._hashes = [b''] * capacity
+        self._parents = [b''] * capacity
+
+    def put(self, number: int, block_hash: bytes, parent_hash: bytes):
+        slot = number % self.capacity
+        self._numbers[slot] = number
+        self._hashes[slot] = block_hash
+        self._parents[slot] = parent_hash
+
+    def get(self, number: int) -> Optional[Header]:
+        """Header for a block still inside the window, else None"""
+        if number < 0:
+            return None
+        slot = number % self.capacity
+        if self._numbers[slot] != number:
+            return None
+        return number, self._hashes[slot], self._parents[slot]
+
+    def hash_of(self, number: int) -> Optional[bytes]:
+        header = self.get(number)
+        return header[1] if header else None
+
+    def discard_above(self, number: int):
+        """Forget headers newer than `number` (the chain got shorter)"""
+        for slot, stored in enumerate(self._numbers):
+            if stored > number:
+                self._numbers[slot] = -1
+
+
+class HeadTracker:
+    """Follow the canonical chain head and detect reorgs incrementally"""
+
+    def __init__(self, get_block: Callable[[int], Any], capacity: int = 128, history: int = 0):
+        """
+        Initialize tracker
+
+        Args:
+            get_block: Function returning a block with number/hash/parentHash,
+                e.g. w3.eth.get_block
+            capacity: Ring buffer size; reorgs deeper than this raise
+            history: Ancestors of the first head to load too, so a reorg
+                right after startup is traced down to them (e.g. the
+                confirmation depth)
+        """
+        self.get_block = get_block
+        self.ring = BlockRing(capacity)
+        self.history = min(history, capacity - 1)
+        self.tip: Optional[int] = None
+        # Lowest block ever tracked; a walk back stops here instead of raising
+        self.first: Optional[int] = None
+
+    def _header(self, number: int) -> Header:
+        block = self.get_block(number)
+        return block['number'], bytes(block['hash']), bytes(block['parentHash'])
+
+    def update(self, head: int) -> Optional[int]:
+        """
+        Sync the ring with the canonical chain up to `head`
+
+        Only headers above the previous tip are fetched; a parent-hash
+        mismatch triggers a walk back to the common ancestor.
+
+        Args:
+            head: Current chain head number
+
+        Returns:
+            Lowest orphaned block number, or None if no reorg happened
+        """
+        if self.tip is None:
+            self.first = max(0, head - self.history)
+            for number in range(self.first, head + 1):
+                self._link(self._header(number))
+            self.tip = head
+            return None
+
+        fork = None
+        if head <= self.tip:
+            # No new block: re-check the head itself for a same-height reorg
+            self.ring.discard_above(head)
+            if head < self.tip:
+                fork = head + 1
+            start = head
+        else:
+            start = self.tip + 1
+
+        for number in range(start, head + 1):
+            orphaned_from = self._link(self._header(number))
+            if orphaned_from is not None:
+                fork = orphaned_from if fork is None else min(fork, orphaned_from)
+
+        self.tip = head
+        return fork
+
+    def _link(self, header: Header) -> Optional[int]:
+        """Store a header, walking back past any blocks it orphans"""
+        number, block_hash, parent_hash = header
+        fork = None
+
+        stored = self.ring.hash_of(number)
+        if stored is not None and stored != block_hash:
+            fork = number
+
+        while True:
+            parent_stored = self.ring.hash_of(number - 1)
+            self.ring.put(number, block_hash, parent_hash)
+            if parent_stored is None or parent_stored == parent_hash:
+                break
+
+            # Our copy of the parent is orphaned: replace it and keep walking
+            number -= 1
+            fork = number
+            # Below the first tracked block there is nothing we saw that could be orphaned
+            if self.ring.get(number - 1) is None and number - 1 >= self.first:
+                raise RuntimeError(
+                    f"Reorg at block {number} is deeper than the {self.ring.capacity}-block buffer"
+                )
+            number, block_hash, parent_hash = self._header(number)
+
+        return fork
+
+
+class ReorgAwareWatcher:
+    """Deliver logs at a confirmation depth and retract them after reorgs"""
+
+    def __init__(
+        self,
+        tracker: HeadTracker,
+        fetch_logs: Callable[[int, int], list],
+        callback: Callable[[Any], None],
+        on_removed: Optional[Callable[[Any], None]] = None,
+        confirmations: int = 12
+    ):
+        """
+        Initialize watcher
+
+        Args:
+            tracker: Head tracker owning the block-hash ring
+            fetch_logs: Function returning logs for a [lo, hi] block range
+            callback: Called for each log once it is `confirmations` deep
+            on_removed: Called for each delivered log whose block was orphaned
+            confirmations: Blocks a log must be buried under before delivery
+        """
+        self.tracker = tracker
+        self.fetch_logs = fetch_logs
+        self.callback = callback
+        self.on_removed = on_removed
+        self.confirmations = confirmations
+        self.delivered_through: Optional[int] = None
+        # block number -> logs delivered from it, kept while inside the ring
+        self.delivered: Dict[int, list] = {}
+
+    def poll(self, head: int) -> int:
+        """
+        Advance to a new chain head
+
+        Args:
+            head: Current chain head number
+
+        Returns:
+            Number of logs delivered
+        """
+        fork = self.tracker.update(head)
+
+        if self.delivered_through is None:
+            self.delivered_through = head - self.confirmations
+            return 0
+
+        if fork is not None and fork <= self.delivered_through:
+            self._retract(fork)
+
+        target = head - self.confirmations
+        if target <= self.delivered_through:
+            return 0
+
+        logs = self.fetch_logs(self.delivered_through + 1, target)
+
+        # Logs must come from the blocks the ring holds; otherwise the node
+        # served them from another fork mid-poll, so retry next time
+        for event_log in logs:
+            expected = self.tracker.ring.hash_of(event_log['blockNumber'])
+            if expected is not None and expected != bytes(event_log['blockHash']):
+                return 0
+
+        for event_log in logs:
+            self.delivered.setdefault(event_log['blockNumber'], []).append(event_log)
+            self.callback(event_log)
+
+        self.delivered_through = target
+        self._prune(head)
+        return len(logs)
+
+    def _retract(self, fork: int):
+        """Emit removals, newest first, for delivered logs at or above `fork`"""
+        for number in sorted((n for n in self.delivered if n >= fork), reverse=True):
+            for event_log in reversed(self.delivered.pop(number)):
+                if self.on_removed:
+                    self.on_removed(event_log)
+        self.delivered_through = fork - 1
+
+    def _prune(self, head: int):
+        oldest = head - self.tracker.ring.capacity
+        for number in [n for n in self.delivered if n <= oldest]:
+            del self.delivered[number]
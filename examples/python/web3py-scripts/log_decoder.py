@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Fast-path ABI log decoder
+Decodes raw eth_getLogs entries straight from topic/data bytes
+"""
+
+from eth_abi import decode as abi_decode
+from web3 import Web3
+from event_listener import event_signature
+import re
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; the per-row path is used without it
+    np = None
+
+
+STATIC_TYPE = re.compile(r'^(u?int\d*|address|bool|bytes([1-9]|[12]\d|3[012]))$')
+
+# Below this many logs per event the column path costs more than it saves
+VECTORIZE_THRESHOLD = 64
+
+
+def to_bytes(value) -> bytes:
+    """Accept hex strings (raw JSON-RPC) or bytes/HexBytes (web3-formatted)"""
+    if isinstance(value, str):
+        return bytes.fromhex(value[2:] if value.startswith('0x') else value)
+    return bytes(value)
+
+
+def to_int(value) -> int:
+    """Accept hex quantities (raw JSON-RPC) or ints (web3-formatted)"""
+    return int(value, 16) if isinstance(value, str) else value
+
+
+class LogRecord:
+    """Slotted decoded log; subclasses add one slot per event argument"""
+
+    __slots__ = ('event', 'address', 'block_number', 'log_index', 'transaction_hash')
+    fields: Tuple[str, ...] = ()
+
+    def __getitem__(self, name: str) -> Any:
+        return getattr(self, name)
+
+    def args(self) -> Dict[str, Any]:
+        """Event arguments by name"""
+        return {name: getattr(self, name) for name in self.fields}
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Same shape as EventListener.decode_event"""
+        return {
+            'event': self.event,
+            'args': self.args(),
+            'block_number': self.block_number,
+            'transaction_hash': self.transaction_hash,
+            'log_index': self.log_index,
+        }
+
+    def __repr__(self) -> str:
+        args = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.fields)
+        return f"{self.event}({args} @ {self.block_number}:{self.log_index})"
+
+
+def word_decoder(abi_type: str, checksum_addresses: bool) -> Callable[[bytes], Any]:
+    """Decoder for one 32-byte ABI word of a static type"""
+    if abi_type == 'address':
+        if checksum_addresses:
+            return lambda word: Web3.to_checksum_address(word[12:])
+        return lambda word: '0x' + word[12:].hex()
+    if abi_type == 'bool':
+        return lambda word: word[31] != 0
+    if abi_type.startswith('uint'):
+        return lambda word: int.from_bytes(word, 'big')
+    if abi_type.startswith('int'):
+        return lambda word: int.from_bytes(word, 'big', signed=True)
+    size = int(abi_type[5:])
+    return lambda word: word[:size]
+
+
+class EventDecoder:
+    """One event ABI compiled into topic and data decoders"""
+
+    def __init__(self, event_abi: Dict[str, Any], checksum_addresses: bool = False):
+        """
+        Precompile an event
+
+        Args:
+            event_abi: ABI entry with type 'event'
+            checksum_addresses: EIP-55 checksum decoded addresses (slower)
+        """
+        self.name = event_abi['name']
+        self.topic0 = bytes(Web3.keccak(text=event_signature([event_abi], self.name)))
+        self.checksum_addresses = checksum_addresses
+
+        inputs = event_abi['inputs']
+        # Names clashing with LogRecord's own slots get a trailing underscore
+        names = [
+            arg['name'] + '_' if arg['name'] in LogRecord.__slots__ else arg['name']
+            for arg in inputs
+        ]
+        self.indexed = [(n, a['type']) for n, a in zip(names, inputs) if a['indexed']]
+        self.data = [(n, a['type']) for n, a in zip(names, inputs) if not a['indexed']]
+
+        # Indexed dynamic values are stored as their keccak hash: keep the raw topic
+        self._topic_decoders = [
+            word_decoder(t, checksum_addresses) if STATIC_TYPE.match(t) else bytes
+            for _, t in self.indexed
+        ]
+        self._data_static = all(STATIC_TYPE.match(t) for _, t in self.data)
+        self._data_decoders = [word_decoder(t, checksum_addresses) for _, t in self.data] \
+            if self._data_static else None
+        self._data_types = [t for _, t in self.data]
+
+        field_names = tuple(n for n, _ in self.indexed) + tuple(n for n, _ in self.data)
+        self.record_type = type(
+            f"{self.name}Record",
+            (LogRecord,),
+            {'__slots__': field_names, 'fields': field_names}
+        )
+
+    def decode_data(self, data: bytes) -> List[Any]:
+        """Decode the non-indexed fields of one log"""
+        if self._data_static:
+            return [
+                decoder(data[i * 32:(i + 1) * 32])
+                for i, decoder in enumerate(self._data_decoders)
+            ]
+        return list(abi_decode(self._data_types, data))
+
+    def decode(self, raw_log: Dict[str, Any]) -> LogRecord:
+        """
+        Decode a single raw log
+
+        Args:
+            raw_log: eth_getLogs entry, raw JSON or web3-formatted
+
+        Returns:
+            Slotted record for this event
+        """
+        topics = raw_log['topics']
+        values = [
+            decoder(to_bytes(topic))
+            for decoder, topic in zip(self._topic_decoders, topics[1:])
+        ]
+        values.extend(self.decode_data(to_bytes(raw_log['data'])))
+        return self._build(raw_log, values)
+
+    def decode_many(self, raw_logs: List[Dict[str, Any]]) -> List[LogRecord]:
+        """
+        Decode a page of logs of this event
+
+        With numpy and an all-static layout, each argument is decoded as a
+        column over the whole page instead of word by word.
+        """
+        if np is None or len(raw_logs) < VECTORIZE_THRESHOLD or not self._data_static:
+            return [self.decode(raw_log) for raw_log in raw_logs]
+
+        width = 32 * len(self.data)
+        datas = [to_bytes(raw_log['data']) for raw_log in raw_logs]
+        if any(len(data) != width for data in datas):
+            return [self.decode(raw_log) for raw_log in raw_logs]
+
+        columns = []
+        for position, (_, abi_type) in enumerate(self.indexed):
+            words = b''.join(to_bytes(raw_log['topics'][position + 1]) for raw_log in raw_logs)
+            if STATIC_TYPE.match(abi_type):
+                columns.append(self._decode_column(abi_type, words, len(raw_logs)))
+            else:
+                columns.append([words[i:i + 32] for i in range(0, len(words), 32)])
+
+        if width:
+            matrix = np.frombuffer(b''.join(datas), dtype=np.uint8).reshape(len(raw_logs), width)
+            for position, (_, abi_type) in enumerate(self.data):
+                words = matrix[:, position * 32:(position + 1) * 32].tobytes()
+                columns.append(self._decode_column(abi_type, words, len(raw_logs)))
+
+        return [
+            self._build(raw_log, [column[row] for column in columns])
+            for row, raw_log in enumerate(raw_logs)
+        ]
+
+    def _decode_column(self, abi_type: str, words: bytes, count: int) -> List[Any]:
+        """Decode `count` contiguous 32-byte words of one static type"""
+        matrix = np.frombuffer(words, dtype=np.uint8).reshape(count, 32)
+
+        if abi_type == 'address' and not self.checksum_addresses:
+            hexed = matrix[:, 12:].tobytes().hex()
+            return ['0x' + hexed[i:i + 40] for i in range(0, len(hexed), 40)]
+        if abi_type == 'bool':
+            return (matrix[:, 31] != 0).tolist()
+        if abi_type.startswith('uint') and not matrix[:, :24].any():
+            # Every value fits in 64 bits: convert the whole column at once
+            return matrix[:, 24:].copy().view('>u8').ravel().tolist()
+
+        decoder = word_decoder(abi_type, self.checksum_addresses)
+        return [decoder(words[i:i + 32]) for i in range(0, len(words), 32)]
+
+    def _build(self, raw_log: Dict[str, Any], values: List[Any]) -> LogRecord:
+        record = self.record_type.__new__(self.record_type)
+        record.event = self.name
+        record.address = raw_log['address']
+        record.block_number = to_int(raw_log['blockNumber'])
+        record.log_index = to_int(raw_log['logIndex'])
+        record.transaction_hash = '0x' + to_bytes(raw_log['transactionHash']).hex()
+        for name, value in zip(self.record_type.fields, values):
+            setattr(record, name, value)
+        return record
+
+
+class LogDecoder:
+    """topic0 -> EventDecoder table for every event in an ABI"""
+
+    def __init__(self, abi: list, checksum_addresses: bool = False):
+        """
+        Precompile all (non-anonymous) events of an ABI
+
+        Args:
+            abi: Contract ABI
+            checksum_addresses: EIP-55 checksum decoded addresses (slower)
+        """
+        self.decoders: Dict[bytes, EventDecoder] = {}
+        for item in abi:
+            if item.get('type') == 'event' and not item.get('anonymous'):
+                decoder = EventDecoder(item, checksum_addresses)
+                self.decoders[decoder.topic0] = decoder
+
+    @property
+    def topics(self) -> List[str]:
+        return ['0x' + topic.hex() for topic in self.decoders]
+
+    def decode(self, raw_log: Dict[str, Any]) -> Optional[LogRecord]:
+        """Decode one log, or None if its topic0 is unknown"""
+        if not raw_log['topics']:
+            return None
+        decoder = self.decoders.get(to_bytes(raw_log['topics'][0]))
+        return decoder.decode(raw_log) if decoder else None
+
+    def decode_batch(self, raw_logs: Iterable[Dict[str, Any]]) -> List[LogRecord]:
+        """
+        Decode a page of logs, preserving input order
+
+        Logs are grouped per event so each group takes the column path;
+        logs with unknown topic0 are dropped.
+        """
+        groups: Dict[bytes, List[Tuple[int, Dict[str, Any]]]] = {}
+        for position, raw_log in enumerate(raw_logs):
+            if raw_log['topics']:
+                groups.setdefault(to_bytes(raw_log['topics'][0]), []).append((position, raw_log))
+
+        decoded: List[Tuple[int, LogRecord]] = []
+        for topic0, members in groups.items():
+            decoder = self.decoders.get(topic0)
+            if decoder is None:
+                continue
+            records = decoder.decode_many([raw_log for _, raw_log in members])
+            decoded.extend(zip((position for position, _ in members), records))
+
+        decoded.sort(key=lambda item: item[0])
+        return [record for _, record in decoded]
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Durable event log store
+SQLite (WAL mode) storage of decoded logs with per-filter checkpoints
+"""
+
+import json
+import sqlite3
+from typing import Dict, Any, Iterable, Iterator, Optional
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS logs (
+    filter_key TEXT NOT NULL,
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    transaction_hash TEXT NOT NULL,
+    event TEXT NOT NULL,
+    args TEXT NOT NULL,
+    PRIMARY KEY (filter_key, block_number, log_index)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS checkpoints (
+    filter_key TEXT PRIMARY KEY,
+    block_number INTEGER NOT NULL
+);
+"""
+
+
+def _json_default(value):
+    """Serialize bytes/HexBytes arguments as 0x-hex"""
+    if isinstance(value, (bytes, bytearray)):
+        return '0x' + bytes(value).hex()
+    raise TypeError(f"Cannot store {type(value).__name__}")
+
+
+def to_row(filter_key: str, event_log) -> tuple:
+    """Flatten a web3 event log or a log_decoder.LogRecord into a table row"""
+    if hasattr(event_log, 'as_dict'):
+        data = event_log.as_dict()
+        tx_hash = data['transaction_hash']
+    else:
+        data = {
+            'event': event_log['event'],
+            'args': dict(event_log['args']),
+            'block_number': event_log['blockNumber'],
+            'log_index': event_log['logIndex'],
+        }
+        tx_hash = '0x' + bytes(event_log['transactionHash']).hex()
+
+    return (
+        filter_key,
+        data['block_number'],
+        data['log_index'],
+        tx_hash,
+        data['event'],
+        json.dumps(data['args'], default=_json_default),
+    )
+
+
+class LogStore:
+    """Persistent decoded-log store with resumable checkpoints"""
+
+    def __init__(self, path: str = 'events.db'):
+        """
+        Open (or create) a store
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        # WAL + NORMAL stays crash-consistent; only the last commit may be lost
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def checkpoint(self, filter_key: str) -> Optional[int]:
+        """Last fully processed block for a filter, or None"""
+        row = self.conn.execute(
+            'SELECT block_number FROM checkpoints WHERE filter_key = ?',
+            (filter_key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def write_page(self, filter_key: str, event_logs: Iterable, through_block: int) -> int:
+        """
+        Store one page of logs and advance the checkpoint atomically
+
+        Args:
+            filter_key: Filter the logs belong to
+            event_logs: Logs of the page
+            through_block: Last block the page covers
+
+        Returns:
+            Number of logs written
+        """
+        rows = [to_row(filter_key, event_log) for event_log in event_logs]
+
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO logs VALUES (?, ?, ?, ?, ?, ?)',
+                rows
+            )
+            self.conn.execute(
+                'INSERT INTO checkpoints VALUES (?, ?) '
+                'ON CONFLICT(filter_key) DO UPDATE SET block_number = excluded.block_number',
+                (filter_key, through_block)
+            )
+
+        return len(rows)
+
+    def rewind(self, filter_key: str, block_number: int):
+        """
+        Drop logs at or above a block and move the checkpoint before it
+
+        Used when a reorg orphans already stored blocks.
+        """
+        with self.conn:
+            self.conn.execute(
+                'DELETE FROM logs WHERE filter_key = ? AND block_number >= ?',
+                (filter_key, block_number)
+            )
+            self.conn.execute(
+                'UPDATE checkpoints SET block_number = ? '
+                'WHERE filter_key = ? AND block_number >= ?',
+                (block_number - 1, filter_key, block_number)
+            )
+
+    def query(
+        self,
+        filter_key: str,
+        from_block: int = 0,
+        to_block: Optional[int] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Serve stored history without touching the provider
+
+        Yields:
+            Logs in EventListener.decode_event format
+        """
+        sql = ('SELECT event, args, block_number, transaction_hash, log_index FROM logs '
+               'WHERE filter_key = ? AND block_number >= ? AND block_number <= ? '
+               f'ORDER BY block_number {"DESC" if newest_first else "ASC"}, '
+               f'log_index {"DESC" if newest_first else "ASC"}')
+        params = [filter_key, from_block, to_block if to_block is not None else 2 ** 62]
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+
+        for event, args, block_number, tx_hash, log_index in self.conn.execute(sql, params):
+            yield {
+                'event': event,
+                'args': json.loads(args),
+                'block_number': block_number,
+                'transaction_hash': tx_hash,
+                'log_index': log_index,
+            }
+
+    def count(self, filter_key: str) -> int:
+        return self.conn.execute(
+            'SELECT COUNT(*) FROM logs WHERE filter_key = ?', (filter_key,)
+        ).fetchone()[0]
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Web3.py Multiplexed Event Listener
+Watch many (contract, event) pairs with a single log filter
+"""
+
+from web3 import Web3
+from event_listener import event_signature
+import json
+import time
+from typing import Dict, Any, Callable, List, Optional, Union
+
+
+class MultiEventListener:
+    """Listen to events from many contracts through one eth_getLogs filter"""
+
+    def __init__(self, rpc_url: str):
+        """
+        Initialize multiplexed listener
+
+        Args:
+            rpc_url: Ethereum RPC endpoint
+        """
+        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+
+        if not self.w3.is_connected():
+            raise ConnectionError(f"Failed to connect to {rpc_url}")
+
+        # topic0 -> checksum address -> (event, callback)
+        self.routes: Dict[bytes, Dict[str, tuple]] = {}
+
+        print(f"✓ Connected to network")
+        print(f"✓ Chain ID: {self.w3.eth.chain_id}")
+
+    def subscribe(
+        self,
+        address: str,
+        abi: list,
+        event_name: str,
+        callback: Callable[[Dict[str, Any]], None]
+    ):
+        """
+        Register a (contract, event) pair
+
+        Args:
+            address: Contract address
+            abi: Contract ABI (only the event entry is needed)
+            event_name: Event to route to the callback
+            callback: Function called with each decoded log
+        """
+        address = Web3.to_checksum_address(address)
+        contract = self.w3.eth.contract(address=address, abi=abi)
+        event = getattr(contract.events, event_name)()
+        topic = bytes(Web3.keccak(text=event_signature(abi, event_name)))
+
+        self.routes.setdefault(topic, {})[address] = (event, callback)
+
+    @property
+    def addresses(self) -> List[str]:
+        return sorted({address for by_address in self.routes.values() for address in by_address})
+
+    def log_filter(
+        self,
+        from_block: Union[int, str] = 'latest',
+        to_block: Optional[Union[int, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Single filter covering every subscription
+
+        Addresses form an OR-list and topic0 an OR-set, so the filter
+        size (not the number of filters) grows with subscriptions.
+        """
+        params = {
+            'address': self.addresses,
+            'topics': [['0x' + topic.hex() for topic in sorted(self.routes)]],
+            'fromBlock': from_block,
+        }
+        if to_block is not None:
+            params['toBlock'] = to_block
+        return params
+
+    def dispatch(self, raw_log: Dict[str, Any]) -> bool:
+        """
+        Decode a log and hand it to its callback
+
+        Args:
+            raw_log: Log as returned by eth_getLogs / eth_getFilterChanges
+
+        Returns:
+            True if a subscription matched the log
+        """
+        if not raw_log['topics']:
+            return False
+
+        # Addresses in formatted logs are already checksummed
+        route = self.routes.get(bytes(raw_log['topics'][0]), {}).get(raw_log['address'])
+        if route is None:
+            return False
+
+        event, callback = route
+        callback(event.process_log(raw_log))
+        return True
+
+    def get_past_events(self, from_block: int, to_block: Union[int, str] = 'latest') -> int:
+        """
+        Replay history for all subscriptions with one eth_getLogs call
+
+        Args:
+            from_block: Starting block number
+            to_block: Ending block (or 'latest')
+
+        Returns:
+            Number of logs dispatched
+        """
+        raw_logs = self.w3.eth.get_logs(self.log_filter(from_block, to_block))
+        return sum(self.dispatch(raw_log) for raw_log in raw_logs)
+
+    def watch(self, poll_interval: int = 2):
+        """
+        Watch all subscriptions; one eth_getFilterChanges call per poll
+
+        Args:
+            poll_interval: Seconds between polls
+        """
+        log_filter = self.w3.eth.filter(self.log_filter())
+
+        print(f"👀 Watching {sum(len(r) for r in self.routes.values())} subscriptions "
+              f"across {len(self.addresses)} contracts...")
+        print(f"   Poll interval: {poll_interval}s")
+        print("   Press Ctrl+C to stop\n")
+
+        try:
+            while True:
+                for raw_log in log_filter.get_new_entries():
+                    self.dispatch(raw_log)
+
+                time.sleep(poll_interval)
+
+        except KeyboardInterrupt:
+            print("\n✓ Stopped watching events")
+        finally:
+            self.w3.eth.uninstall_filter(log_filter.filter_id)
+
+
+def main():
+    """Example usage"""
+
+    ERC20_ABI = json.loads('''[
+        {
+            "anonymous": false,
+            "inputs": [
+                {"indexed": true, "name": "from", "type": "address"},
+                {"indexed": true, "name": "to", "type": "address"},
+                {"indexed": false, "name": "value", "type": "uint256"}
+            ],
+            "name": "Transfer",
+            "type": "event"
+        }
+    ]''')
+
+    RPC_URL = "https://eth-mainnet.g.alchemy.com/v2/YOUR_API_KEY"
+    TOKENS = {
+        'USDC': "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
+        'USDT': "0xdAC17F958D2ee523a2206206994597C13D831ec7",
+        'DAI': "0x6B175474E89094C44Da98b954EedeAC495271d0F",
+    }
+
+    def make_callback(symbol: str):
+        def on_transfer(event_log: Dict[str, Any]):
+            args = event_log['args']
+            print(f"📤 {symbol} {args['from']} → {args['to']}: {args['value']}")
+        return on_transfer
+
+    try:
+        listener = MultiEventListener(RPC_URL)
+        for symbol, address in TOKENS.items():
+            listener.subscribe(address, ERC20_ABI, 'Transfer', make_callback(symbol))
+
+        listener.watch(poll_interval=12)
+
+    except Exception as e:
+        print(f"✗ Error: {e}")
+        raise
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Local Nonce Manager
+Hands out an account's nonces without asking the node for each transaction
+"""
+
+import threading
+from typing import Optional
+
+
+class NonceManager:
+    """
+    Thread-safe nonce counter for one sending account
+
+    The pending nonce is fetched once; after that nonces are assigned
+    locally, so many transactions can be signed and sent back-to-back.
+    """
+
+    def __init__(self, w3, address: str):
+        """
+        Initialize manager (no network access until the first reserve)
+
+        Args:
+            w3: Web3 instance
+            address: Sending account
+        """
+        self.w3 = w3
+        self.address = address
+        self.next_nonce: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def sync(self, at_least: int = 0) -> int:
+        """
+        Re-read the pending nonce from the node
+
+        Args:
+            at_least: Floor for the next nonce, e.g. past transactions of
+                ours the node may have dropped from its pending count
+        """
+        with self._lock:
+            self.next_nonce = max(self.w3.eth.get_transaction_count(self.address, 'pending'), at_least)
+            return self.next_nonce
+
+    def reserve(self, count: int = 1) -> int:
+        """
+        Claim `count` consecutive nonces
+
+        Returns:
+            The first nonce of the range
+        """
+        with self._lock:
+            if self.next_nonce is None:
+                self.next_nonce = self.w3.eth.get_transaction_count(self.address, 'pending')
+            first = self.next_nonce
+            self.next_nonce += count
+            return first
+
+    def confirmed(self) -> int:
+        """Nonce of the next transaction the chain will accept; lower ones are mined"""
+        return self.w3.eth.get_transaction_count(self.address, 'latest')
+
+    def reset(self):
+        """Forget the local counter, e.g. after a send failed; the next reserve re-syncs"""
+        with self._lock:
+            self.next_nonce = None
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Offline Transaction Pre-Signing
+Sign thousands of transactions from a template and a nonce range on a
+process pool, into a compact signed-batch file a broadcaster streams out
+"""
+
+import os
+import struct
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# File layout: header, then one length-prefixed raw transaction per nonce
+BATCH_MAGIC = b'SIGB'
+BATCH_VERSION = 1
+HEADER = struct.Struct('>4sBQQ')    # magic, version, chain id, first nonce
+RECORD_LENGTH = struct.Struct('>I')
+
+FEE_FIELDS = ({'gasPrice'}, {'maxFeePerGas', 'maxPriorityFeePerGas'})
+
+
+def validate_template(template: Dict[str, Any]):
+    """A template must be complete enough to sign without asking a node"""
+    missing = {'chainId', 'gas'} - template.keys()
+    if missing:
+        raise ValueError(f"Template is missing {', '.join(sorted(missing))}")
+    if not any(fields <= template.keys() for fields in FEE_FIELDS):
+        raise ValueError("Template needs gasPrice or maxFeePerGas and maxPriorityFeePerGas")
+    if 'nonce' in template:
+        raise ValueError("Nonces come from the nonce range, not the template")
+
+
+def _sign_chunk(
+    private_key: str,
+    template: Dict[str, Any],
+    first_nonce: int,
+    overrides: List[Dict[str, Any]]
+) -> List[bytes]:
+    """Worker: sign template + overrides[i] with nonce first_nonce + i"""
+    from eth_account import Account
+
+    account = Account.from_key(private_key)
+    return [
+        bytes(account.sign_transaction({**template, **override, 'nonce': first_nonce + i}).rawTransaction)
+        for i, override in enumerate(overrides)
+    ]
+
+
+def sign_range(
+    private_key: str,
+    template: Dict[str, Any],
+    first_nonce: int,
+    count: Optional[int] = None,
+    overrides: Optional[Iterable[Dict[str, Any]]] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 256
+) -> Iterator[bytes]:
+    """
+    Sign transactions first_nonce.. across a process pool, offline
+
+    Every transaction is the template plus its override (e.g. a different
+    'to' or 'data' per airdrop recipient). Nonces are assigned by position,
+    so chunk i of the override stream is signed from first_nonce +
+    i * chunk_size no matter which worker finishes first; at most two
+    chunks per worker are pending.
+
+    Args:
+        private_key: Signing key
+        template: Transaction fields shared by every transaction; must hold
+            chainId, gas and fees, since no node is asked
+        first_nonce: Nonce of the first transaction
+        count: Transactions to sign (default: one per override)
+        overrides: Per-transaction fields, in nonce order
+        workers: Processes (default: CPU count)
+        chunk_size: Transactions per task sent to a worker
+
+    Yields:
+        Signed raw transactions, in nonce order
+    """
+    validate_template(template)
+    if overrides is None:
+        if count is None:
+            raise ValueError("Give count, overrides or both")
+        overrides = ({} for _ in range(count))
+    elif count is not None:
+        overrides = islice(overrides, count)
+
+    overrides = iter(overrides)
+    workers = workers or os.cpu_count() or 1
+    window = deque()
+    nonce = first_nonce
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in iter(lambda: list(islice(overrides, chunk_size)), []):
+            window.append(pool.submit(_sign_chunk, private_key, template, nonce, chunk))
+            nonce += len(chunk)
+            if len(window) >= 2 * workers:
+                yield from window.popleft().result()
+
+        while window:
+            yield from window.popleft().result()
+
+
+def write_signed_batch(path: str, chain_id: int, first_nonce: int, raw_transactions: Iterable[bytes]) -> int:
+    """
+    Write signed transactions as a signed-batch file
+
+    Returns:
+        Number of transactions written
+    """
+    written = 0
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(BATCH_MAGIC, BATCH_VERSION, chain_id, first_nonce))
+        for raw in raw_transactions:
+            f.write(RECORD_LENGTH.pack(len(raw)))
+            f.write(raw)
+            written += 1
+    return written
+
+
+def read_signed_batch(path: str) -> Tuple[Dict[str, int], Iterator[bytes]]:
+    """
+    Open a signed-batch file
+
+    Returns:
+        ({'chain_id', 'first_nonce'}, iterator of raw transactions in nonce order)
+    """
+    f = open(path, 'rb')
+    magic, version, chain_id, first_nonce = HEADER.unpack(f.read(HEADER.size))
+    if magic != BATCH_MAGIC or version != BATCH_VERSION:
+        f.close()
+        raise ValueError(f"{path} is not a signed-batch file")
+
+    def records() -> Iterator[bytes]:
+        with f:
+            while True:
+                prefix = f.read(RECORD_LENGTH.size)
+                if not prefix:
+                    return
+                (length,) = RECORD_LENGTH.unpack(prefix)
+                raw = f.read(length)
+                if len(raw) != length:
+                    raise ValueError(f"{path} is truncated")
+                yield raw
+
+    return {'chain_id': chain_id, 'first_nonce': first_nonce}, records()
+
+
+def broadcast_signed_batch(endpoint: Any, path: str, batch_size: int = 100) -> Iterator[str]:
+    """
+    Stream a signed-batch file out as eth_sendRawTransaction batches
+
+    Args:
+        endpoint: RPC URL, or an rpc_router.RPCRouter (writes stay pinned)
+        path: Signed-batch file
+        batch_size: Transactions per JSON-RPC batch
+
+    Yields:
+        Transaction hashes, in nonce order; raises ValueError on the first rejection
+    """
+    from rpc_batch import RPCBatch
+
+    _, records = read_signed_batch(path)
+    batch = RPCBatch(endpoint, max_batch_size=batch_size)
+    for chunk in iter(lambda: list(islice(records, batch_size)), []):
+        calls = [batch.add('eth_sendRawTransaction', '0x' + raw.hex()) for raw in chunk]
+        batch.flush()
+        for call in calls:
+            yield call.result
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Receipt Tracker
+Waits for many transactions at once: one head poll per interval, block
+transaction lists matched against the pending set, and receipts fetched in
+one batch for the hashes that matched
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+# (method, params) pairs in, raw JSON-RPC results out, in order
+RequestMany = Callable[[Sequence[Tuple[str, Sequence[Any]]]], List[Any]]
+
+
+def normalize_hash(tx_hash: Any) -> str:
+    """'0x'-prefixed lowercase hex for str, bytes and HexBytes hashes"""
+    if isinstance(tx_hash, (bytes, bytearray)):
+        return '0x' + bytes(tx_hash).hex()
+    tx_hash = str(tx_hash).lower()
+    return tx_hash if tx_hash.startswith('0x') else '0x' + tx_hash
+
+
+def web3_request_many(w3) -> RequestMany:
+    """
+    RequestMany over a web3 instance's provider
+
+    HTTP providers and rpc_router providers send one JSON-RPC batch; any
+    other provider gets the calls one by one.
+    """
+    provider = w3.provider
+    endpoint = getattr(provider, 'router', None) or getattr(provider, 'endpoint_uri', None)
+
+    def request_many(calls):
+        if endpoint is not None:
+            from rpc_batch import RPCBatch
+
+            with RPCBatch(endpoint) as batch:
+                sent = [batch.add(method, *params) for method, params in calls]
+            return [call.result for call in sent]
+
+        results = []
+        for method, params in calls:
+            response = provider.make_request(method, list(params))
+            if response.get('error') is not None:
+                raise ValueError(response['error'])
+            results.append(response.get('result'))
+        return results
+
+    return request_many
+
+
+class ReceiptTracker:
+    """
+    Resolve per-transaction futures as their receipts appear
+
+    A background thread polls while anything is pending. Each poll reads
+    the head once and the transaction hashes of blocks mined since the last
+    poll; receipts are requested only for hashes seen in those blocks.
+    Newly watched hashes get one direct receipt check, in case they were
+    mined before they were watched.
+    """
+
+    def __init__(
+        self,
+        request_many: RequestMany,
+        poll_interval: float = 2.0,
+        max_catchup: int = 32,
+        format_receipt: Optional[Callable[[dict], Any]] = None
+    ):
+        """
+        Initialize tracker (no network access until something is watched)
+
+        Args:
+            request_many: Sends (method, params) calls, ideally as one batch
+            poll_interval: Seconds between head polls
+            max_catchup: More new blocks than this and the tracker asks for
+                every pending receipt directly instead of scanning blocks
+            format_receipt: Applied to each raw receipt before it resolves a future
+        """
+        self.request_many = request_many
+        self.poll_interval = poll_interval
+        self.max_catchup = max_catchup
+        self.format_receipt = format_receipt or (lambda receipt: receipt)
+        self.tip: Optional[int] = None
+        self.pending: Dict[str, Tuple[Future, Optional[float]]] = {}
+        self.fresh: Set[str] = set()
+        self.blocks_scanned = 0
+        self.receipts_requested = 0
+        self.last_error: Optional[Exception] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_web3(cls, w3, **kwargs) -> 'ReceiptTracker':
+        """Tracker over a web3 instance; futures resolve to web3-style AttributeDict receipts"""
+        from web3._utils.method_formatters import receipt_formatter
+        from web3.datastructures import AttributeDict
+
+        return cls(
+            web3_request_many(w3),
+            format_receipt=lambda receipt: AttributeDict.recursive(receipt_formatter(receipt)),
+            **kwargs
+        )
+
+    def watch(self, tx_hash: Any, timeout: Optional[float] = None) -> Future:
+        """
+        Future resolving to the receipt of tx_hash
+
+        Watching a hash twice returns the same future. On timeout the future
+        fails with TimeoutError.
+
+        Args:
+            tx_hash: Transaction hash (str, bytes or HexBytes)
+            timeout: Seconds to wait (None = until close)
+        """
+        key = normalize_hash(tx_hash)
+        with self._lock:
+            if key in self.pending:
+                return self.pending[key][0]
+
+            future = Future()
+            deadline = time.monotonic() + timeout if timeout is not None else None
+            self.pending[key] = (future, deadline)
+            self.fresh.add(key)
+
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        return future
+
+    def wait(self, tx_hash: Any, timeout: Optional[float] = 120) -> Any:
+        """Block until the receipt of tx_hash is in (drop-in for wait_for_transaction_receipt)"""
+        return self.watch(tx_hash, timeout).result()
+
+    def wait_all(self, tx_hashes: Sequence[Any], timeout: Optional[float] = 120) -> List[Any]:
+        """Receipts of every hash, in order, waiting for them all concurrently"""
+        futures = [self.watch(tx_hash, timeout) for tx_hash in tx_hashes]
+        return [future.result() for future in futures]
+
+    async def wait_async(self, tx_hash: Any, timeout: Optional[float] = 120) -> Any:
+        """asyncio version of wait; the polling stays on the tracker's thread"""
+        return await asyncio.wrap_future(self.watch(tx_hash, timeout))
+
+    def poll(self) -> int:
+        """
+        One polling round
+
+        Returns:
+            Number of futures resolved
+        """
+        head = int(self.request_many([('eth_blockNumber', ())])[0], 16)
+        with self._lock:
+            watched = set(self.pending)
+            check = self.fresh & watched
+            self.fresh.clear()
+
+        matched: Set[str] = set()
+        if self.tip is None or head - self.tip > self.max_catchup:
+            check = watched
+        elif head > self.tip:
+            blocks = self.request_many([('eth_getBlockByNumber', (hex(number), False))
+                                        for number in range(self.tip + 1, head + 1)])
+            self.blocks_scanned += len(blocks)
+            for block in blocks:
+                if block is not None:
+                    matched |= watched.intersection(h.lower() for h in block['transactions'])
+        # A lower head means the node reorged or lagged; rescan from there next time
+        self.tip = head
+
+        check = sorted(check | matched)
+        if not check:
+            return 0
+
+        receipts = self.request_many([('eth_getTransactionReceipt', (h,)) for h in check])
+        self.receipts_requested += len(check)
+
+        resolved = 0
+        for tx_hash, receipt in zip(check, receipts):
+            if receipt is None:
+                if tx_hash in matched:
+                    # In a block but not indexed yet: ask again next round
+                    with self._lock:
+                        self.fresh.add(tx_hash)
+                continue
+            with self._lock:
+                entry = self.pending.pop(tx_hash, None)
+            if entry is not None and not entry[0].done():
+                entry[0].set_result(self.format_receipt(receipt))
+                resolved += 1
+        return resolved
+
+    def _expire(self):
+        now = time.monotonic()
+        with self._lock:
+            expired = [(tx_hash, future) for tx_hash, (future, deadline) in self.pending.items()
+                       if future.done() or (deadline is not None and deadline <= now)]
+            for tx_hash, _ in expired:
+                del self.pending[tx_hash]
+        for tx_hash, future in expired:
+            if not future.done():
+                future.set_exception(TimeoutError(f"Transaction {tx_hash} not mined in time"))
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.poll()
+            except Exception as e:
+                # Keep polling through transient RPC failures; timeouts still apply
+                self.last_error = e
+            self._expire()
+
+            with self._lock:
+                if not self.pending:
+                    self._thread = None
+                    return
+
+        with self._lock:
+            self._thread = None
+
+    def close(self):
+        """Stop polling and cancel every pending future"""
+        self._stop.set()
+        with self._lock:
+            pending, self.pending = self.pending, {}
+        for future, _ in pending.values():
+            future.cancel()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+JSON-RPC batch transport
+Queue several RPC calls and send them as one HTTP request
+"""
+
+import itertools
+import requests
+from typing import Any, List, Optional, Sequence, Union
+
+
+class BatchCall:
+    """Placeholder for one queued call; holds its result after flush"""
+
+    __slots__ = ('method', 'params', 'id', '_result', '_error', '_done')
+
+    def __init__(self, method: str, params: Sequence[Any], call_id: int):
+        self.method = method
+        self.params = list(params)
+        self.id = call_id
+        self._result = None
+        self._error = None
+        self._done = False
+
+    def payload(self) -> dict:
+        return {'jsonrpc': '2.0', 'id': self.id, 'method': self.method, 'params': self.params}
+
+    def resolve(self, response: dict):
+        self._done = True
+        self._error = response.get('error')
+        self._result = response.get('result')
+
+    @property
+    def result(self) -> Any:
+        """Raw JSON result; raises ValueError (as web3 does) on an RPC error"""
+        if not self._done:
+            raise RuntimeError(f"{self.method} has not been flushed yet")
+        if self._error is not None:
+            raise ValueError(self._error)
+        return self._result
+
+
+class RPCBatch:
+    """Collect JSON-RPC calls and flush them as a single batched POST"""
+
+    _ids = itertools.count(1)
+
+    def __init__(
+        self,
+        endpoint: Union[str, Any],
+        session: Optional[requests.Session] = None,
+        timeout: float = 30,
+        max_batch_size: int = 100
+    ):
+        """
+        Initialize batch
+
+        Args:
+            endpoint: HTTP JSON-RPC endpoint, or an rpc_router.RPCRouter to
+                spread batches across several endpoints
+            session: Shared requests.Session for connection reuse
+            timeout: Seconds per HTTP request
+            max_batch_size: Calls per POST; providers cap batch length
+        """
+        self.endpoint = endpoint
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.max_batch_size = max_batch_size
+        self.calls: List[BatchCall] = []
+
+    def add(self, method: str, *params: Any) -> BatchCall:
+        """
+        Queue a call
+
+        Args:
+            method: JSON-RPC method, e.g. 'eth_getBalance'
+            params: Positional JSON-RPC params
+
+        Returns:
+            BatchCall whose .result is available after flush()
+        """
+        call = BatchCall(method, params, next(self._ids))
+        self.calls.append(call)
+        return call
+
+    def flush(self) -> List[BatchCall]:
+        """
+        Send every queued call
+
+        Returns:
+            The flushed calls, in the order they were added
+        """
+        calls, self.calls = self.calls, []
+
+        for start in range(0, len(calls), self.max_batch_size):
+            chunk = calls[start:start + self.max_batch_size]
+            by_id = {call.id: call for call in chunk}
+
+            for response in self._post([call.payload() for call in chunk]):
+                call = by_id.pop(response.get('id'), None)
+                if call is not None:
+                    call.resolve(response)
+
+            # Endpoints without batch support answer with a single error
+            # object; replay whatever is left one call at a time
+            for call in by_id.values():
+                call.resolve(self._post(call.payload())[0])
+
+        return calls
+
+    def _post(self, payload) -> List[dict]:
+        if isinstance(self.endpoint, str):
+            response = self.session.post(self.endpoint, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+            body = response.json()
+        else:
+            body = self.endpoint.post(payload)
+        return body if isinstance(body, list) else [body]
+
+    def __enter__(self) -> 'RPCBatch':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+
+
+def hex_to_int(value: str) -> int:
+    """Decode a JSON-RPC quantity"""
+    return int(value, 16)
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Persistent JSON-RPC response cache
+Content-keyed SQLite cache that keeps finalized chain data forever and
+volatile answers for a few seconds
+"""
+
+import hashlib
+import json
+import math
+import sqlite3
+import time
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+
+# Blocks behind the head after which data is treated as final (two epochs)
+FINALITY_DEPTH = 64
+
+# Seconds volatile answers stay fresh
+SHORT_TTLS = {
+    'eth_blockNumber': 2,
+    'eth_gasPrice': 5,
+    'eth_maxPriorityFeePerGas': 5,
+    'eth_feeHistory': 5,
+}
+
+# Answers that depend only on the endpoint's chain
+CHAIN_CONSTANTS = {'eth_chainId', 'net_version'}
+
+# Answers that are final once their block is FINALITY_DEPTH behind the head
+HEAD_DEPENDENT = {'eth_getBlockByNumber', 'eth_getTransactionByHash', 'eth_getTransactionReceipt'}
+
+CACHEABLE = set(SHORT_TTLS) | CHAIN_CONSTANTS | HEAD_DEPENDENT | {'eth_getBlockByHash'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires REAL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_used);
+
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def cache_ttl(method: str, params: Sequence[Any], result: Any, head: Optional[int]) -> Optional[float]:
+    """
+    How long a response may be cached
+
+    Args:
+        method: JSON-RPC method
+        params: Call params
+        result: Response result
+        head: Known chain head, if any (a stale head only makes this stricter)
+
+    Returns:
+        Seconds to keep it (math.inf = forever), or None to not cache
+    """
+    if result is None:
+        return None
+    if method in CHAIN_CONSTANTS:
+        return math.inf
+    if method in SHORT_TTLS:
+        return SHORT_TTLS[method]
+
+    if method == 'eth_getBlockByHash':
+        return math.inf
+    if method == 'eth_getBlockByNumber':
+        tag = params[0]
+        if not isinstance(tag, str) or not tag.startswith('0x'):
+            return SHORT_TTLS['eth_blockNumber']  # latest / pending / safe / finalized
+        return _ttl_for_block(int(tag, 16), head)
+    if method in ('eth_getTransactionByHash', 'eth_getTransactionReceipt'):
+        if result.get('blockNumber') is None:
+            return None  # still pending
+        return _ttl_for_block(int(result['blockNumber'], 16), head)
+    return None
+
+
+def _ttl_for_block(number: int, head: Optional[int]) -> Optional[float]:
+    if head is not None and number <= head - FINALITY_DEPTH:
+        return math.inf
+    return SHORT_TTLS['eth_blockNumber']
+
+
+class RPCCache:
+    """Size-bounded, LRU-evicted SQLite store of JSON-RPC responses"""
+
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Open (or create) a cache
+
+        Args:
+            path: SQLite database file
+            max_bytes: Total stored response size before LRU eviction
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    @staticmethod
+    def key(namespace: str, method: str, params: Sequence[Any]) -> str:
+        """Content key of a call; namespace keeps endpoints/chains apart"""
+        raw = json.dumps([namespace, method, list(params)], sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Any:
+        """Cached result, or None on a miss or expired entry (null results are never stored)"""
+        return self.get_many([key])[0]
+
+    def get_many(self, keys: Sequence[str]) -> List[Any]:
+        """Cached results for several keys with one query per 500 keys"""
+        now = time.time()
+        rows = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows.update(
+                (key, value) for key, value, expires in self.conn.execute(
+                    f"SELECT key, value, expires FROM entries "
+                    f"WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                )
+                if expires is None or expires >= now
+            )
+
+        if rows:
+            with self.conn:
+                self.conn.executemany('UPDATE entries SET last_used = ? WHERE key = ?',
+                                      [(now, key) for key in rows])
+        self.hits += len(rows)
+        self.misses += len(keys) - len(rows)
+        return [json.loads(rows[key]) if key in rows else None for key in keys]
+
+    def put(self, key: str, result: Any, ttl: float = math.inf):
+        """Store a result; ttl=math.inf keeps it until evicted"""
+        self.put_many([(key, result, ttl)])
+
+    def put_many(self, items: Iterable[Tuple[str, Any, float]]):
+        """Store (key, result, ttl) triples in one transaction"""
+        now = time.time()
+        rows = []
+        for key, result, ttl in items:
+            value = json.dumps(result, separators=(',', ':'))
+            rows.append((key, value, None if ttl == math.inf else now + ttl, len(value), now))
+
+        with self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)', rows)
+        self._evict()
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones, until under max_bytes"""
+        with self.conn:
+            self.conn.execute('DELETE FROM entries WHERE expires IS NOT NULL AND expires < ?',
+                              (time.time(),))
+            total = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+            if total <= self.max_bytes:
+                return
+
+            excess = total - self.max_bytes
+            victims = []
+            for key, size in self.conn.execute('SELECT key, size FROM entries ORDER BY last_used'):
+                victims.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            self.conn.executemany('DELETE FROM entries WHERE key = ?', victims)
+
+    def stats(self) -> dict:
+        """Hit/miss counters (this process and lifetime) and current size"""
+        entries, size = self.conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries'
+        ).fetchone()
+        totals = dict(self.conn.execute('SELECT name, value FROM counters'))
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'total_hits': totals.get('hits', 0) + self.hits,
+            'total_misses': totals.get('misses', 0) + self.misses,
+            'entries': entries,
+            'bytes': size,
+        }
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self.conn:
+            self.conn.execute('DELETE FROM entries')
+            self.conn.execute('DELETE FROM counters')
+        self.hits = self.misses = 0
+
+    def close(self):
+        """Fold this process's counters into the lifetime totals and close"""
+        with self.conn:
+            for name, value in (('hits', self.hits), ('misses', self.misses)):
+                self.conn.execute(
+                    'INSERT INTO counters VALUES (?, ?) '
+                    'ON CONFLICT(name) DO UPDATE SET value = value + excluded.value',
+                    (name, value)
+                )
+        self.hits = self.misses = 0
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
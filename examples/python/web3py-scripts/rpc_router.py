@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Multi-endpoint RPC router
+Sends reads to the fastest healthy endpoint, hedges slow reads to a second
+one, and keeps writes pinned to a single endpoint
+"""
+
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import requests
+
+
+WRITE_METHODS = {'eth_sendRawTransaction', 'eth_sendTransaction'}
+
+# Filters live on the node that created them
+FILTER_METHODS = {'eth_newFilter', 'eth_newBlockFilter', 'eth_newPendingTransactionFilter',
+                  'eth_getFilterChanges', 'eth_getFilterLogs', 'eth_uninstallFilter'}
+
+PINNED_METHODS = WRITE_METHODS | FILTER_METHODS
+
+
+def is_pinned(payload: Union[dict, List[dict]]) -> bool:
+    """True if a request (or any call of a batch) must go to the pinned endpoint"""
+    for call in payload if isinstance(payload, list) else [payload]:
+        if call['method'] in PINNED_METHODS:
+            return True
+        # A pending nonce is only meaningful on the node the transaction goes to
+        if call['method'] == 'eth_getTransactionCount' and call['params'][-1:] == ['pending']:
+            return True
+    return False
+
+
+class EndpointStats:
+    """EWMA latency and error rate of one endpoint, plus a recent-latency sample"""
+
+    __slots__ = ('url', 'alpha', 'latency', 'error_rate', 'recent',
+                 'requests', 'failures_in_row', 'down_until')
+
+    def __init__(self, url: str, alpha: float = 0.2, sample_size: int = 50):
+        self.url = url
+        self.alpha = alpha
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.recent = deque(maxlen=sample_size)
+        self.requests = 0
+        self.failures_in_row = 0
+        self.down_until = 0.0
+
+    def record(self, seconds: float, ok: bool, cooldown: float = 30.0):
+        """Fold one request outcome into the averages"""
+        self.requests += 1
+        self.error_rate += self.alpha * ((0.0 if ok else 1.0) - self.error_rate)
+
+        if ok:
+            self.failures_in_row = 0
+            self.latency = seconds if self.latency is None else \
+                self.latency + self.alpha * (seconds - self.latency)
+            self.recent.append(seconds)
+        else:
+            self.failures_in_row += 1
+            if self.failures_in_row >= 3:
+                self.down_until = time.time() + cooldown
+
+    def p95(self, min_samples: int = 5) -> Optional[float]:
+        """95th percentile of recent successful latencies, once there are enough"""
+        if len(self.recent) < min_samples:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    @property
+    def healthy(self) -> bool:
+        return self.error_rate < 0.5 and self.down_until <= time.time()
+
+
+class RPCRouter:
+    """Route JSON-RPC requests across several endpoints of the same chain"""
+
+    _ids = itertools.count(1)
+
+    def __init__(
+        self,
+        endpoints: Sequence[str],
+        timeout: float = 10,
+        alpha: float = 0.2,
+        hedge: bool = True,
+        min_samples: int = 5,
+        write_endpoint: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        max_workers: int = 16
+    ):
+        """
+        Initialize router
+
+        Args:
+            endpoints: HTTP JSON-RPC endpoints serving the same chain
+            timeout: Seconds per HTTP request
+            alpha: EWMA weight of the newest latency / error sample
+            hedge: Send a read to a second endpoint once the first exceeds its p95
+            min_samples: Latencies needed before an endpoint's p95 is trusted
+            write_endpoint: Endpoint for writes and filters (default: the first one)
+            session: Shared requests.Session for connection reuse
+            max_workers: Requests in flight across all endpoints
+        """
+        if not endpoints:
+            raise ValueError("RPCRouter needs at least one endpoint")
+
+        self.endpoints = [EndpointStats(url, alpha) for url in endpoints]
+        self.write_endpoint = self._find(write_endpoint) if write_endpoint else self.endpoints[0]
+        self.timeout = timeout
+        self.hedge = hedge
+        self.min_samples = min_samples
+        self.session = session or requests.Session()
+        self.pool = ThreadPoolExecutor(max_workers=max_workers)
+        self.hedges = 0
+        self._lock = threading.Lock()
+
+    def _find(self, url: str) -> EndpointStats:
+        for endpoint in self.endpoints:
+            if endpoint.url == url:
+                return endpoint
+        raise ValueError(f"Unknown endpoint: {url}")
+
+    def ranked(self) -> List[EndpointStats]:
+        """
+        Endpoints in routing order
+
+        Healthy endpoints come first, fastest EWMA latency first; endpoints
+        without samples yet sort first so they get measured. Unhealthy ones
+        are kept as a last resort.
+        """
+        with self._lock:
+            return sorted(
+                self.endpoints,
+                key=lambda e: (not e.healthy, e.latency if e.latency is not None else 0.0)
+            )
+
+    def request(self, method: str, *params: Any) -> Any:
+        """
+        Single JSON-RPC call
+
+        Returns:
+            The raw JSON result; raises ValueError (as web3 does) on an RPC error
+        """
+        body = self.post({'jsonrpc': '2.0', 'id': next(self._ids), 'method': method,
+                          'params': list(params)})
+        if body.get('error') is not None:
+            raise ValueError(body['error'])
+        return body.get('result')
+
+    def post(self, payload: Union[dict, List[dict]]) -> Union[dict, List[dict]]:
+        """
+        Send a JSON-RPC request or batch and return the decoded response body
+
+        Writes, pending nonces and filter calls go to the write endpoint
+        only. Reads go to the best endpoint, are hedged to the next one after
+        its p95 latency, and fail over when an endpoint errors.
+        """
+        if is_pinned(payload):
+            return self._post_to(self.write_endpoint, payload)
+        return self._hedged(payload)
+
+    def _post_to(self, endpoint: EndpointStats, payload) -> Union[dict, List[dict]]:
+        start = time.perf_counter()
+        try:
+            response = self.session.post(endpoint.url, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+            body = response.json()
+        except Exception:
+            with self._lock:
+                endpoint.record(time.perf_counter() - start, ok=False)
+            raise
+
+        # JSON-RPC errors (reverts, bad params) are answers, not endpoint faults
+        with self._lock:
+            endpoint.record(time.perf_counter() - start, ok=True)
+        return body
+
+    def _hedged(self, payload):
+        candidates = self.ranked()
+        in_flight: Dict[Any, EndpointStats] = {}
+        errors = []
+        launched = 0
+
+        def launch():
+            nonlocal launched
+            endpoint = candidates[launched]
+            launched += 1
+            in_flight[self.pool.submit(self._post_to, endpoint, payload)] = endpoint
+
+        launch()
+        while in_flight:
+            hedge_after = None
+            if self.hedge and len(in_flight) == 1 and launched < len(candidates):
+                with self._lock:
+                    hedge_after = next(iter(in_flight.values())).p95(self.min_samples)
+
+            done, _ = wait(in_flight, timeout=hedge_after, return_when=FIRST_COMPLETED)
+            if not done:
+                # Slower than usual: race the next endpoint; the first answer wins
+                with self._lock:
+                    self.hedges += 1
+                launch()
+                continue
+
+            for future in done:
+                in_flight.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    errors.append(e)
+
+            if not in_flight and launched < len(candidates):
+                launch()
+
+        # Re-raise the last failure as-is so callers can still tell a 429 apart
+        raise errors[-1]
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-endpoint latency / error summary, in routing order"""
+        ranked = self.ranked()
+        with self._lock:
+            return [self._summary(endpoint) for endpoint in ranked]
+
+    def _summary(self, endpoint: EndpointStats) -> Dict[str, Any]:
+        p95 = endpoint.p95(self.min_samples)
+        return {
+            'url': endpoint.url,
+            'latency_ms': endpoint.latency * 1000 if endpoint.latency is not None else None,
+            'p95_ms': p95 * 1000 if p95 is not None else None,
+            'error_rate': endpoint.error_rate,
+            'requests': endpoint.requests,
+            'healthy': endpoint.healthy,
+        }
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+
+def web3_provider(router: RPCRouter):
+    """
+    web3 provider that sends every request through a router
+
+    Imports web3, so callers that only talk raw JSON-RPC never pay for it.
+    """
+    from web3.providers.base import JSONBaseProvider
+
+    class RouterProvider(JSONBaseProvider):
+        def make_request(self, method, params):
+            # web3's encoder knows HexBytes and friends; requests' json= does not
+            return router.post(json.loads(self.encode_rpc_request(method, params)))
+
+    provider = RouterProvider()
+    # Lets batch helpers (e.g. receipt_tracker) reach the router directly
+    provider.router = router
+    return provider
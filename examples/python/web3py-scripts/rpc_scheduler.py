@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+RPC request scheduler
+Token-bucket rate limiting, AIMD concurrency control and jittered
+exponential backoff shared by every RPC-heavy workload
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+
+RATE_LIMIT_MARKERS = (
+    'rate limit',
+    'rate exceeded',
+    'request rate',
+    'too many requests',
+    'throttl',
+    'capacity exceeded',
+)
+
+TRANSIENT_STATUS_CODES = {500, 502, 503, 504}
+
+
+def http_status(error: Exception) -> Optional[int]:
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None)
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """HTTP 429, or a JSON-RPC error saying the provider is throttling"""
+    if http_status(error) == 429:
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in RATE_LIMIT_MARKERS)
+
+
+def is_transient(error: Exception) -> bool:
+    """Dropped connections and gateway errors worth retrying as-is"""
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return True
+    return http_status(error) in TRANSIENT_STATUS_CODES
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Seconds from a Retry-After header, if the provider sent one"""
+    response = getattr(error, 'response', None)
+    value = getattr(response, 'headers', {}).get('Retry-After') if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def backoff_delay(attempt: int, base: float = 0.25, cap: float = 30.0) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2^attempt)]"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is free"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Initialize bucket
+
+        Args:
+            rate: Tokens added per second (requests per second)
+            burst: Bucket size (default: one second's worth)
+        """
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class AIMDLimiter:
+    """
+    Concurrency limit adjusted by additive increase / multiplicative decrease
+
+    Each success adds 1/limit, so the limit grows by about one per round of
+    requests; a throttle or a latency above target multiplies it by
+    `decrease`. Only one decrease applies per round: requests that started
+    before the last decrease cannot cut the limit again.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        decrease: float = 0.5,
+        latency_target: Optional[float] = None
+    ):
+        """
+        Initialize limiter
+
+        Args:
+            initial: Starting concurrency
+            min_limit: Floor of the limit
+            max_limit: Ceiling of the limit
+            decrease: Factor applied on a throttle
+            latency_target: Seconds; slower successes also count as congestion
+        """
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.in_flight = 0
+        self.last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> float:
+        """Wait for a slot; returns the start time to hand back on release"""
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+            return time.monotonic()
+
+    def release(self, started: float, throttled: bool = False, latency: Optional[float] = None):
+        with self._cond:
+            self.in_flight -= 1
+            congested = throttled or (
+                self.latency_target is not None and latency is not None
+                and latency > self.latency_target
+            )
+            if congested:
+                if started >= self.last_decrease:
+                    self.limit = max(self.min_limit, self.limit * self.decrease)
+                    self.last_decrease = time.monotonic()
+            elif latency is not None:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+
+class RequestScheduler:
+    """Run RPC calls under a rate limit and an adaptive concurrency limit, with retries"""
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        limiter: Optional[AIMDLimiter] = None,
+        max_retries: int = 6,
+        base_delay: float = 0.25,
+        max_delay: float = 30.0
+    ):
+        """
+        Initialize scheduler
+
+        Args:
+            rate: Requests per second allowed by the provider (None = unlimited)
+            burst: Token bucket size
+            limiter: Concurrency limiter (default: AIMDLimiter())
+            max_retries: Retries of a throttled or transient failure
+            base_delay: First backoff ceiling in seconds
+            max_delay: Largest backoff ceiling in seconds
+        """
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.limiter = limiter or AIMDLimiter()
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.completed = 0
+        self.throttled = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Call fn under the scheduler's limits
+
+        Rate-limit and transient failures are retried with jittered
+        exponential backoff (or the provider's Retry-After); anything else
+        is raised straight away.
+
+        Returns:
+            fn's result
+        """
+        attempt = 0
+        while True:
+            if self.bucket is not None:
+                self.bucket.acquire()
+
+            started = self.limiter.acquire()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                throttled = is_rate_limited(e)
+                self.limiter.release(started, throttled=throttled)
+                if not (throttled or is_transient(e)) or attempt >= self.max_retries:
+                    raise
+
+                with self._lock:
+                    self.throttled += throttled
+                    self.retries += 1
+                delay = retry_after(e)
+                time.sleep(delay if delay is not None else
+                           backoff_delay(attempt, self.base_delay, self.max_delay))
+                attempt += 1
+                continue
+
+            self.limiter.release(started, latency=time.monotonic() - started)
+            with self._lock:
+                self.completed += 1
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'concurrency': int(self.limiter.limit),
+            'completed': self.completed,
+            'throttled': self.throttled,
+            'retries': self.retries,
+        }
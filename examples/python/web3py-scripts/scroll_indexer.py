@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+EchoScroll Indexer
+Materializes EchoScroll state locally from ScrollPublished / ScrollDeleted logs
+"""
+
+from bisect import bisect_left, insort
+from event_listener import EventListener
+from log_decoder import LogDecoder
+import json
+import os
+import time
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+
+ECHOSCROLL_EVENTS_ABI = json.loads('''[
+    {
+        "anonymous": false,
+        "inputs": [
+            {"indexed": true, "name": "id", "type": "uint256"},
+            {"indexed": true, "name": "author", "type": "address"},
+            {"indexed": false, "name": "ipfsHash", "type": "string"},
+            {"indexed": false, "name": "title", "type": "string"},
+            {"indexed": false, "name": "timestamp", "type": "uint256"}
+        ],
+        "name": "ScrollPublished",
+        "type": "event"
+    },
+    {
+        "anonymous": false,
+        "inputs": [
+            {"indexed": true, "name": "id", "type": "uint256"},
+            {"indexed": true, "name": "author", "type": "address"},
+            {"indexed": false, "name": "timestamp", "type": "uint256"}
+        ],
+        "name": "ScrollDeleted",
+        "type": "event"
+    }
+]''')
+
+
+class Scroll:
+    """Indexed scroll, mirroring EchoScroll.Scroll without the spell hash"""
+
+    __slots__ = ('id', 'author', 'ipfs_hash', 'title', 'timestamp', 'active')
+
+    def __init__(self, id: int, author: str, ipfs_hash: str, title: str,
+                 timestamp: int, active: bool = True):
+        self.id = id
+        self.author = author
+        self.ipfs_hash = ipfs_hash
+        self.title = title
+        self.timestamp = timestamp
+        self.active = active
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class ScrollIndex:
+    """
+    In-memory EchoScroll indexes, updated one log at a time
+
+    active_ids reproduces the contract's activeScrollIds array exactly
+    (append on publish, swap-and-pop on delete), so active_page matches
+    getActiveScrollsPaginated.
+    """
+
+    def __init__(self):
+        self.scrolls: Dict[int, Scroll] = {}
+        self.active_ids: List[int] = []
+        self._active_slot: Dict[int, int] = {}
+        # author -> every scroll id, like authorScrolls
+        self.by_author: Dict[str, List[int]] = {}
+        # (timestamp, id) of active scrolls, ascending
+        self.feed_keys: List[Tuple[int, int]] = []
+        # (lowercased title, id) of active scrolls, ascending
+        self.title_keys: List[Tuple[str, int]] = []
+        # (block, logIndex) of the last applied log
+        self.position: Tuple[int, int] = (-1, -1)
+        # last block whose logs are all applied
+        self.block: int = -1
+
+    def apply(self, event_log) -> bool:
+        """
+        Apply a ScrollPublished / ScrollDeleted log
+
+        Logs at or before the current position are ignored, so replaying
+        an overlapping range after a snapshot is harmless.
+
+        Args:
+            event_log: log_decoder.LogRecord or web3 event log
+
+        Returns:
+            True if the log changed the index
+        """
+        event, args, position = _unpack(event_log)
+        if position <= self.position:
+            return False
+        self.position = position
+
+        if event == 'ScrollPublished':
+            self._publish(Scroll(args['id'], args['author'].lower(), args['ipfsHash'],
+                                 args['title'], args['timestamp']))
+            return True
+        if event == 'ScrollDeleted':
+            return self._delete(args['id'])
+        return False
+
+    def apply_page(self, event_logs: Iterable, through_block: int) -> int:
+        """Apply a page of logs and mark every block up to through_block as done"""
+        applied = sum(self.apply(event_log) for event_log in event_logs)
+        self.block = max(self.block, through_block)
+        return applied
+
+    def _publish(self, scroll: Scroll):
+        self.scrolls[scroll.id] = scroll
+        self.by_author.setdefault(scroll.author, []).append(scroll.id)
+        self._active_slot[scroll.id] = len(self.active_ids)
+        self.active_ids.append(scroll.id)
+        insort(self.feed_keys, (scroll.timestamp, scroll.id))
+        insort(self.title_keys, (scroll.title.lower(), scroll.id))
+
+    def _delete(self, scroll_id: int) -> bool:
+        scroll = self.scrolls.get(scroll_id)
+        if scroll is None or not scroll.active:
+            return False
+        scroll.active = False
+
+        # Same swap-and-pop as EchoScroll._removeFromActiveScrolls
+        slot = self._active_slot.pop(scroll_id)
+        last = self.active_ids.pop()
+        if last != scroll_id:
+            self.active_ids[slot] = last
+            self._active_slot[last] = slot
+
+        _remove_sorted(self.feed_keys, (scroll.timestamp, scroll_id))
+        _remove_sorted(self.title_keys, (scroll.title.lower(), scroll_id))
+        return True
+
+    def get(self, scroll_id: int) -> Optional[Scroll]:
+        """Like getScroll, but returns None for deleted or unknown ids"""
+        scroll = self.scrolls.get(scroll_id)
+        return scroll if scroll is not None and scroll.active else None
+
+    def active_page(self, offset: int, limit: int) -> Tuple[List[int], int]:
+        """Equivalent of getActiveScrollsPaginated(offset, limit) in O(limit)"""
+        return self.active_ids[offset:offset + limit], len(self.active_ids)
+
+    def scrolls_by_author(self, author: str, active_only: bool = True) -> List[int]:
+        """Equivalent of getActiveScrollsByAuthor / getScrollsByAuthor"""
+        ids = self.by_author.get(author.lower(), [])
+        if not active_only:
+            return list(ids)
+        return [scroll_id for scroll_id in ids if self.scrolls[scroll_id].active]
+
+    def feed(self, offset: int = 0, limit: int = 20, newest_first: bool = True) -> List[Scroll]:
+        """Active scrolls ordered by publish timestamp"""
+        if newest_first:
+            end = len(self.feed_keys) - offset
+            keys = self.feed_keys[max(0, end - limit):max(0, end)][::-1]
+        else:
+            keys = self.feed_keys[offset:offset + limit]
+        return [self.scrolls[scroll_id] for _, scroll_id in keys]
+
+    def search_title(self, prefix: str, limit: int = 20) -> List[Scroll]:
+        """Active scrolls whose title starts with prefix (case-insensitive)"""
+        prefix = prefix.lower()
+        start = bisect_left(self.title_keys, (prefix, -1))
+        matches = []
+        for title, scroll_id in self.title_keys[start:start + limit]:
+            if not title.startswith(prefix):
+                break
+            matches.append(self.scrolls[scroll_id])
+        return matches
+
+    def save(self, path: str):
+        """Write a snapshot atomically (temp file + rename)"""
+        snapshot = {
+            'block': self.block,
+            'position': list(self.position),
+            'active_ids': self.active_ids,
+            'scrolls': [scroll.as_dict() for scroll in self.scrolls.values()],
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'ScrollIndex':
+        """Rebuild an index from a snapshot"""
+        with open(path) as f:
+            snapshot = json.load(f)
+
+        index = cls()
+        for data in snapshot['scrolls']:
+            scroll = Scroll(**data)
+            index.scrolls[scroll.id] = scroll
+            index.by_author.setdefault(scroll.author, []).append(scroll.id)
+            if scroll.active:
+                index.feed_keys.append((scroll.timestamp, scroll.id))
+                index.title_keys.append((scroll.title.lower(), scroll.id))
+
+        index.feed_keys.sort()
+        index.title_keys.sort()
+        index.active_ids = snapshot['active_ids']
+        index._active_slot = {scroll_id: slot for slot, scroll_id in enumerate(index.active_ids)}
+        index.position = tuple(snapshot['position'])
+        index.block = snapshot['block']
+        return index
+
+
+def _unpack(event_log) -> Tuple[str, Dict[str, Any], Tuple[int, int]]:
+    """(event, args, (block, logIndex)) from a LogRecord or a web3 log"""
+    if hasattr(event_log, 'as_dict'):
+        return event_log.event, event_log.args(), (event_log.block_number, event_log.log_index)
+    return (event_log['event'], event_log['args'],
+            (event_log['blockNumber'], event_log['logIndex']))
+
+
+def _remove_sorted(keys: list, key: tuple):
+    position = bisect_left(keys, key)
+    if position < len(keys) and keys[position] == key:
+        del keys[position]
+
+
+class ScrollIndexer:
+    """Keep a ScrollIndex in sync with an EchoScroll contract"""
+
+    def __init__(
+        self,
+        listener: EventListener,
+        snapshot_path: Optional[str] = None,
+        deploy_block: int = 0
+    ):
+        """
+        Initialize indexer
+
+        Args:
+            listener: EventListener bound to the EchoScroll contract
+            snapshot_path: Snapshot file; loaded on start and rewritten after syncs
+            deploy_block: First block to scan when there is no snapshot
+        """
+        self.listener = listener
+        self.snapshot_path = snapshot_path
+        self.deploy_block = deploy_block
+        self.decoder = LogDecoder(ECHOSCROLL_EVENTS_ABI)
+
+        if snapshot_path and os.path.exists(snapshot_path):
+            self.index = ScrollIndex.load(snapshot_path)
+            print(f"✓ Loaded snapshot at block {self.index.block} "
+                  f"({len(self.index.active_ids)} active scrolls)")
+        else:
+            self.index = ScrollIndex()
+
+    def sync(self, to_block: Any = 'latest', chunk_size: int = 5000, confirmations: int = 2) -> int:
+        """
+        Replay logs after the index position up to to_block
+
+        The index position only moves forward and is saved in the
+        snapshot, so the sync stops `confirmations` blocks behind the head,
+        where a reorg can no longer orphan applied logs.
+
+        Args:
+            to_block: Last block to apply (or 'latest'); capped at the confirmed head
+            chunk_size: Initial blocks per getLogs window
+            confirmations: Blocks a log must be buried under before it is applied
+
+        Returns:
+            Number of logs that changed the index
+        """
+        start = max(self.deploy_block, self.index.block + 1)
+        head = self.listener.w3.eth.block_number
+        end = min(head if to_block == 'latest' else to_block, head - confirmations)
+        if start > end:
+            return 0
+
+        applied = 0
+        windows = self.listener.iter_log_windows(self.decoder, None, start, end, chunk_size)
+        for _, hi, records in windows:
+            applied += self.index.apply_page(records, hi)
+
+        if self.snapshot_path:
+            self.index.save(self.snapshot_path)
+        return applied
+
+    def follow(self, poll_interval: int = 12, confirmations: int = 2):
+        """
+        Keep syncing new blocks; stays `confirmations` behind the head
+
+        Args:
+            poll_interval: Seconds between syncs
+            confirmations: Blocks to stay behind the chain head
+        """
+        print("👀 Following EchoScroll events...")
+        try:
+            while True:
+                applied = self.sync(confirmations=confirmations)
+                if applied:
+                    print(f"   +{applied} changes, {len(self.index.active_ids)} active scrolls")
+                time.sleep(poll_interval)
+
+        except KeyboardInterrupt:
+            print("\n✓ Stopped following")
+
+
+def main():
+    """Example usage"""
+
+    RPC_URL = os.getenv('RPC_URL', 'https://sepolia.era.zksync.dev')
+    ECHOSCROLL_ADDRESS = os.getenv('ECHOSCROLL_ADDRESS', '0x' + '0' * 40)
+
+    try:
+        listener = EventListener(RPC_URL, ECHOSCROLL_ADDRESS, ECHOSCROLL_EVENTS_ABI)
+        indexer = ScrollIndexer(listener, snapshot_path='echoscroll_index.json')
+
+        print(f"✓ Applied {indexer.sync()} changes")
+
+        print("\nLatest scrolls:")
+        for scroll in indexer.index.feed(limit=5):
+            print(f"  #{scroll.id} {scroll.title} by {scroll.author}")
+
+        indexer.follow()
+
+    except Exception as e:
+        print(f"✗ Error: {e}")
+        raise
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Incremental Solidity Project Compiler
+Builds the import graph of a contracts directory and compiles each file
+with solc standard-JSON, only when its transitive inputs changed
+"""
+
+import glob
+import hashlib
+import os
+import posixpath
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from compile_cache import CompileCache, ensure_solc
+
+COMMENT_PATTERN = re.compile(r'//[^\n]*|/\*.*?\*/', re.S)
+IMPORT_PATTERN = re.compile(r'\bimport\s+(?:[^;]*?\bfrom\s+)?["\']([^"\']+)["\'][^;]*;')
+PRAGMA_PATTERN = re.compile(r'\bpragma\s+solidity\s+([^;]+);')
+
+OUTPUT_SELECTION = ['abi', 'evm.bytecode.object', 'evm.deployedBytecode.object']
+
+
+def parse_source(text: str) -> Tuple[List[str], Optional[str]]:
+    """
+    Imports and version pragma of a Solidity file
+
+    Returns:
+        (import paths as written, pragma constraint or None)
+    """
+    code = COMMENT_PATTERN.sub('', text)
+    pragma = PRAGMA_PATTERN.search(code)
+    return IMPORT_PATTERN.findall(code), pragma.group(1).strip() if pragma else None
+
+
+def resolve_import(importer: str, path: str, remappings: Dict[str, str]) -> str:
+    """
+    Source unit name of an import, as solc resolves it
+
+    Relative imports ('./', '../') are relative to the importing file;
+    anything else goes through the remappings, then from the project root.
+    """
+    if path.startswith(('./', '../')):
+        return posixpath.normpath(posixpath.join(posixpath.dirname(importer), path))
+    for prefix in sorted(remappings, key=len, reverse=True):
+        if path.startswith(prefix):
+            return remappings[prefix] + path[len(prefix):]
+    return path
+
+
+def select_version(pragmas: Sequence[str], versions: Sequence[Any]) -> Optional[Any]:
+    """Newest version satisfying every pragma, or None"""
+    from solcx.install import select_pragma_version
+
+    matching = [v for v in versions if all(select_pragma_version(p, [v]) for p in pragmas)]
+    return max(matching) if matching else None
+
+
+def _compile_unit(version: str, standard_input: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker: run one standard-JSON compilation"""
+    from solcx import compile_standard
+
+    return compile_standard(standard_input, solc_version=version)
+
+
+class SolcProject:
+    """A directory of Solidity files compiled file by file, incrementally"""
+
+    def __init__(
+        self,
+        root: str,
+        remappings: Optional[Dict[str, str]] = None,
+        optimize: bool = False,
+        optimize_runs: int = 200,
+        evm_version: Optional[str] = None,
+        cache: Optional[CompileCache] = None,
+        versions: Optional[Sequence[Any]] = None,
+        workers: Optional[int] = None
+    ):
+        """
+        Initialize project (nothing is read until compile)
+
+        Args:
+            root: Directory whose *.sol files (recursively) are the project
+            remappings: Import prefix -> path under root, e.g.
+                {'@openzeppelin/': 'node_modules/@openzeppelin/'}
+            optimize: Enable the solc optimizer
+            optimize_runs: Optimizer runs
+            evm_version: Target EVM (default: the compiler's)
+            cache: Artifact cache (default: on-disk CompileCache)
+            versions: solc versions to choose from (default: installed ones,
+                then installable ones when no installed version fits)
+            workers: Compiler processes (default: CPU count)
+        """
+        self.root = os.path.abspath(root)
+        self.remappings = remappings or {}
+        self.settings: Dict[str, Any] = {
+            'optimizer': {'enabled': optimize, 'runs': optimize_runs},
+        }
+        if evm_version:
+            self.settings['evmVersion'] = evm_version
+        self.cache = cache or CompileCache()
+        self.versions = versions
+        self.workers = workers or os.cpu_count() or 1
+        self.sources: Dict[str, str] = {}
+        self.graph: Dict[str, Set[str]] = {}
+        self.pragmas: Dict[str, Optional[str]] = {}
+        self.compiled: List[str] = []
+
+    def load(self):
+        """Read every source file and build the import graph"""
+        self.sources, self.graph, self.pragmas = {}, {}, {}
+        pattern = os.path.join(self.root, '**', '*.sol')
+        queue = [os.path.relpath(path, self.root).replace(os.sep, '/')
+                 for path in sorted(glob.glob(pattern, recursive=True))]
+
+        # Remapped imports may point outside the glob (e.g. node_modules)
+        while queue:
+            unit = queue.pop()
+            if unit in self.sources:
+                continue
+            path = os.path.join(self.root, *unit.split('/'))
+            if not os.path.isfile(path):
+                raise FileNotFoundError(f"Source not found: {unit}")
+            with open(path) as f:
+                self.sources[unit] = f.read()
+
+            imports, self.pragmas[unit] = parse_source(self.sources[unit])
+            self.graph[unit] = {resolve_import(unit, imp, self.remappings) for imp in imports}
+            queue.extend(self.graph[unit] - self.sources.keys())
+
+    def dependencies(self, unit: str) -> Set[str]:
+        """unit plus everything it imports, transitively (cycles allowed)"""
+        seen = {unit}
+        stack = [unit]
+        while stack:
+            for dep in self.graph[stack.pop()]:
+                if dep not in seen:
+                    seen.add(dep)
+                    stack.append(dep)
+        return seen
+
+    def _available_versions(self) -> List[Any]:
+        if self.versions is not None:
+            return list(self.versions)
+        from solcx import get_installed_solc_versions
+        return get_installed_solc_versions()
+
+    def _version_for(self, unit: str, deps: Set[str], installed: List[Any]) -> str:
+        pragmas = [self.pragmas[dep] for dep in sorted(deps) if self.pragmas[dep]]
+        version = select_version(pragmas, installed)
+        if version is None and self.versions is None:
+            from solcx import get_installable_solc_versions
+            version = select_version(pragmas, get_installable_solc_versions())
+        if version is None:
+            raise ValueError(f"No solc version satisfies {unit}: {' and '.join(pragmas)}")
+        return str(version)
+
+    def standard_input(self, unit: str, deps: Set[str]) -> Dict[str, Any]:
+        """Standard-JSON input compiling `unit` with its imports, asking output for unit only"""
+        return {
+            'language': 'Solidity',
+            'sources': {dep: {'content': self.sources[dep]} for dep in sorted(deps)},
+            'settings': {
+                **self.settings,
+                'outputSelection': {unit: {'*': OUTPUT_SELECTION}},
+            },
+        }
+
+    def compile(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Compile every file whose transitive inputs changed; load the rest from the cache
+
+        Each file is one unit: its own source plus everything it imports,
+        keyed by the hashes of all of them, the chosen solc version and the
+        settings. Units that miss the cache run on a process pool, each with
+        the newest solc satisfying every pragma in its import closure.
+
+        Returns:
+            {'path/File.sol:Contract': {'abi', 'bin', 'bin-runtime'}} for every
+            contract of the project
+        """
+        self.load()
+        installed = self._available_versions()
+
+        units = {}
+        for unit in sorted(self.sources):
+            deps = self.dependencies(unit)
+            version = self._version_for(unit, deps, installed)
+            digest = hashlib.sha256(''.join(
+                f"{dep}\0{self.sources[dep]}\0" for dep in sorted(deps)
+            ).encode()).hexdigest()
+            units[unit] = (deps, version, self.cache.key(digest, version, self.settings))
+
+        artifacts: Dict[str, Dict[str, Any]] = {}
+        misses = {}
+        for unit, (deps, version, key) in units.items():
+            cached = self.cache.get(key)
+            if cached is None:
+                misses[unit] = (deps, version, key)
+            else:
+                artifacts[unit] = cached
+
+        # Install what is missing up front so workers never race on an install
+        for version in sorted({version for _, version, _ in misses.values()}):
+            ensure_solc(version)
+
+        self.compiled = sorted(misses)
+        if self.workers == 1 or len(misses) <= 1:
+            outputs = {unit: _compile_unit(version, self.standard_input(unit, deps))
+                       for unit, (deps, version, _) in misses.items()}
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                futures = {unit: pool.submit(_compile_unit, version, self.standard_input(unit, deps))
+                           for unit, (deps, version, _) in misses.items()}
+                outputs = {unit: future.result() for unit, future in futures.items()}
+
+        for unit, output in outputs.items():
+            artifacts[unit] = {
+                f"{unit}:{name}": {
+                    'abi': contract['abi'],
+                    'bin': contract['evm']['bytecode']['object'],
+                    'bin-runtime': contract['evm']['deployedBytecode']['object'],
+                }
+                for name, contract in output.get('contracts', {}).get(unit, {}).items()
+            }
+            self.cache.put(units[unit][2], artifacts[unit])
+
+        return {name: contract for unit in sorted(artifacts)
+                for name, contract in artifacts[unit].items()}
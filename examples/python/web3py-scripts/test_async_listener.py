@@ -0,0 +1,92 @@
+"""
+Tests for async event listener
+"""
+import asyncio
+from unittest.mock import AsyncMock, Mock
+from async_listener import AsyncEventListener
+from conftest import ERC20_ABI, CONTRACT_ADDRESS
+
+
+def make_listener(batches, queue_size=2):
+    """Listener on a mocked HTTP AsyncWeb3 whose filter yields `batches`"""
+    listener = AsyncEventListener('http://localhost:8545', CONTRACT_ADDRESS, ERC20_ABI,
+                                  queue_size=queue_size)
+    listener.w3 = Mock()
+    listener.w3.eth.filter = AsyncMock(return_value='0x1')
+    listener.w3.eth.uninstall_filter = AsyncMock(return_value=True)
+
+    async def get_filter_changes(filter_id):
+        if batches:
+            return batches.pop(0)
+        # Give consumers time to drain, then stop the watcher
+        await asyncio.sleep(0.1)
+        raise asyncio.CancelledError
+
+    listener.w3.eth.get_filter_changes = get_filter_changes
+
+    event = Mock()
+    event.process_log = lambda raw: raw
+    listener.contract = Mock()
+    listener.contract.events.Transfer.return_value = event
+    return listener
+
+
+class TestAsyncEventListener:
+    """Test async watching without a node"""
+
+    def test_filter_targets_event_topic(self):
+        listener = AsyncEventListener('wss://node', CONTRACT_ADDRESS, ERC20_ABI)
+
+        log_filter = listener._log_filter('Transfer')
+
+        assert listener.is_websocket
+        assert log_filter['topics'] == [
+            '0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef'
+        ]
+
+    def test_polling_delivers_all_logs_in_order(self, monkeypatch):
+        monkeypatch.setattr('async_listener.log_entry_formatter', lambda raw: raw)
+        logs = [{'logIndex': i} for i in range(10)]
+        listener = make_listener([logs[:4], logs[4:]])
+        seen = []
+
+        async def callback(event_log):
+            await asyncio.sleep(0.001)
+            seen.append(event_log['logIndex'])
+
+        async def run():
+            try:
+                await listener.watch_event('Transfer', callback, poll_interval=0)
+            except asyncio.CancelledError:
+                pass
+
+        asyncio.run(run())
+
+        assert seen == list(range(10))
+        assert listener.w3.eth.uninstall_filter.await_count == 1
+
+    def test_slow_callback_applies_backpressure(self, monkeypatch):
+        monkeypatch.setattr('async_listener.log_entry_formatter', lambda raw: raw)
+        listener = make_listener([[{'logIndex': i} for i in range(20)]], queue_size=2)
+        depths = []
+        original_put = asyncio.Queue.put
+
+        async def tracking_put(queue, item):
+            await original_put(queue, item)
+            depths.append(queue.qsize())
+
+        monkeypatch.setattr(asyncio.Queue, 'put', tracking_put)
+
+        async def callback(event_log):
+            await asyncio.sleep(0.001)
+
+        async def run():
+            try:
+                await listener.watch_event('Transfer', callback, poll_interval=0)
+            except asyncio.CancelledError:
+                pass
+
+        asyncio.run(run())
+
+        assert len(depths) == 20
+        assert max(depths) <= 2
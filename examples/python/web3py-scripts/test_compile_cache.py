@@ -0,0 +1,56 @@
+"""
+Tests for the Solidity compilation cache
+"""
+import time
+from unittest.mock import patch
+from compile_cache import CompileCache, ensure_solc
+
+SOURCE = '''
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+contract Counter { uint256 public count; }
+'''
+
+ARTIFACTS = {'<stdin>:Counter': {'abi': [{'type': 'function', 'name': 'count'}], 'bin': '6080'}}
+
+
+class TestCompileCache:
+    """Test cache keys, hits and misses without a real solc"""
+
+    @patch('solcx.get_installed_solc_versions', return_value=['0.8.20'])
+    @patch('solcx.compile_source', return_value=ARTIFACTS)
+    def test_unchanged_source_is_a_hit(self, compile_source, _installed, tmp_path):
+        cache = CompileCache(str(tmp_path))
+        assert cache.compile_source(SOURCE) == ARTIFACTS
+
+        start = time.perf_counter()
+        assert cache.compile_source(SOURCE) == ARTIFACTS
+        assert time.perf_counter() - start < 0.05
+
+        compile_source.assert_called_once()
+        assert cache.stats() == {'hits': 1, 'misses': 1}
+        # A fresh process sees the artifacts on disk
+        assert CompileCache(str(tmp_path)).compile_source(SOURCE) == ARTIFACTS
+
+    @patch('solcx.get_installed_solc_versions', return_value=['0.8.20', '0.8.19'])
+    @patch('solcx.compile_source', return_value=ARTIFACTS)
+    def test_source_version_and_settings_are_keyed(self, compile_source, _installed, tmp_path):
+        cache = CompileCache(str(tmp_path))
+        cache.compile_source(SOURCE)
+        cache.compile_source(SOURCE + '\n// edited')
+        cache.compile_source(SOURCE, '0.8.19')
+        cache.compile_source(SOURCE, optimize=True)
+        cache.compile_source(SOURCE, optimize=True)
+
+        assert compile_source.call_count == 4
+        assert cache.stats() == {'hits': 1, 'misses': 4}
+
+    @patch('solcx.install_solc')
+    def test_installed_solc_is_not_reinstalled(self, install_solc):
+        with patch('solcx.get_installed_solc_versions', return_value=['0.8.20']):
+            ensure_solc('0.8.20')
+        install_solc.assert_not_called()
+
+        with patch('solcx.get_installed_solc_versions', return_value=[]):
+            ensure_solc('0.8.20')
+        install_solc.assert_called_once_with('0.8.20')
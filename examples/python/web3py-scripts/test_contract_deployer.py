@@ -2,6 +2,7 @@
 Tests for contract deployer
 """
 import pytest
+from concurrent.futures import Future
 from unittest.mock import Mock, patch
 from contract_deployer import ContractDeployer
 
@@ -49,3 +50,185 @@ class TestContractDeployer:
 
         # Mock compilation for testing
         assert len(contract_source) > 0
+
+
+class FakeReceipts:
+    """Receipt tracker stand-in: receipt(tx_hash) returns a receipt or None (never mined)"""
+
+    def __init__(self, receipt):
+        self.receipt = receipt
+        self.watched = []
+
+    def watch(self, tx_hash, timeout=None):
+        self.watched.append(tx_hash)
+        future = Future()
+        receipt = self.receipt(tx_hash)
+        if receipt is not None:
+            future.set_result(receipt)
+        return future
+
+
+def make_deployer(mock_web3):
+    """Deployer over a mocked node: pending/latest nonce 5, chain 1, 1 gwei gas"""
+    w3 = mock_web3.return_value
+    w3.is_connected.return_value = True
+    w3.eth.get_transaction_count.return_value = 5
+    w3.eth.chain_id = 1
+    w3.eth.gas_price = 10 ** 9
+    w3.eth.contract.return_value.constructor.return_value.build_transaction.side_effect = dict
+    w3.eth.account.sign_transaction.side_effect = lambda tx, private_key: Mock(rawTransaction=tx)
+    return ContractDeployer('http://localhost:8545', '0x' + '11' * 32), w3
+
+
+class TestDeployBatch:
+    """Test pipelined batch deployment against a mocked node"""
+
+    INTERFACE = {'abi': [], 'bin': '0x6080'}
+
+    @patch('contract_deployer.Web3')
+    def test_sends_back_to_back_with_local_nonces(self, mock_web3):
+        deployer, w3 = make_deployer(mock_web3)
+        sent = []
+        w3.eth.send_raw_transaction.side_effect = lambda raw: sent.append(raw) or bytes([raw['nonce']])
+        deployer.receipts = FakeReceipts(lambda h: Mock(status=1, contractAddress=f"0xC{h[0]}"))
+
+        addresses = deployer.deploy_batch([(self.INTERFACE, (i,)) for i in range(3)],
+                                          fee_speed=None, poll_interval=0)
+
+        assert [tx['nonce'] for tx in sent] == [5, 6, 7]
+        assert addresses == ['0xC5', '0xC6', '0xC7']
+        # Fees and chain id are read once for the whole batch
+        assert w3.eth.get_transaction_count.call_count == 1
+        assert deployer.nonces.reserve() == 8
+
+    @patch('contract_deployer.Web3')
+    def test_replaces_dropped_transaction(self, mock_web3):
+        from web3.exceptions import TransactionNotFound
+
+        deployer, w3 = make_deployer(mock_web3)
+        sent = []
+
+        def send(raw):
+            sent.append(raw)
+            return bytes([len(sent)])
+
+        # The first send of nonce 6 (hash 2) vanished from the mempool
+        deployer.receipts = FakeReceipts(
+            lambda h: None if h == bytes([2]) else Mock(status=1, contractAddress=f"0xC{h[0]}"))
+        w3.eth.send_raw_transaction.side_effect = send
+        w3.eth.get_transaction.side_effect = TransactionNotFound('dropped')
+
+        addresses = deployer.deploy_batch([(self.INTERFACE, ()) for _ in range(3)],
+                                          fee_speed=None, poll_interval=0, replace_after=0)
+
+        assert addresses == ['0xC1', '0xC4', '0xC3']
+        assert sent[3]['nonce'] == 6
+        assert sent[3]['gasPrice'] > sent[1]['gasPrice']
+        assert deployer.receipts.watched == [bytes([1]), bytes([2]), bytes([3]), bytes([4])]
+
+    @patch('contract_deployer.Web3')
+    def test_resends_only_transaction_whose_nonce_was_taken(self, mock_web3):
+        from web3.exceptions import TransactionNotFound
+
+        deployer, w3 = make_deployer(mock_web3)
+        sent = []
+
+        def send(raw):
+            sent.append(raw)
+            return bytes([len(sent)])
+
+        # Another transaction from the account took nonce 6, so hash 2 never mines
+        deployer.receipts = FakeReceipts(
+            lambda h: None if h == bytes([2]) else Mock(status=1, contractAddress=f"0xC{h[0]}"))
+        w3.eth.send_raw_transaction.side_effect = send
+        w3.eth.get_transaction_count.side_effect = lambda address, tag: 5 if not sent else 8
+        w3.eth.get_transaction_receipt.side_effect = TransactionNotFound('not mined')
+
+        addresses = deployer.deploy_batch([(self.INTERFACE, ()) for _ in range(3)],
+                                          fee_speed=None, poll_interval=0)
+
+        assert addresses == ['0xC1', '0xC4', '0xC3']
+        assert [tx['nonce'] for tx in sent] == [5, 6, 7, 8]
+        # Same fees: a new nonce is not a replacement
+        assert sent[3]['gasPrice'] == sent[1]['gasPrice']
+        assert deployer.nonces.reserve() == 9
+
+    @patch('contract_deployer.Web3')
+    def test_mined_receipt_found_before_tracker_reports_it(self, mock_web3):
+        deployer, w3 = make_deployer(mock_web3)
+        sent = []
+        w3.eth.send_raw_transaction.side_effect = lambda raw: sent.append(raw) or bytes([raw['nonce']])
+        deployer.receipts = FakeReceipts(
+            lambda h: None if h == bytes([6]) else Mock(status=1, contractAddress=f"0xC{h[0]}"))
+        w3.eth.get_transaction_count.side_effect = lambda address, tag: 5 if not sent else 8
+        w3.eth.get_transaction_receipt.side_effect = lambda h: Mock(status=1, contractAddress='0xLate')
+
+        addresses = deployer.deploy_batch([(self.INTERFACE, ()) for _ in range(3)],
+                                          fee_speed=None, poll_interval=0)
+
+        assert addresses == ['0xC5', '0xLate', '0xC7']
+        assert len(sent) == 3
+
+
+class TestDeployManifest:
+    """Test idempotent manifest deployment against a mocked node"""
+
+    INTERFACE = {'abi': [], 'bin': '0x6080'}
+
+    def setup_deployer(self, mock_web3, code):
+        deployer, w3 = make_deployer(mock_web3)
+        w3.eth.contract.return_value.constructor.return_value.data_in_transaction = '0x6080'
+        w3.eth.send_raw_transaction.side_effect = lambda raw: bytes([raw['nonce']])
+        deployer.receipts = FakeReceipts(lambda h: Mock(status=1, contractAddress=f"0xC{h[0]}",
+                                                        transactionHash=h))
+        batches = []
+
+        def request_many(calls):
+            batches.append(list(calls))
+            return ['0x1'] + [code.get(params[0], '0x') for _, params in calls[1:]]
+
+        return deployer, w3, batches, request_many
+
+    @patch('contract_deployer.Web3')
+    def test_rerun_skips_deployed_contracts_in_one_batch(self, mock_web3, tmp_path):
+        from deploy_manifest import DETERMINISTIC_DEPLOYER, create2_address
+
+        path = str(tmp_path / 'deployment.json')
+        specs = [{'name': 'Plain', 'interface': self.INTERFACE},
+                 {'name': 'Salted', 'interface': self.INTERFACE, 'salt': 'v1'}]
+        salted = create2_address(DETERMINISTIC_DEPLOYER, 'v1', '0x6080')
+        code = {}
+        deployer, w3, batches, request_many = self.setup_deployer(mock_web3, code)
+
+        with patch('contract_deployer.web3_request_many', return_value=request_many):
+            first = deployer.deploy_manifest(specs, path, factory=DETERMINISTIC_DEPLOYER,
+                                             fee_speed=None, poll_interval=0)
+            assert first == {'Plain': '0xC5', 'Salted': salted}
+            assert w3.eth.send_raw_transaction.call_count == 2
+            salted_tx = w3.eth.send_raw_transaction.call_args_list[1][0][0]
+            assert salted_tx['to'] == DETERMINISTIC_DEPLOYER
+            assert salted_tx['data'].endswith('6080')
+
+            code.update({'0xC5': '0x60', salted: '0x60'})
+            batches.clear()
+            w3.eth.send_raw_transaction.reset_mock()
+            second = deployer.deploy_manifest(specs, path, factory=DETERMINISTIC_DEPLOYER,
+                                              fee_speed=None, poll_interval=0)
+
+        assert second == first
+        assert len(batches) == 1
+        assert sorted(params[0] for _, params in batches[0][1:]) == sorted(['0xC5', salted])
+        w3.eth.send_raw_transaction.assert_not_called()
+
+    @patch('contract_deployer.Web3')
+    def test_redeploys_when_recorded_address_has_no_code(self, mock_web3, tmp_path):
+        path = str(tmp_path / 'deployment.json')
+        specs = [{'name': 'Plain', 'interface': self.INTERFACE}]
+        deployer, w3, batches, request_many = self.setup_deployer(mock_web3, {})
+
+        with patch('contract_deployer.web3_request_many', return_value=request_many):
+            deployer.deploy_manifest(specs, path, fee_speed=None, poll_interval=0)
+            # e.g. a local devnet was restarted
+            deployer.deploy_manifest(specs, path, fee_speed=None, poll_interval=0)
+
+        assert w3.eth.send_raw_transaction.call_count == 2
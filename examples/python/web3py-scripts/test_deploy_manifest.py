@@ -0,0 +1,46 @@
+"""
+Tests for deployment manifest helpers
+"""
+import json
+from deploy_manifest import (
+    DETERMINISTIC_DEPLOYER, DeploymentManifest, create2_address, deployment_key, salt_bytes
+)
+
+
+def test_create2_address_matches_eip1014_vectors():
+    assert create2_address('0x' + '00' * 20, 0, '0x00') == '0x4D1A2e2bB4F88F0250f26Ffff098B0b30B26BF38'
+    assert create2_address('0xdeadbeef00000000000000000000000000000000', '0x' + '00' * 32,
+                           '0x00') == '0xB928f69Bb1D91Cd65274e3c79d8986362984fDA3'
+    assert create2_address('0xdeadbeef00000000000000000000000000000000', '0x000000000000000000000000feed'
+                           + '00' * 18, '0x00') == '0xD04116cDd17beBE565EB2422F2497E06cC1C9833'
+
+
+def test_salt_bytes_forms():
+    assert salt_bytes(1) == salt_bytes('0x01') == salt_bytes(b'\x01') == b'\0' * 31 + b'\x01'
+    assert len(salt_bytes('token-v1')) == 32
+    assert salt_bytes('token-v1') != salt_bytes('token-v2')
+
+
+def test_deployment_key_identity():
+    key = deployment_key(1, '0x6080', ('MyToken', 1000, b'\x01'))
+    assert key == deployment_key(1, '6080', ['MyToken', 1000, '0x01'])
+    assert key != deployment_key(5, '0x6080', ('MyToken', 1000, b'\x01'))
+    assert key != deployment_key(1, '0x6080', ('MyToken', 1001, b'\x01'))
+    assert deployment_key(1, '0x6080', (), 'a', DETERMINISTIC_DEPLOYER) == \
+        deployment_key(1, '0x6080', (), 'a', DETERMINISTIC_DEPLOYER.lower())
+
+
+def test_manifest_round_trip(tmp_path):
+    path = str(tmp_path / 'deployment.json')
+    manifest = DeploymentManifest(path)
+    assert manifest.deployments == {}
+
+    manifest.record('k1', {'name': 'A', 'chainId': 1, 'address': '0xA', 'txHash': b'\xab'})
+    manifest.record('k2', {'name': 'B', 'chainId': 5, 'address': '0xB', 'txHash': None})
+    manifest.save()
+
+    reloaded = DeploymentManifest(path)
+    assert reloaded.get('k1')['txHash'] == '0xab'
+    assert [entry['name'] for entry in reloaded.for_chain(5)] == ['B']
+    assert json.load(open(path))['version'] == 1
+    assert list(tmp_path.iterdir()) == [tmp_path / 'deployment.json']
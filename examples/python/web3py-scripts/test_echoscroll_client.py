@@ -0,0 +1,149 @@
+"""
+Tests for the EchoScroll client
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from eth_abi import decode, encode
+from echoscroll_client import ABIFunction, EchoScrollClient, MULTICALL3_AGGREGATE3_ABI, _functions, ECHOSCROLL_ABI
+
+ECHOSCROLL = '0x' + 'ec' * 20
+MULTICALL = '0x' + 'ca' * 20
+AUTHOR = '0x' + 'aa' * 20
+
+
+class FakeNode:
+    """request_many over an in-memory EchoScroll (and Multicall3) contract"""
+
+    def __init__(self, active_ids, max_batch=None):
+        self.active_ids = list(active_ids)
+        self.deleted = set()
+        self.max_batch = max_batch
+        self.requests = []
+        self.functions = {function.selector: function for function in _functions(ECHOSCROLL_ABI).values()}
+        self.aggregate3 = ABIFunction(MULTICALL3_AGGREGATE3_ABI)
+
+    def execute(self, data):
+        function = self.functions[data[:4]]
+        args = decode(function.input_types, data[4:])
+        if function.name == 'getActiveScrollCount':
+            result = (len(self.active_ids),)
+        elif function.name == 'getActiveScrollsPaginated':
+            offset, limit = args
+            result = (self.active_ids[offset:offset + limit], len(self.active_ids))
+        else:
+            (ids,) = args
+            if self.max_batch is not None and len(ids) > self.max_batch:
+                raise ValueError('out of gas: gas required exceeds allowance')
+            result = ([(i, AUTHOR, f'Qm{i}', b'\0' * 32, 1000 + i, True, f'Scroll {i}')
+                       if i in self.active_ids and i not in self.deleted
+                       else (0, '0x' + '00' * 20, '', b'\0' * 32, 0, False, '')
+                       for i in ids],)
+        return encode(function.output_types, result)
+
+    def __call__(self, calls):
+        self.requests.append(list(calls))
+        results = []
+        for method, params in calls:
+            if method == 'eth_blockNumber':
+                results.append('0x64')
+                continue
+            call, _ = params
+            data = bytes.fromhex(call['data'][2:])
+            if call['to'] == MULTICALL:
+                (inner,) = decode(self.aggregate3.input_types, data[4:])
+                returned = [(True, self.execute(item[2])) for item in inner]
+                results.append('0x' + encode(self.aggregate3.output_types, (returned,)).hex())
+            else:
+                results.append('0x' + self.execute(data).hex())
+        return results
+
+    def eth_calls(self):
+        return [params for calls in self.requests for method, params in calls if method == 'eth_call']
+
+
+def test_feed_page_costs_two_calls_and_skips_deleted():
+    node = FakeNode(range(1, 251))
+    node.deleted.add(3)
+    client = EchoScrollClient(node, ECHOSCROLL)
+
+    scrolls, total = client.feed(0, 100)
+
+    assert total == 250
+    assert [scroll.id for scroll in scrolls] == [i for i in range(1, 101) if i != 3]
+    assert scrolls[0].title == 'Scroll 1' and scrolls[0].author == AUTHOR
+    assert client.eth_calls == 2 and len(node.requests) == 2
+
+
+def test_batch_size_shrinks_under_gas_cap():
+    node = FakeNode(range(1, 101), max_batch=30)
+    client = EchoScrollClient(node, ECHOSCROLL, batch_size=100)
+
+    scrolls = client.get_scrolls(list(range(1, 101)))
+
+    assert [scroll.id for scroll in scrolls] == list(range(1, 101))
+    assert client.window.size <= 30
+    # Each call of the successful round stays under the cap
+    assert len(node.requests[-1]) == -(-100 // client.window.size)
+
+    # Later reads start from the size that worked instead of retrying the cap
+    node.requests.clear()
+    client.get_scrolls(list(range(1, 101)))
+    assert len(node.requests) == 1
+
+
+def test_concurrent_rejections_shrink_once():
+    node = FakeNode(range(1, 201), max_batch=60)
+    client = EchoScrollClient(node, ECHOSCROLL, batch_size=100)
+    # Both reads are in flight at size 100 before either sees the rejection
+    barrier = threading.Barrier(2, timeout=5)
+    first_round = [0]
+    lock = threading.Lock()
+
+    def request_many(calls):
+        with lock:
+            first_round[0] += 1
+            waits = first_round[0] <= 2
+        if waits:
+            barrier.wait()
+        return node(calls)
+
+    client.request_many = request_many
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        reads = [pool.submit(client.get_scrolls, ids) for ids in (range(1, 101), range(101, 201))]
+        results = [read.result() for read in reads]
+
+    assert [scroll.id for scroll in results[0] + results[1]] == list(range(1, 201))
+    assert client.window.size == 50 and client.window.max_size == 50
+    # Counted once per successful round: two calls of 50 ids per read
+    assert client.eth_calls == 4
+
+
+def test_error_other_than_limits_is_raised():
+    def failing(calls):
+        raise ValueError('execution reverted')
+
+    with pytest.raises(ValueError, match='reverted'):
+        EchoScrollClient(failing, ECHOSCROLL).get_scrolls([1, 2])
+
+
+@pytest.mark.parametrize('multicall', [None, MULTICALL])
+def test_iter_active_scrolls_in_order_at_one_block(multicall):
+    node = FakeNode(range(500, 0, -1))
+    client = EchoScrollClient(node, ECHOSCROLL, multicall=multicall, concurrency=3)
+
+    ids = [scroll.id for scroll in client.iter_active_scrolls(page_size=40, pages_per_call=3)]
+
+    assert ids == list(range(500, 0, -1))
+    assert {block for _, block in node.eth_calls()} == {'0x64'}
+
+
+def test_multicall_bundles_page_reads():
+    node = FakeNode(range(1, 121))
+    client = EchoScrollClient(node, ECHOSCROLL, multicall=MULTICALL)
+
+    pages = client.active_pages([0, 40, 80], 40)
+
+    assert [len(ids) for ids, _ in pages] == [40, 40, 40]
+    assert [call['to'] for call, _ in node.eth_calls()] == [MULTICALL]
@@ -0,0 +1,140 @@
+"""
+Tests for event listener
+"""
+import pytest
+from unittest.mock import PropertyMock
+from event_listener import AdaptiveWindow
+from conftest import ERC20_ABI, FakeGetLogs
+
+
+class TestAdaptiveWindow:
+    """Test window sizing"""
+
+    def test_shrink_and_grow(self):
+        window = AdaptiveWindow(100, min_size=10, max_size=400, target_results=100)
+
+        window.shrink()
+        assert window.size == 50
+
+        window.observe(10)
+        window.observe(10)
+        window.observe(10)
+        assert window.size == 400
+
+    def test_large_response_keeps_size(self):
+        window = AdaptiveWindow(100, target_results=100)
+        window.observe(90)
+        assert window.size == 100
+
+
+class TestBackfill:
+    """Test chunked historical backfill"""
+
+    def test_single_request_without_chunk_size(self, listener):
+        get_logs = FakeGetLogs(max_span=10 ** 6)
+        listener.contract.events.Transfer.get_logs = get_logs
+
+        listener.get_past_events('Transfer', from_block=0, to_block=99)
+
+        assert get_logs.calls == [(0, 99)]
+
+    def test_windows_cover_range_in_order(self, listener):
+        get_logs = FakeGetLogs(max_span=10 ** 6)
+        listener.contract.events.Transfer.get_logs = get_logs
+
+        events = listener.get_past_events('Transfer', from_block=0, to_block=499,
+                                          chunk_size=50, max_workers=4)
+
+        assert len(events) == 1000
+        assert events == sorted(events, key=lambda e: (e['blockNumber'], e['logIndex']))
+        covered = sorted(b for lo, hi in get_logs.calls for b in range(lo, hi + 1))
+        assert covered == list(range(500))
+
+    def test_windows_shrink_on_too_many_results(self, listener):
+        get_logs = FakeGetLogs(max_span=8)
+        listener.contract.events.Transfer.get_logs = get_logs
+
+        events = listener.get_past_events('Transfer', from_block=0, to_block=199,
+                                          chunk_size=64, max_workers=3)
+
+        assert [e['blockNumber'] for e in events[::2]] == list(range(200))
+
+    def test_negative_from_block_is_relative_to_latest(self, listener):
+        get_logs = FakeGetLogs(max_span=10 ** 6)
+        listener.contract.events.Transfer.get_logs = get_logs
+
+        events = listener.get_past_events('Transfer', from_block=-100, chunk_size=1000)
+
+        assert get_logs.calls == [(900, 1000)]
+        assert events[0]['blockNumber'] == 900
+
+    def test_other_errors_propagate(self, listener):
+        def failing(fromBlock, toBlock):
+            raise ValueError({'code': -32000, 'message': 'header not found'})
+
+        listener.contract.events.Transfer.get_logs = failing
+
+        with pytest.raises(ValueError):
+            listener.get_past_events('Transfer', from_block=0, to_block=10, chunk_size=5)
+
+
+class TestStreaming:
+    """Test page-by-page streaming"""
+
+    def test_pages_are_ordered_and_complete(self, listener):
+        listener.contract.events.Transfer.get_logs = FakeGetLogs(max_span=16)
+
+        pages = list(listener.iter_past_event_pages('Transfer', from_block=0, to_block=299,
+                                                    chunk_size=32, max_workers=4))
+
+        blocks = [e['blockNumber'] for page in pages for e in page[::2]]
+        assert blocks == list(range(300))
+
+    def test_prefetch_bounds_requests_ahead_of_consumer(self, listener):
+        get_logs = FakeGetLogs(max_span=10 ** 6)
+        listener.contract.events.Transfer.get_logs = get_logs
+
+        pages = listener.iter_past_event_pages('Transfer', from_block=0, to_block=9999,
+                                               chunk_size=10, max_workers=2, prefetch=2)
+        first = next(pages)
+        pages.close()
+
+        assert first[0]['blockNumber'] == 0
+        assert len(get_logs.calls) <= 2
+
+    def test_range_is_resolved_on_first_iteration(self, listener):
+        listener.contract.events.Transfer.get_logs = FakeGetLogs(max_span=10 ** 6)
+        block_number = PropertyMock(return_value=99)
+        type(listener.w3.eth).block_number = block_number
+
+        pages = listener.iter_past_event_pages('Transfer', from_block=0, chunk_size=50)
+        assert block_number.call_count == 0
+
+        assert [len(page) for page in pages] == [100, 100]
+        assert block_number.call_count == 1
+
+    def test_log_windows_resolve_range_on_first_iteration(self, listener):
+        from log_decoder import LogDecoder
+
+        listener.w3.eth.get_logs.side_effect = lambda log_filter: []
+        block_number = PropertyMock(return_value=99)
+        type(listener.w3.eth).block_number = block_number
+
+        windows = listener.iter_log_windows(LogDecoder(ERC20_ABI), chunk_size=50)
+        assert block_number.call_count == 0
+        assert listener.w3.eth.get_logs.call_count == 0
+
+        spans = [(lo, hi) for lo, hi, _ in windows]
+        assert spans[0][0] == 0 and spans[-1][1] == 99
+        assert block_number.call_count == 1
+
+    def test_decode_events_is_lazy(self, listener):
+        listener.contract.events.Transfer.get_logs = FakeGetLogs(max_span=10 ** 6)
+        raw = ({**log, 'event': 'Transfer', 'transactionHash': b'\x01'}
+               for log in listener.iter_past_events('Transfer', from_block=0, to_block=99,
+                                                    chunk_size=10))
+
+        decoded = listener.decode_events(raw)
+
+        assert next(decoded)['block_number'] == 0
+        assert next(decoded)['log_index'] == 1
@@ -0,0 +1,74 @@
+"""
+Tests for the fee-history gas oracle
+"""
+import pytest
+from gas_oracle import GasOracle
+
+
+class FakeFeeHistory:
+    """eth_feeHistory over a synthetic chain; block b pays base fee 1000 + b"""
+
+    def __init__(self, head):
+        self.head = head
+        self.requests = []
+
+    def __call__(self, count, newest, percentiles):
+        self.requests.append((count, newest))
+        blocks = range(newest - count + 1, newest + 1)
+        return {
+            'oldestBlock': hex(blocks[0]),
+            'baseFeePerGas': [hex(1000 + b) for b in range(blocks[0], newest + 2)],
+            'gasUsedRatio': [0.5] * count,
+            'reward': [[hex(p * 100 + b) for p in percentiles] for b in blocks],
+        }
+
+
+@pytest.fixture
+def chain():
+    fake = FakeFeeHistory(head=100)
+    oracle = GasOracle(fake, lambda: hex(fake.head), window=5)
+    return fake, oracle
+
+
+class TestGasOracle:
+    """Test ring buffer updates and suggestions"""
+
+    def test_first_refresh_fills_window(self, chain):
+        fake, oracle = chain
+        assert oracle.refresh() == 5
+        assert fake.requests == [(5, 100)]
+        assert oracle.next_base_fee == 1101
+        # normal = median of the p50 rewards of blocks 96..100
+        assert oracle.suggest('normal') == {
+            'maxFeePerGas': int(1101 * 1.25) + 5098,
+            'maxPriorityFeePerGas': 5098,
+        }
+
+    def test_refresh_only_fetches_new_blocks(self, chain):
+        fake, oracle = chain
+        oracle.refresh()
+        fake.head = 102
+        assert oracle.refresh() == 2
+        assert fake.requests[-1] == (2, 102)
+        assert oracle.refresh() == 0
+        assert sorted(oracle.base_fees) == [1098, 1099, 1100, 1101, 1102]
+        assert oracle.priority_fee('fast') == 9100
+
+    def test_long_gap_refetches_window_only(self, chain):
+        fake, oracle = chain
+        oracle.refresh()
+        fake.head = 1000
+        assert oracle.refresh() == 5
+        assert fake.requests[-1] == (5, 1000)
+        assert oracle.priority_fee('slow') == 1998
+
+    def test_tiers_are_ordered(self, chain):
+        _, oracle = chain
+        fees = oracle.suggestions()
+        assert (fees['slow']['maxFeePerGas'] < fees['normal']['maxFeePerGas']
+                < fees['fast']['maxFeePerGas'])
+
+    def test_unknown_tier(self, chain):
+        _, oracle = chain
+        with pytest.raises(ValueError):
+            oracle.suggest('instant')
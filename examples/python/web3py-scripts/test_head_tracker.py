@@ -0,0 +1,170 @@
+"""
+Tests for reorg-aware head tracking
+"""
+import pytest
+from head_tracker import BlockRing, HeadTracker, ReorgAwareWatcher
+
+
+class FakeChain:
+    """In-memory chain whose blocks can be replaced to simulate reorgs"""
+
+    def __init__(self, length):
+        self.blocks = []
+        self.extend(length, fork='a')
+
+    def extend(self, count, fork):
+        for _ in range(count):
+            number = len(self.blocks)
+            parent = self.blocks[-1]['hash'] if self.blocks else b'\x00' * 32
+            block_hash = f'{fork}{number}'.encode().ljust(32, b'\x00')
+            self.blocks.append({'number': number, 'hash': block_hash, 'parentHash': parent})
+
+    def reorg(self, depth, count, fork):
+        """Drop the last `depth` blocks and mine `count` on a new fork"""
+        del self.blocks[-depth:]
+        self.extend(count, fork)
+
+    @property
+    def head(self):
+        return len(self.blocks) - 1
+
+    def get_block(self, number):
+        return self.blocks[number]
+
+    def get_logs(self, lo, hi):
+        """One log per block, tagged with its block hash"""
+        return [
+            {'blockNumber': n, 'blockHash': self.blocks[n]['hash'], 'logIndex': 0}
+            for n in range(lo, hi + 1)
+        ]
+
+
+class TestBlockRing:
+    """Test the ring buffer"""
+
+    def test_old_entries_are_overwritten(self):
+        ring = BlockRing(capacity=4)
+        for n in range(10):
+            ring.put(n, bytes([n]), b'')
+
+        assert ring.get(5) is None
+        assert ring.hash_of(9) == bytes([9])
+
+
+class TestHeadTracker:
+    """Test incremental reorg detection"""
+
+    def test_no_reorg(self):
+        chain = FakeChain(10)
+        tracker = HeadTracker(chain.get_block)
+        tracker.update(chain.head)
+
+        chain.extend(3, fork='a')
+
+        assert tracker.update(chain.head) is None
+
+    def test_detects_fork_point(self):
+        chain = FakeChain(20)
+        tracker = HeadTracker(chain.get_block)
+        for head in range(10, 20):
+            tracker.update(head)
+
+        chain.reorg(depth=3, count=4, fork='b')
+
+        assert tracker.update(chain.head) == 17
+        assert tracker.ring.hash_of(17) == chain.blocks[17]['hash']
+
+    def test_same_height_reorg(self):
+        chain = FakeChain(20)
+        tracker = HeadTracker(chain.get_block)
+        for head in range(10, 20):
+            tracker.update(head)
+
+        chain.reorg(depth=2, count=2, fork='b')
+
+        assert tracker.update(chain.head) == 18
+
+    def test_head_reorg_right_after_startup(self):
+        chain = FakeChain(10)
+        tracker = HeadTracker(chain.get_block)
+        tracker.update(9)
+
+        chain.reorg(depth=1, count=2, fork='b')
+
+        # Block 8 was never tracked, so the walk stops at the replaced head
+        assert tracker.update(chain.head) == 9
+        assert tracker.ring.hash_of(9) == chain.blocks[9]['hash']
+
+    def test_history_traces_reorg_below_first_head(self):
+        chain = FakeChain(20)
+        tracker = HeadTracker(chain.get_block, history=5)
+        tracker.update(chain.head)
+
+        chain.reorg(depth=4, count=4, fork='b')
+
+        assert tracker.update(chain.head) == 16
+        assert tracker.ring.hash_of(15) == chain.blocks[15]['hash']
+
+    def test_reorg_deeper_than_ring_raises(self):
+        chain = FakeChain(30)
+        tracker = HeadTracker(chain.get_block, capacity=4)
+        for head in range(20, 30):
+            tracker.update(head)
+
+        chain.reorg(depth=8, count=9, fork='b')
+
+        with pytest.raises(RuntimeError):
+            tracker.update(chain.head)
+
+
+class TestReorgAwareWatcher:
+    """Test confirmed delivery and removal notifications"""
+
+    def make_watcher(self, chain, confirmations, history=0):
+        delivered, removed, fetched = [], [], []
+
+        def fetch(lo, hi):
+            fetched.append((lo, hi))
+            return chain.get_logs(lo, hi)
+
+        watcher = ReorgAwareWatcher(HeadTracker(chain.get_block, history=history), fetch,
+                                    delivered.append, removed.append, confirmations)
+        return watcher, delivered, removed, fetched
+
+    def test_delivers_at_confirmation_depth(self):
+        chain = FakeChain(10)
+        watcher, delivered, _, _ = self.make_watcher(chain, confirmations=3)
+        watcher.poll(chain.head)
+
+        chain.extend(5, fork='a')
+        watcher.poll(chain.head)
+
+        assert [log['blockNumber'] for log in delivered] == [7, 8, 9, 10, 11]
+
+    def test_reorg_emits_removed_and_refetches_window(self):
+        chain = FakeChain(10)
+        watcher, delivered, removed, fetched = self.make_watcher(chain, confirmations=0)
+        watcher.poll(chain.head)
+        chain.extend(5, fork='a')
+        watcher.poll(chain.head)
+
+        chain.reorg(depth=2, count=3, fork='b')
+        watcher.poll(chain.head)
+
+        assert [log['blockNumber'] for log in removed] == [14, 13]
+        assert fetched[-1] == (13, 15)
+        assert delivered[-1]['blockHash'] == chain.blocks[15]['hash']
+
+    def test_shallow_reorg_after_startup_retracts_delivered_logs(self):
+        chain = FakeChain(10)
+        watcher, delivered, removed, _ = self.make_watcher(chain, confirmations=2, history=2)
+        watcher.poll(chain.head)
+        chain.extend(2, fork='a')
+        watcher.poll(chain.head)
+        assert [log['blockNumber'] for log in delivered] == [8, 9]
+
+        chain.reorg(depth=4, count=5, fork='b')
+        watcher.poll(chain.head)
+
+        assert [log['blockNumber'] for log in removed] == [9, 8]
+        assert [log['blockHash'] for log in delivered[-3:]] == [chain.blocks[n]['hash'] for n in (8, 9, 10)]
@@ -0,0 +1,131 @@
+"""
+Tests for fast-path log decoder
+"""
+from unittest.mock import patch
+from eth_abi import encode
+from web3 import Web3
+import log_decoder
+from log_decoder import LogDecoder
+from conftest import ERC20_ABI, CONTRACT_ADDRESS
+
+SCROLL_ABI = [{
+    "anonymous": False,
+    "inputs": [
+        {"indexed": True, "name": "id", "type": "uint256"},
+        {"indexed": True, "name": "author", "type": "address"},
+        {"indexed": False, "name": "ipfsHash", "type": "string"},
+        {"indexed": False, "name": "title", "type": "string"},
+        {"indexed": False, "name": "timestamp", "type": "uint256"}
+    ],
+    "name": "ScrollPublished",
+    "type": "event"
+}]
+
+TRANSFER_TOPIC = '0x' + Web3.keccak(text='Transfer(address,address,uint256)').hex()[2:]
+
+
+def topic_address(n):
+    return '0x' + '00' * 12 + f'{n:040x}'
+
+
+def raw_transfer(i, value):
+    """Raw JSON-RPC Transfer log"""
+    return {
+        'address': CONTRACT_ADDRESS,
+        'topics': [TRANSFER_TOPIC, topic_address(i), topic_address(i + 1)],
+        'data': '0x' + encode(['uint256'], [value]).hex(),
+        'blockNumber': hex(100 + i),
+        'logIndex': hex(i % 7),
+        'transactionHash': '0x' + f'{i:064x}',
+    }
+
+
+class TestLogDecoder:
+    """Test decoding straight from raw log bytes"""
+
+    def test_decodes_transfer(self):
+        record = LogDecoder(ERC20_ABI).decode(raw_transfer(5, 10 ** 24))
+
+        assert record.event == 'Transfer'
+        assert record['from'] == '0x' + f'{5:040x}'
+        assert record['to'] == '0x' + f'{6:040x}'
+        assert record.value == 10 ** 24
+        assert record.block_number == 105
+        assert record.as_dict()['args']['value'] == 10 ** 24
+
+    def test_records_are_slotted(self):
+        record = LogDecoder(ERC20_ABI).decode(raw_transfer(1, 1))
+
+        assert not hasattr(record, '__dict__')
+
+    def test_checksum_addresses(self):
+        record = LogDecoder(ERC20_ABI, checksum_addresses=True).decode(raw_transfer(0xabc, 1))
+
+        assert record['from'] == Web3.to_checksum_address('0x' + f'{0xabc:040x}')
+
+    def test_dynamic_data_falls_back_to_abi_decode(self):
+        topic = '0x' + Web3.keccak(
+            text='ScrollPublished(uint256,address,string,string,uint256)'
+        ).hex()[2:]
+        raw = {
+            'address': CONTRACT_ADDRESS,
+            'topics': [topic, '0x' + f'{7:064x}', topic_address(9)],
+            'data': '0x' + encode(['string', 'string', 'uint256'], ['Qm123', 'Hello', 42]).hex(),
+            'blockNumber': 1, 'logIndex': 0, 'transactionHash': b'\x01' * 32,
+        }
+
+        record = LogDecoder(SCROLL_ABI).decode(raw)
+
+        assert (record.id, record.title, record.ipfsHash, record.timestamp) == (7, 'Hello', 'Qm123', 42)
+
+    def test_vectorized_path_matches_row_path(self):
+        raw_logs = [raw_transfer(i, i * 10 ** (i % 30)) for i in range(200)]
+        decoder = LogDecoder(ERC20_ABI)
+
+        vectorized = decoder.decode_batch(raw_logs)
+        with patch.object(log_decoder, 'np', None):
+            row_by_row = decoder.decode_batch(raw_logs)
+
+        assert [r.as_dict() for r in vectorized] == [r.as_dict() for r in row_by_row]
+
+    def test_uint64_column_fast_path(self):
+        values = [0, 2 ** 64 - 1, 1, 2 ** 63, 2 ** 32] + [i * 7919 ** 4 for i in range(195)]
+        raw_logs = [raw_transfer(i, value) for i, value in enumerate(values)]
+        decoder = LogDecoder(ERC20_ABI)
+
+        with patch.object(log_decoder, 'word_decoder', wraps=log_decoder.word_decoder) as fallback:
+            records = decoder.decode_batch(raw_logs)
+        # Every value fits in 64 bits, so no column falls back to per-word decoding
+        assert fallback.call_count == 0
+
+        row_decoder = log_decoder.word_decoder('uint256', False)
+        words = [bytes.fromhex(raw['data'][2:]) for raw in raw_logs]
+        assert [r.value for r in records] == [row_decoder(word) for word in words] == values
+        assert all(type(r.value) is int for r in records)
+
+    def test_records_go_through_decode_events(self, listener):
+        raw_logs = [raw_transfer(i, i * 10 ** 18) for i in range(3)]
+        listener.contract.abi = ERC20_ABI
+        listener.w3.eth.get_logs.side_effect = lambda log_filter: raw_logs
+
+        records = listener.iter_past_events('Transfer', from_block=100, to_block=102,
+                                            chunk_size=10, decoder=LogDecoder(ERC20_ABI))
+        decoded = list(listener.decode_events(records))
+
+        assert [event['args']['value'] for event in decoded] == [0, 10 ** 18, 2 * 10 ** 18]
+        assert decoded[1] == {
+            'event': 'Transfer',
+            'args': {'from': topic_address(1)[:2] + topic_address(1)[26:],
+                     'to': topic_address(2)[:2] + topic_address(2)[26:], 'value': 10 ** 18},
+            'block_number': 101,
+            'transaction_hash': '0x' + f'{1:064x}',
+            'log_index': 1,
+        }
+
+    def test_batch_preserves_order_and_skips_unknown(self):
+        raw_logs = [raw_transfer(i, i) for i in range(5)]
+        raw_logs.insert(2, {**raw_logs[0], 'topics': ['0x' + '11' * 32]})
+
+        records = LogDecoder(ERC20_ABI).decode_batch(raw_logs)
+
+        assert [r.value for r in records] == [0, 1, 2, 3, 4]
@@ -0,0 +1,96 @@
+"""
+Tests for the durable log store
+"""
+from hexbytes import HexBytes
+from log_store import LogStore
+from conftest import FakeGetLogs
+
+
+def web3_log(block, index, value):
+    """Log shaped like web3's decoded AttributeDict"""
+    return {
+        'event': 'Transfer',
+        'args': {'from': '0x' + '11' * 20, 'to': '0x' + '22' * 20, 'value': value,
+                 'memo': HexBytes(b'\x01\x02')},
+        'blockNumber': block,
+        'logIndex': index,
+        'transactionHash': HexBytes(b'\xab' * 32),
+    }
+
+
+class TestLogStore:
+    """Test storage and checkpoints"""
+
+    def test_page_write_advances_checkpoint(self, tmp_path):
+        with LogStore(str(tmp_path / 'events.db')) as store:
+            assert store.checkpoint('k') is None
+
+            store.write_page('k', [web3_log(5, 0, 10 ** 30), web3_log(5, 1, 2)], through_block=9)
+
+            assert store.checkpoint('k') == 9
+            rows = list(store.query('k'))
+            assert rows[0]['args']['value'] == 10 ** 30
+            assert rows[0]['args']['memo'] == '0x0102'
+            assert rows[0]['transaction_hash'] == '0x' + 'ab' * 32
+
+    def test_empty_page_still_checkpoints(self, tmp_path):
+        with LogStore(str(tmp_path / 'events.db')) as store:
+            store.write_page('k', [], through_block=100)
+            assert store.checkpoint('k') == 100
+
+    def test_survives_reopen(self, tmp_path):
+        path = str(tmp_path / 'events.db')
+        with LogStore(path) as store:
+            store.write_page('k', [web3_log(1, 0, 1)], through_block=1)
+
+        with LogStore(path) as store:
+            assert store.checkpoint('k') == 1
+            assert store.count('k') == 1
+
+    def test_rewind(self, tmp_path):
+        with LogStore(str(tmp_path / 'events.db')) as store:
+            store.write_page('k', [web3_log(b, 0, b) for b in range(10)], through_block=9)
+
+            store.rewind('k', 7)
+
+            assert store.checkpoint('k') == 6
+            assert [r['block_number'] for r in store.query('k', limit=2, newest_first=True)] == [6, 5]
+
+
+class TestSyncEvents:
+    """Test resumable backfill into the store"""
+
+    def test_resumes_from_checkpoint(self, listener, tmp_path):
+        get_logs = FakeGetLogs(max_span=10 ** 6)
+        listener.contract.events.Transfer.get_logs = lambda fromBlock, toBlock: [
+            {**log, 'event': 'Transfer', 'transactionHash': b'\x01'}
+            for log in get_logs(fromBlock, toBlock)
+        ]
+        listener.w3.eth.chain_id = 1
+
+        with LogStore(str(tmp_path / 'events.db')) as store:
+            listener.sync_events('Transfer', store, from_block=0, to_block=99, chunk_size=10)
+            get_logs.calls.clear()
+            listener.sync_events('Transfer', store, from_block=0, to_block=149, chunk_size=100)
+
+            assert get_logs.calls == [(100, 149)]
+            assert store.count(listener.filter_key('Transfer')) == 300
+
+    def test_stops_at_confirmation_depth(self, listener, tmp_path):
+        get_logs = FakeGetLogs(max_span=10 ** 6)
+        listener.contract.events.Transfer.get_logs = lambda fromBlock, toBlock: [
+            {**log, 'event': 'Transfer', 'transactionHash': b'\x01'}
+            for log in get_logs(fromBlock, toBlock)
+        ]
+        listener.w3.eth.chain_id = 1
+        listener.w3.eth.block_number = 1000
+
+        with LogStore(str(tmp_path / 'events.db')) as store:
+            listener.sync_events('Transfer', store, from_block=900, chunk_size=1000)
+            assert get_logs.calls[-1][1] == 988
+            assert store.checkpoint(listener.filter_key('Transfer')) == 988
+
+            # An explicit end inside the unconfirmed blocks is capped too
+            listener.w3.eth.block_number = 1005
+            listener.sync_events('Transfer', store, to_block=1000, chunk_size=1000, confirmations=6)
+            assert get_logs.calls[-1] == (989, 999)
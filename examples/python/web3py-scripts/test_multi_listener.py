@@ -0,0 +1,70 @@
+"""
+Tests for multiplexed event listener
+"""
+import pytest
+from unittest.mock import Mock, patch
+from web3 import Web3
+from multi_listener import MultiEventListener
+from conftest import ERC20_ABI
+
+TRANSFER_TOPIC = bytes(Web3.keccak(text='Transfer(address,address,uint256)'))
+APPROVAL_ABI = [{
+    "anonymous": False,
+    "inputs": [
+        {"indexed": True, "name": "owner", "type": "address"},
+        {"indexed": True, "name": "spender", "type": "address"},
+        {"indexed": False, "name": "value", "type": "uint256"}
+    ],
+    "name": "Approval",
+    "type": "event"
+}]
+TOKENS = ['0x' + f'{i:040x}' for i in range(1, 201)]
+
+
+@pytest.fixture
+def listener():
+    with patch('multi_listener.Web3') as mock_web3:
+        mock_web3.return_value.is_connected.return_value = True
+        mock_web3.to_checksum_address = Web3.to_checksum_address
+        mock_web3.keccak = Web3.keccak
+        return MultiEventListener('http://localhost:8545')
+
+
+class TestMultiEventListener:
+    """Test subscription multiplexing"""
+
+    def test_single_filter_for_many_contracts(self, listener):
+        for token in TOKENS:
+            listener.subscribe(token, ERC20_ABI, 'Transfer', Mock())
+        listener.subscribe(TOKENS[0], APPROVAL_ABI, 'Approval', Mock())
+
+        log_filter = listener.log_filter(from_block=10, to_block=20)
+
+        assert len(log_filter['address']) == 200
+        assert len(log_filter['topics']) == 1
+        assert len(log_filter['topics'][0]) == 2
+
+    def test_get_past_events_is_one_call(self, listener):
+        for token in TOKENS:
+            listener.subscribe(token, ERC20_ABI, 'Transfer', Mock())
+        listener.w3.eth.get_logs.return_value = []
+
+        listener.get_past_events(0, 100)
+
+        assert listener.w3.eth.get_logs.call_count == 1
+
+    def test_dispatch_routes_by_topic_and_address(self, listener):
+        first, second = Mock(), Mock()
+        listener.subscribe(TOKENS[0], ERC20_ABI, 'Transfer', first)
+        listener.subscribe(TOKENS[1], ERC20_ABI, 'Transfer', second)
+        for by_address in listener.routes.values():
+            for address, (event, callback) in by_address.items():
+                event.process_log = lambda raw: raw
+
+        address = Web3.to_checksum_address(TOKENS[1])
+        matched = listener.dispatch({'address': address, 'topics': [TRANSFER_TOPIC]})
+        unmatched = listener.dispatch({'address': address, 'topics': [b'\x00' * 32]})
+
+        assert matched and not unmatched
+        assert not first.called
+        second.assert_called_once()
@@ -0,0 +1,64 @@
+"""
+Tests for offline pre-signing and signed-batch files
+"""
+import pytest
+from eth_account import Account
+from eth_utils import keccak
+from presign import broadcast_signed_batch, read_signed_batch, sign_range, write_signed_batch
+
+KEY = '0x' + '22' * 32
+TEMPLATE = {
+    'chainId': 1,
+    'gas': 21000,
+    'maxFeePerGas': 30 * 10 ** 9,
+    'maxPriorityFeePerGas': 10 ** 9,
+    'value': 0,
+}
+RECIPIENTS = ['0x' + f"{i:040x}" for i in range(1, 6)]
+
+
+class TestPresign:
+    """Test signing across processes, the batch file and the broadcaster"""
+
+    def test_signs_nonce_range_in_order(self):
+        overrides = ({'to': to} for to in RECIPIENTS)
+        raws = list(sign_range(KEY, TEMPLATE, 40, overrides=overrides, workers=2, chunk_size=2))
+
+        assert len(raws) == 5
+        sender = Account.from_key(KEY).address
+        assert all(Account.recover_transaction(raw) == sender for raw in raws)
+        # Same bytes as signing one by one in process
+        expected = Account.from_key(KEY).sign_transaction({**TEMPLATE, 'to': RECIPIENTS[3], 'nonce': 43})
+        assert raws[3] == bytes(expected.rawTransaction)
+
+    def test_template_must_be_signable_offline(self):
+        with pytest.raises(ValueError, match='gasPrice'):
+            next(sign_range(KEY, {'chainId': 1, 'gas': 21000}, 0, count=1))
+        with pytest.raises(ValueError, match='nonce'):
+            next(sign_range(KEY, {**TEMPLATE, 'nonce': 1}, 0, count=1))
+
+    def test_batch_file_round_trip(self, tmp_path):
+        raws = list(sign_range(KEY, {**TEMPLATE, 'to': RECIPIENTS[0]}, 7, count=3, workers=1))
+        path = str(tmp_path / 'airdrop.sigb')
+
+        assert write_signed_batch(path, 1, 7, raws) == 3
+        header, records = read_signed_batch(path)
+        assert header == {'chain_id': 1, 'first_nonce': 7}
+        assert list(records) == raws
+
+    def test_rejects_foreign_file(self, tmp_path):
+        path = tmp_path / 'other.bin'
+        path.write_bytes(b'\0' * 32)
+        with pytest.raises(ValueError):
+            read_signed_batch(str(path))
+
+    def test_broadcast_streams_batches(self, rpc_server, tmp_path):
+        server = rpc_server({'eth_sendRawTransaction': lambda raw: '0x' + keccak(hexstr=raw).hex()})
+        raws = list(sign_range(KEY, {**TEMPLATE, 'to': RECIPIENTS[0]}, 0, count=5, workers=1))
+        path = str(tmp_path / 'batch.sigb')
+        write_signed_batch(path, 1, 0, raws)
+
+        hashes = list(broadcast_signed_batch(server.url, path, batch_size=2))
+
+        assert hashes == ['0x' + keccak(raw).hex() for raw in raws]
+        assert server.http_requests == 3
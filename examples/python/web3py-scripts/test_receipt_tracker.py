@@ -0,0 +1,121 @@
+"""
+Tests for the receipt tracker
+"""
+import asyncio
+import pytest
+from web3 import Web3
+from receipt_tracker import ReceiptTracker, web3_request_many
+
+
+def tx_hash(i):
+    return '0x' + f"{i:064x}"
+
+
+class FakeChain:
+    """JSON-RPC handlers over a chain where mine() puts hashes in a new block"""
+
+    def __init__(self):
+        self.head = 100
+        self.blocks = {}
+        self.mined = {}
+
+    def mine(self, *hashes):
+        self.head += 1
+        self.blocks[self.head] = list(hashes)
+        for h in hashes:
+            self.mined[h] = self.head
+
+    def receipt(self, h):
+        if h not in self.mined:
+            return None
+        return {'transactionHash': h, 'blockNumber': hex(self.mined[h]), 'status': '0x1',
+                'blockHash': '0x' + 'bb' * 32, 'transactionIndex': '0x0', 'gasUsed': '0x5208',
+                'cumulativeGasUsed': '0x5208', 'contractAddress': None, 'logs': [],
+                'from': '0x' + '11' * 20, 'to': '0x' + '22' * 20, 'effectiveGasPrice': '0x1',
+                'logsBloom': '0x' + '00' * 256, 'type': '0x2'}
+
+    def handlers(self):
+        return {
+            'eth_blockNumber': lambda: hex(self.head),
+            'eth_getBlockByNumber': lambda n, full: {'transactions': self.blocks.get(int(n, 16), [])},
+            'eth_getTransactionReceipt': self.receipt,
+        }
+
+
+@pytest.fixture
+def chain(rpc_server):
+    fake = FakeChain()
+    server = rpc_server(fake.handlers())
+    tracker = ReceiptTracker(web3_request_many(Web3(Web3.HTTPProvider(server.url))), poll_interval=0.01)
+    yield fake, server, tracker
+    tracker.close()
+
+
+class TestReceiptTracker:
+    """Test head-driven matching, batching, timeouts and asyncio use"""
+
+    def test_fetches_receipts_only_for_matched_hashes(self, chain):
+        fake, server, _ = chain
+        # Poll by hand only
+        tracker = ReceiptTracker(web3_request_many(Web3(Web3.HTTPProvider(server.url))), poll_interval=60)
+        hashes = [tx_hash(i) for i in range(200)]
+        for h in hashes:
+            tracker.watch(h)
+        tracker.poll()  # first round checks everything once; nothing is mined yet
+        requested = tracker.receipts_requested
+
+        fake.mine(*hashes[:3], tx_hash(999))
+        assert tracker.poll() == 3
+
+        assert tracker.receipts_requested - requested == 3
+        assert len(tracker.pending) == 197
+        assert 'eth_getTransactionReceipt' in server.calls
+        tracker.close()
+
+    def test_wait_all_resolves_in_background(self, chain):
+        fake, server, tracker = chain
+        hashes = [tx_hash(i) for i in range(50)]
+        futures = [tracker.watch(h, timeout=5) for h in hashes]
+        fake.mine(*hashes[:25])
+        fake.mine(*hashes[25:])
+
+        receipts = tracker.wait_all(hashes, timeout=5)
+
+        assert [r['transactionHash'] for r in receipts] == hashes
+        assert all(f.done() for f in futures)
+        # One batched round trip per poll, not one per hash
+        assert server.http_requests < 50
+
+    def test_already_mined_hash_resolves(self, chain):
+        fake, _, tracker = chain
+        fake.mine(tx_hash(7))
+        tracker.poll()
+        assert tracker.wait(tx_hash(7), timeout=2)['blockNumber'] == hex(fake.head)
+
+    def test_timeout(self, chain):
+        _, _, tracker = chain
+        with pytest.raises(TimeoutError):
+            tracker.wait(tx_hash(1), timeout=0.05)
+        assert not tracker.pending
+
+    def test_wait_async(self, chain):
+        fake, _, tracker = chain
+
+        async def main():
+            waiters = [tracker.wait_async(tx_hash(i), timeout=5) for i in range(3)]
+            fake.mine(tx_hash(0), tx_hash(1), tx_hash(2))
+            return await asyncio.gather(*waiters)
+
+        receipts = asyncio.run(main())
+        assert [r['transactionHash'] for r in receipts] == [tx_hash(i) for i in range(3)]
+
+    def test_from_web3_formats_receipts(self, rpc_server):
+        fake = FakeChain()
+        server = rpc_server(fake.handlers())
+        tracker = ReceiptTracker.from_web3(Web3(Web3.HTTPProvider(server.url)), poll_interval=0.01)
+        fake.mine(tx_hash(5))
+
+        receipt = tracker.wait(bytes.fromhex(tx_hash(5)[2:]), timeout=2)
+        assert receipt.status == 1
+        assert receipt.blockNumber == fake.head
+        tracker.close()
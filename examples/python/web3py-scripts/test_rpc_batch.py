@@ -0,0 +1,62 @@
+"""
+Tests for JSON-RPC batching
+"""
+import pytest
+from rpc_batch import RPCBatch, hex_to_int
+
+
+HANDLERS = {
+    'eth_chainId': '0x1',
+    'eth_blockNumber': '0x10',
+    'eth_getBalance': lambda address, block: hex(int(address[-4:], 16)),
+}
+
+
+class TestRPCBatch:
+    """Test batched transport against a stub endpoint"""
+
+    def test_one_http_request_for_many_calls(self, rpc_server):
+        server = rpc_server(HANDLERS)
+
+        with RPCBatch(server.url) as batch:
+            chain_id = batch.add('eth_chainId')
+            balances = [batch.add('eth_getBalance', f'0x{i:040x}', 'latest') for i in range(20)]
+
+        assert server.http_requests == 1
+        assert hex_to_int(chain_id.result) == 1
+        assert [hex_to_int(call.result) for call in balances] == list(range(20))
+
+    def test_rpc_errors_raise_on_access(self, rpc_server):
+        server = rpc_server(HANDLERS)
+
+        with RPCBatch(server.url) as batch:
+            ok = batch.add('eth_blockNumber')
+            missing = batch.add('eth_unknown')
+
+        assert ok.result == '0x10'
+        with pytest.raises(ValueError):
+            missing.result
+
+    def test_splits_at_max_batch_size(self, rpc_server):
+        server = rpc_server(HANDLERS)
+        batch = RPCBatch(server.url, max_batch_size=8)
+
+        for _ in range(20):
+            batch.add('eth_chainId')
+        batch.flush()
+
+        assert server.http_requests == 3
+
+    def test_falls_back_without_batch_support(self, rpc_server):
+        server = rpc_server(HANDLERS, batching=False)
+
+        with RPCBatch(server.url) as batch:
+            calls = [batch.add('eth_blockNumber') for _ in range(3)]
+
+        assert [call.result for call in calls] == ['0x10'] * 3
+
+    def test_result_before_flush(self):
+        call = RPCBatch('http://127.0.0.1:1').add('eth_chainId')
+
+        with pytest.raises(RuntimeError):
+            call.result
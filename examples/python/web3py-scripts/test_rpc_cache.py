@@ -0,0 +1,82 @@
+"""
+Tests for the persistent RPC response cache
+"""
+import math
+from unittest.mock import patch
+from rpc_cache import FINALITY_DEPTH, RPCCache, cache_ttl
+
+
+class TestCacheTTL:
+    """Test which answers are immutable"""
+
+    def test_final_block_is_permanent(self):
+        head = 1000
+        assert cache_ttl('eth_getBlockByNumber', [hex(head - FINALITY_DEPTH), False], {}, head) == math.inf
+        assert cache_ttl('eth_getBlockByNumber', [hex(head - 1), False], {}, head) == 2
+        assert cache_ttl('eth_getBlockByNumber', [hex(10), False], {}, None) == 2
+
+    def test_tags_and_volatile_methods_are_short_lived(self):
+        assert cache_ttl('eth_getBlockByNumber', ['latest', False], {}, 1000) == 2
+        assert cache_ttl('eth_gasPrice', [], '0x1', None) == 5
+        assert cache_ttl('eth_chainId', [], '0x1', None) == math.inf
+
+    def test_pending_and_missing_are_not_cached(self):
+        assert cache_ttl('eth_getTransactionByHash', ['0xab'], {'blockNumber': None}, 1000) is None
+        assert cache_ttl('eth_getTransactionReceipt', ['0xab'], None, 1000) is None
+        assert cache_ttl('eth_getBalance', ['0x00', 'latest'], '0x1', 1000) is None
+
+    def test_mined_transaction_follows_block_finality(self):
+        tx = {'blockNumber': hex(900)}
+        assert cache_ttl('eth_getTransactionByHash', ['0xab'], tx, 1000) == math.inf
+        assert cache_ttl('eth_getTransactionByHash', ['0xab'], tx, 920) == 2
+
+
+class TestRPCCache:
+    """Test storage, expiry and eviction"""
+
+    def test_round_trip_and_counters_persist(self, tmp_path):
+        path = str(tmp_path / 'cache.db')
+        with RPCCache(path) as cache:
+            key = cache.key('http://node', 'eth_getBlockByHash', ['0x11', False])
+            assert cache.get(key) is None
+            cache.put(key, {'number': '0x1'})
+            assert cache.get(key) == {'number': '0x1'}
+
+        with RPCCache(path) as cache:
+            assert cache.get(key) == {'number': '0x1'}
+            stats = cache.stats()
+            assert (stats['total_hits'], stats['total_misses']) == (2, 1)
+
+    def test_key_separates_endpoints(self):
+        assert RPCCache.key('a', 'eth_chainId', []) != RPCCache.key('b', 'eth_chainId', [])
+        assert RPCCache.key('a', 'eth_chainId', []) == RPCCache.key('a', 'eth_chainId', ())
+
+    def test_expired_entry_misses(self, tmp_path):
+        with RPCCache(str(tmp_path / 'cache.db')) as cache:
+            with patch('rpc_cache.time.time', return_value=100.0):
+                cache.put('k', '0x1', ttl=2)
+            with patch('rpc_cache.time.time', return_value=101.0):
+                assert cache.get('k') == '0x1'
+            with patch('rpc_cache.time.time', return_value=103.0):
+                assert cache.get('k') is None
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        value = 'x' * 100
+        with RPCCache(str(tmp_path / 'cache.db'), max_bytes=350) as cache:
+            for i, key in enumerate(['a', 'b', 'c']):
+                with patch('rpc_cache.time.time', return_value=float(i)):
+                    cache.put(key, value)
+            with patch('rpc_cache.time.time', return_value=10.0):
+                cache.get('a')
+            with patch('rpc_cache.time.time', return_value=11.0):
+                cache.put('d', value)
+
+            assert cache.get('b') is None
+            assert cache.get('a') == value
+            assert cache.stats()['bytes'] <= 350
+
+    def test_many_keeps_key_order(self, tmp_path):
+        with RPCCache(str(tmp_path / 'cache.db')) as cache:
+            cache.put_many([('a', 1, math.inf), ('c', 3, math.inf)])
+            assert cache.get_many(['c', 'b', 'a']) == [3, None, 1]
+            assert (cache.hits, cache.misses) == (2, 1)
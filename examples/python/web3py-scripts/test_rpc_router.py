@@ -0,0 +1,121 @@
+"""
+Tests for the multi-endpoint RPC router
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from rpc_batch import RPCBatch
+from rpc_router import RPCRouter
+
+
+HANDLERS = {
+    'eth_chainId': '0x1',
+    'eth_blockNumber': '0x10',
+    'eth_sendRawTransaction': '0x' + 'ab' * 32,
+    'eth_getTransactionCount': '0x7',
+}
+
+
+def make_router(*servers, **kwargs):
+    return RPCRouter([server.url for server in servers], **kwargs)
+
+
+class TestRPCRouter:
+    """Test routing, hedging and pinning against delayed stub endpoints"""
+
+    def test_routes_reads_to_fastest(self, rpc_server):
+        slow = rpc_server(HANDLERS, delay=0.1)
+        fast = rpc_server(HANDLERS, delay=0.0)
+        router = make_router(slow, fast, hedge=False)
+
+        for _ in range(10):
+            assert router.request('eth_blockNumber') == '0x10'
+
+        assert router.ranked()[0].url == fast.url
+        # Each endpoint is probed once; everything after goes to the fast one
+        assert len(slow.calls) <= 1
+        assert len(fast.calls) >= 9
+        router.close()
+
+    def test_hedges_past_p95(self, rpc_server):
+        primary = rpc_server(HANDLERS, delay=0.0)
+        backup = rpc_server(HANDLERS, delay=0.05)
+        router = make_router(primary, backup)
+        for _ in range(10):
+            router.request('eth_blockNumber')
+
+        primary.delay = 2.0
+        start = time.perf_counter()
+        assert router.request('eth_chainId') == '0x1'
+
+        assert time.perf_counter() - start < 1.0
+        assert router.hedges >= 1
+        assert 'eth_chainId' in backup.calls
+        router.close()
+
+    def test_counts_every_hedge_across_threads(self, rpc_server):
+        primary = rpc_server(HANDLERS, delay=0.0)
+        backup = rpc_server(HANDLERS, delay=0.02)
+        router = make_router(primary, backup, max_workers=64)
+        for _ in range(10):
+            router.request('eth_blockNumber')
+
+        warmup_hedges = router.hedges
+        primary.delay = 0.5
+        with ThreadPoolExecutor(max_workers=24) as pool:
+            results = list(pool.map(lambda _: router.request('eth_chainId'), range(24)))
+
+        assert results == ['0x1'] * 24
+        assert router.hedges - warmup_hedges == 24
+        assert sum(endpoint['requests'] for endpoint in router.stats()) >= 10 + 24
+        router.close()
+
+    def test_fails_over_from_dead_endpoint(self, rpc_server):
+        live = rpc_server(HANDLERS)
+        router = RPCRouter(['http://127.0.0.1:1', live.url], timeout=1)
+
+        for _ in range(3):
+            assert router.request('eth_chainId') == '0x1'
+
+        dead = router.endpoints[0]
+        assert dead.error_rate > 0
+        assert router.ranked()[0].url == live.url
+        router.close()
+
+    def test_writes_stay_pinned(self, rpc_server):
+        writer = rpc_server(HANDLERS, delay=0.05)
+        reader = rpc_server(HANDLERS)
+        router = make_router(writer, reader, hedge=False)
+        for _ in range(5):
+            router.request('eth_blockNumber')
+
+        router.request('eth_getTransactionCount', '0x' + '11' * 20, 'pending')
+        router.request('eth_sendRawTransaction', '0x02')
+
+        assert 'eth_sendRawTransaction' in writer.calls
+        assert 'eth_getTransactionCount' in writer.calls
+        assert 'eth_sendRawTransaction' not in reader.calls
+        router.close()
+
+    def test_rpc_errors_are_answers(self, rpc_server):
+        only = rpc_server(HANDLERS)
+        router = make_router(only)
+
+        with pytest.raises(ValueError):
+            router.request('eth_unknown')
+        assert router.endpoints[0].error_rate == 0
+        router.close()
+
+    def test_batches_go_through_router(self, rpc_server):
+        slow = rpc_server(HANDLERS, delay=0.1)
+        fast = rpc_server(HANDLERS)
+        router = make_router(slow, fast, hedge=False)
+        router.request('eth_chainId')
+        router.request('eth_chainId')
+
+        with RPCBatch(router) as batch:
+            calls = [batch.add('eth_blockNumber') for _ in range(5)]
+
+        assert [call.result for call in calls] == ['0x10'] * 5
+        assert fast.calls.count('eth_blockNumber') == 5
+        router.close()
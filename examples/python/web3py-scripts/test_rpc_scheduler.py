@@ -0,0 +1,134 @@
+"""
+Tests for the RPC request scheduler
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+import pytest
+import requests
+from rpc_scheduler import (
+    AIMDLimiter, RequestScheduler, TokenBucket, backoff_delay, is_rate_limited
+)
+
+
+def http_error(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+class ThrottlingProvider:
+    """Answers 429 whenever more than `capacity` calls are in flight"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.in_flight = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, i):
+        with self._lock:
+            self.in_flight += 1
+            over = self.in_flight > self.capacity
+            self.throttled += over
+        try:
+            if over:
+                raise http_error(429)
+            time.sleep(0.002)
+            return i
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class TestRequestScheduler:
+    """Test rate limiting, AIMD and retries"""
+
+    def test_token_bucket_paces_calls(self):
+        bucket = TokenBucket(rate=100, burst=1)
+        start = time.perf_counter()
+        for _ in range(11):
+            bucket.acquire()
+        assert time.perf_counter() - start >= 0.09
+
+    def test_aimd_increase_and_single_decrease_per_round(self):
+        limiter = AIMDLimiter(initial=4, max_limit=10)
+        for _ in range(4):
+            limiter.release(limiter.acquire(), latency=0.01)
+        assert limiter.limit == pytest.approx(5, abs=0.2)
+
+        started = [limiter.acquire() for _ in range(3)]
+        for s in started:
+            limiter.release(s, throttled=True)
+        # Three 429s from the same round halve the limit once
+        assert limiter.limit == pytest.approx(2.5, abs=0.2)
+
+    def test_latency_target_counts_as_congestion(self):
+        limiter = AIMDLimiter(initial=8, latency_target=0.1)
+        limiter.release(limiter.acquire(), latency=0.5)
+        assert limiter.limit == 4
+
+    def test_retries_throttled_calls(self):
+        scheduler = RequestScheduler(base_delay=0.001)
+        outcomes = iter([http_error(429), http_error(503), 'ok'])
+
+        def flaky():
+            outcome = next(outcomes)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        assert scheduler.call(flaky) == 'ok'
+        assert scheduler.stats()['retries'] == 2
+        assert scheduler.stats()['throttled'] == 1
+
+    def test_honors_retry_after(self):
+        scheduler = RequestScheduler()
+        outcomes = iter([http_error(429, {'Retry-After': '0.05'}), 'ok'])
+
+        def flaky():
+            outcome = next(outcomes)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        with patch('rpc_scheduler.time.sleep') as sleep:
+            assert scheduler.call(flaky) == 'ok'
+        sleep.assert_called_once_with(0.05)
+
+    def test_other_errors_are_not_retried(self):
+        scheduler = RequestScheduler()
+        calls = []
+
+        def reverted():
+            calls.append(1)
+            raise ValueError({'code': 3, 'message': 'execution reverted'})
+
+        with pytest.raises(ValueError):
+            scheduler.call(reverted)
+        assert len(calls) == 1
+
+    def test_concurrency_converges_to_provider_limit(self):
+        provider = ThrottlingProvider(capacity=4)
+        scheduler = RequestScheduler(limiter=AIMDLimiter(initial=16), base_delay=0.01)
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(lambda i: scheduler.call(provider, i), range(400)))
+
+        assert results == list(range(400))
+        assert 2 <= scheduler.limiter.limit <= 8
+        # Throttling is rare once the limit has settled
+        assert provider.throttled < 100
+
+    def test_backoff_is_jittered_and_capped(self):
+        delays = {backoff_delay(10, base=1, cap=5) for _ in range(20)}
+        assert all(0 <= delay <= 5 for delay in delays)
+        assert len(delays) > 1
+
+    def test_rate_limit_detection(self):
+        assert is_rate_limited(http_error(429))
+        assert is_rate_limited(ValueError({'code': -32005, 'message': 'Request rate exceeded'}))
+        assert not is_rate_limited(ValueError({'code': -32005,
+                                               'message': 'query returned more than 10000 results'}))
@@ -0,0 +1,121 @@
+"""
+Tests for the EchoScroll indexer
+"""
+from unittest.mock import Mock
+from scroll_indexer import ScrollIndex, ScrollIndexer
+
+AUTHOR_A = '0x' + 'aa' * 20
+AUTHOR_B = '0x' + 'bb' * 20
+
+
+class Log(dict):
+    """web3-style event log"""
+
+
+def published(block, scroll_id, author, title, timestamp):
+    return Log(event='ScrollPublished', blockNumber=block, logIndex=0, args={
+        'id': scroll_id, 'author': author, 'ipfsHash': f'Qm{scroll_id}',
+        'title': title, 'timestamp': timestamp,
+    })
+
+
+def deleted(block, scroll_id, author):
+    return Log(event='ScrollDeleted', blockNumber=block, logIndex=1,
+               args={'id': scroll_id, 'author': author, 'timestamp': 0})
+
+
+def build_index():
+    index = ScrollIndex()
+    titles = ['Dragons', 'Dreams', 'Potions', 'Drakes', 'Runes']
+    for i, title in enumerate(titles, start=1):
+        index.apply(published(i, i, AUTHOR_A if i % 2 else AUTHOR_B, title, 1000 + i))
+    return index
+
+
+class TestScrollIndex:
+    """Test local indexes against contract semantics"""
+
+    def test_delete_matches_contract_swap_and_pop(self):
+        index = build_index()
+
+        index.apply(deleted(10, 2, AUTHOR_B))
+
+        # activeScrollIds [1,2,3,4,5] -> remove 2 -> [1,5,3,4]
+        assert index.active_page(0, 10) == ([1, 5, 3, 4], 4)
+        assert index.active_page(1, 2) == ([5, 3], 4)
+        assert index.active_page(9, 2) == ([], 4)
+
+    def test_author_lists(self):
+        index = build_index()
+        index.apply(deleted(10, 3, AUTHOR_A))
+
+        assert index.scrolls_by_author(AUTHOR_A.upper().replace('0X', '0x')) == [1, 5]
+        assert index.scrolls_by_author(AUTHOR_A, active_only=False) == [1, 3, 5]
+
+    def test_feed_and_title_prefix(self):
+        index = build_index()
+        index.apply(deleted(10, 4, AUTHOR_B))
+
+        assert [s.id for s in index.feed(limit=3)] == [5, 3, 2]
+        assert [s.id for s in index.feed(offset=1, limit=2, newest_first=False)] == [2, 3]
+        assert [s.title for s in index.search_title('dr')] == ['Dragons', 'Dreams']
+
+    def test_replayed_logs_are_ignored(self):
+        index = build_index()
+
+        assert not index.apply(published(3, 3, AUTHOR_A, 'Potions', 1003))
+        assert index.active_page(0, 10)[1] == 5
+
+    def test_snapshot_round_trip(self, tmp_path):
+        index = build_index()
+        index.apply_page([deleted(10, 1, AUTHOR_A)], through_block=12)
+        path = str(tmp_path / 'index.json')
+
+        index.save(path)
+        restored = ScrollIndex.load(path)
+
+        assert restored.block == 12
+        assert restored.active_page(0, 10) == index.active_page(0, 10)
+        assert [s.id for s in restored.feed()] == [s.id for s in index.feed()]
+
+        restored.apply(deleted(13, 5, AUTHOR_A))
+        assert restored.active_page(0, 10) == ([4, 2, 3], 3)
+
+
+class TestScrollIndexer:
+    """Test cold start from a snapshot"""
+
+    def test_sync_replays_only_after_snapshot(self, tmp_path):
+        path = str(tmp_path / 'index.json')
+        index = build_index()
+        index.block = 50
+        index.save(path)
+
+        listener = Mock()
+        listener.w3.eth.block_number = 82
+        listener.iter_log_windows.return_value = iter([(51, 80, [deleted(60, 1, AUTHOR_A)])])
+
+        indexer = ScrollIndexer(listener, snapshot_path=path)
+        applied = indexer.sync()
+
+        args = listener.iter_log_windows.call_args[0]
+        assert args[2:4] == (51, 80)
+        assert applied == 1
+        assert ScrollIndex.load(path).block == 80
+
+    def test_sync_stays_behind_head(self, tmp_path):
+        path = str(tmp_path / 'index.json')
+        listener = Mock()
+        listener.w3.eth.block_number = 100
+        listener.iter_log_windows.return_value = iter([])
+
+        indexer = ScrollIndexer(listener, snapshot_path=path, deploy_block=90)
+        indexer.sync(to_block=100, confirmations=6)
+
+        assert listener.iter_log_windows.call_args[0][2:4] == (90, 94)
+
+        # Nothing buried deep enough yet: no request at all
+        listener.iter_log_windows.reset_mock()
+        listener.w3.eth.block_number = 95
+        assert indexer.sync(confirmations=6) == 0
+        listener.iter_log_windows.assert_not_called()
@@ -0,0 +1,113 @@
+"""
+Tests for the incremental project compiler
+"""
+import re
+import pytest
+import solcx
+from compile_cache import CompileCache
+from packaging.version import Version
+from solc_project import SolcProject, parse_source
+
+INSTALLED = [Version('0.7.6'), Version('0.8.20'), Version('0.8.24')]
+
+
+def fake_compile_standard(standard_input, solc_version=None):
+    """Stands in for solc: one contract per `contract Name` in each selected file"""
+    contracts = {}
+    for unit in standard_input['settings']['outputSelection']:
+        names = re.findall(r'\b(?:contract|library)\s+(\w+)', standard_input['sources'][unit]['content'])
+        contracts[unit] = {
+            name: {'abi': [], 'evm': {'bytecode': {'object': f"{solc_version}:{name}"},
+                                      'deployedBytecode': {'object': ''}}}
+            for name in names
+        }
+    return {'contracts': contracts}
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    compiled = []
+
+    def compile_standard(standard_input, solc_version=None):
+        compiled.append(next(iter(standard_input['settings']['outputSelection'])))
+        return fake_compile_standard(standard_input, solc_version)
+
+    monkeypatch.setattr(solcx, 'compile_standard', compile_standard)
+    monkeypatch.setattr(solcx, 'get_installed_solc_versions', lambda: INSTALLED)
+
+    root = tmp_path / 'contracts'
+    (root / 'lib').mkdir(parents=True)
+    (root / 'lib' / 'Math.sol').write_text('pragma solidity ^0.8.0;\nlibrary Math {}\n')
+    (root / 'Token.sol').write_text(
+        'pragma solidity ^0.8.20;\nimport "./lib/Math.sol";\ncontract Token {}\n')
+    (root / 'Vault.sol').write_text(
+        'pragma solidity ^0.8.20;\nimport {Token} from "./Token.sol";\ncontract Vault {}\n')
+    (root / 'Legacy.sol').write_text('pragma solidity ^0.7.0;\ncontract Legacy {}\n')
+
+    def make():
+        return SolcProject(str(root), cache=CompileCache(str(tmp_path / 'cache')), workers=1)
+
+    return root, make, compiled
+
+
+class TestSolcProject:
+    """Test the import graph, version selection and incremental rebuilds"""
+
+    def test_parse_imports_and_pragma(self):
+        imports, pragma = parse_source('''
+            // import "./Commented.sol";
+            pragma solidity >=0.8.0 <0.9.0;
+            import "./A.sol";
+            import {B} from '../B.sol';
+            import * as C from "@lib/C.sol";
+        ''')
+        assert imports == ['./A.sol', '../B.sol', '@lib/C.sol']
+        assert pragma == '>=0.8.0 <0.9.0'
+
+    def test_compiles_every_contract_by_qualified_name(self, project):
+        _, make, _ = project
+        solc = make()
+        contracts = solc.compile()
+
+        assert sorted(contracts) == ['Legacy.sol:Legacy', 'Token.sol:Token',
+                                     'Vault.sol:Vault', 'lib/Math.sol:Math']
+        assert solc.dependencies('Vault.sol') == {'Vault.sol', 'Token.sol', 'lib/Math.sol'}
+        # Each unit gets the newest solc satisfying its whole import closure
+        assert contracts['Legacy.sol:Legacy']['bin'] == '0.7.6:Legacy'
+        assert contracts['Vault.sol:Vault']['bin'] == '0.8.24:Vault'
+
+    def test_recompiles_only_changed_closures(self, project):
+        root, make, compiled = project
+        make().compile()
+        compiled.clear()
+
+        solc = make()
+        solc.compile()
+        assert compiled == [] and solc.compiled == []
+
+        (root / 'Token.sol').write_text(
+            'pragma solidity ^0.8.20;\nimport "./lib/Math.sol";\ncontract Token { uint x; }\n')
+        solc = make()
+        solc.compile()
+        assert sorted(compiled) == ['Token.sol', 'Vault.sol']
+        assert solc.compiled == ['Token.sol', 'Vault.sol']
+
+    def test_unsatisfiable_pragma(self, project):
+        root, make, _ = project
+        (root / 'Future.sol').write_text('pragma solidity ^0.9.0;\ncontract Future {}\n')
+        solc = make()
+        solc.versions = INSTALLED
+        with pytest.raises(ValueError, match='Future.sol'):
+            solc.compile()
+
+    def test_process_pool(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(solcx, 'compile_standard', fake_compile_standard)
+        root = tmp_path / 'contracts'
+        root.mkdir()
+        for i in range(4):
+            (root / f"C{i}.sol").write_text(f"pragma solidity ^0.8.0;\ncontract C{i} {{}}\n")
+
+        solc = SolcProject(str(root), cache=CompileCache(str(tmp_path / 'cache')),
+                           versions=[Version('0.8.20')], workers=2)
+        monkeypatch.setattr('solc_project.ensure_solc', lambda version: None)
+        assert sorted(solc.compile()) == [f"C{i}.sol:C{i}" for i in range(4)]
@@ -0,0 +1,53 @@
+"""
+Tests for bulk wallet generation
+"""
+import json
+import os
+from eth_account import Account
+from wallet_batch import (
+    derive_key, encrypt_keystore, generate_wallets, read_batch, write_batch, write_keystores
+)
+
+# Cheap scrypt so the tests stay fast
+FAST_N = 2 ** 10
+
+
+class TestWalletBatch:
+    """Test keystore format, determinism and output files"""
+
+    def test_keystore_decrypts_with_eth_account(self):
+        key = derive_key(b'fixture', 0)
+        address = Account.from_key(key).address
+        keystore = encrypt_keystore(key, 'secret', address, n=FAST_N)
+
+        assert keystore['address'] == address[2:].lower()
+        assert keystore['crypto']['kdfparams']['n'] == FAST_N
+        assert Account.decrypt(keystore, 'secret') == key
+
+    def test_seeded_batches_are_reproducible(self):
+        first = list(generate_wallets(5, 'pw', seed=b'fixture', workers=2, scrypt_n=FAST_N, chunk_size=2))
+        second = list(generate_wallets(5, 'pw', seed=b'fixture', workers=1, scrypt_n=FAST_N))
+
+        assert [w['index'] for w in first] == list(range(5))
+        assert first == second
+        assert len({w['address'] for w in first}) == 5
+
+    def test_unseeded_batches_differ(self):
+        first = list(generate_wallets(2, 'pw', workers=1, scrypt_n=FAST_N))
+        second = list(generate_wallets(2, 'pw', workers=1, scrypt_n=FAST_N))
+        assert {w['address'] for w in first}.isdisjoint(w['address'] for w in second)
+
+    def test_write_keystores_and_batch(self, tmp_path):
+        wallets = list(generate_wallets(3, 'pw', seed=b'files', workers=1, scrypt_n=FAST_N))
+
+        directory = tmp_path / 'keys'
+        assert write_keystores(iter(wallets), str(directory)) == 3
+        names = sorted(os.listdir(directory))
+        assert names[0] == f"000000--{wallets[0]['keystore']['address']}.json"
+        assert os.stat(directory / names[0]).st_mode & 0o777 == 0o600
+        with open(directory / names[2]) as f:
+            assert Account.decrypt(json.load(f), 'pw') == derive_key(b'files', 2)
+
+        batch = tmp_path / 'keys.ndjson'
+        assert write_batch(iter(wallets), str(batch)) == 3
+        assert list(read_batch(str(batch))) == [w['keystore'] for w in wallets]
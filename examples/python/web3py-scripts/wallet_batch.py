@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Bulk Wallet Generation
+Generate many accounts across a process pool and write them as encrypted
+Web3 Secret Storage (v3) keystores
+"""
+
+import hashlib
+import json
+import os
+import secrets
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+# secp256k1 group order; private keys must lie in [1, N)
+SECP256K1_N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+
+# Same scrypt cost as Account.encrypt; test fleets can use far less
+DEFAULT_SCRYPT_N = 262144
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+
+def _derive(seed: bytes, label: bytes, index: int, counter: int = 0) -> bytes:
+    return hashlib.sha256(
+        seed + label + index.to_bytes(8, 'big') + counter.to_bytes(4, 'big')
+    ).digest()
+
+
+def derive_key(seed: bytes, index: int) -> bytes:
+    """
+    Deterministic private key number `index` of a seed
+
+    For reproducible test fixtures only: anyone who knows the seed knows
+    every key.
+    """
+    counter = 0
+    while True:
+        key = _derive(seed, b'key', index, counter)
+        if 0 < int.from_bytes(key, 'big') < SECP256K1_N:
+            return key
+        counter += 1
+
+
+def encrypt_keystore(
+    private_key: bytes,
+    password: str,
+    address: str,
+    n: int = DEFAULT_SCRYPT_N,
+    salt: Optional[bytes] = None,
+    iv: Optional[bytes] = None,
+    key_id: Optional[bytes] = None
+) -> Dict[str, Any]:
+    """
+    Encrypt a private key as a v3 keystore (scrypt + AES-128-CTR)
+
+    Produces the same structure as Account.encrypt, but takes salt, IV and
+    id from the caller so seeded batches are byte-for-byte reproducible.
+
+    Args:
+        private_key: 32-byte key
+        password: Keystore password
+        address: Checksum address of the key
+        n: scrypt cost parameter (power of two)
+        salt: 32-byte scrypt salt (default: random)
+        iv: 16-byte AES counter start (default: random)
+        key_id: 16 bytes for the keystore UUID (default: random)
+
+    Returns:
+        Keystore dict, decryptable with Account.decrypt
+    """
+    from Crypto.Cipher import AES
+    from Crypto.Util import Counter
+    from eth_utils import keccak
+
+    salt = salt or os.urandom(32)
+    iv = iv or os.urandom(16)
+    derived = hashlib.scrypt(password.encode(), salt=salt, n=n, r=SCRYPT_R, p=SCRYPT_P,
+                             dklen=32, maxmem=256 * SCRYPT_R * n)
+
+    cipher = AES.new(derived[:16], AES.MODE_CTR,
+                     counter=Counter.new(128, initial_value=int.from_bytes(iv, 'big')))
+    ciphertext = cipher.encrypt(private_key)
+
+    return {
+        'address': address[2:].lower(),
+        'crypto': {
+            'cipher': 'aes-128-ctr',
+            'cipherparams': {'iv': iv.hex()},
+            'ciphertext': ciphertext.hex(),
+            'kdf': 'scrypt',
+            'kdfparams': {'dklen': 32, 'n': n, 'p': SCRYPT_P, 'r': SCRYPT_R, 'salt': salt.hex()},
+            'mac': keccak(derived[16:32] + ciphertext).hex(),
+        },
+        'id': str(uuid.UUID(bytes=key_id or os.urandom(16), version=4)),
+        'version': 3,
+    }
+
+
+def _generate_chunk(
+    start: int,
+    count: int,
+    password: str,
+    seed: Optional[bytes],
+    n: int
+) -> List[Dict[str, Any]]:
+    """Worker: create and encrypt accounts start..start+count-1"""
+    from eth_account import Account
+
+    wallets = []
+    for index in range(start, start + count):
+        if seed is None:
+            key, salt, iv, key_id = secrets.token_bytes(32), None, None, None
+            while not 0 < int.from_bytes(key, 'big') < SECP256K1_N:
+                key = secrets.token_bytes(32)
+        else:
+            key = derive_key(seed, index)
+            salt = _derive(seed, b'salt', index)
+            iv = _derive(seed, b'iv', index)[:16]
+            key_id = _derive(seed, b'id', index)[:16]
+
+        address = Account.from_key(key).address
+        wallets.append({
+            'index': index,
+            'address': address,
+            'keystore': encrypt_keystore(key, password, address, n, salt, iv, key_id),
+        })
+    return wallets
+
+
+def generate_wallets(
+    count: int,
+    password: str,
+    seed: Optional[bytes] = None,
+    workers: Optional[int] = None,
+    scrypt_n: int = DEFAULT_SCRYPT_N,
+    chunk_size: int = 16
+) -> Iterator[Dict[str, Any]]:
+    """
+    Generate and encrypt `count` accounts across a process pool
+
+    Key generation and the scrypt step both run in the workers; scrypt
+    dominates, so throughput scales with the worker count. Wallets come
+    back in index order, which keeps seeded runs reproducible, with at
+    most two chunks per worker pending.
+
+    Args:
+        count: Accounts to generate
+        password: Password of every keystore
+        seed: Makes keys and keystores reproducible (test fixtures only)
+        workers: Processes (default: CPU count)
+        scrypt_n: scrypt cost of each keystore
+        chunk_size: Accounts per task sent to a worker
+
+    Yields:
+        {'index', 'address', 'keystore'} in index order
+    """
+    workers = workers or os.cpu_count() or 1
+    window = deque()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for start in range(0, count, chunk_size):
+            window.append(pool.submit(_generate_chunk, start, min(chunk_size, count - start),
+                                      password, seed, scrypt_n))
+            if len(window) >= 2 * workers:
+                yield from window.popleft().result()
+
+        while window:
+            yield from window.popleft().result()
+
+
+def _private(path: str, flags: int) -> int:
+    """open() opener: keystores are readable by their owner only"""
+    return os.open(path, flags, 0o600)
+
+
+def keystore_filename(wallet: Dict[str, Any]) -> str:
+    """Keystore file name; index first so a directory lists in generation order"""
+    return f"{wallet['index']:06d}--{wallet['keystore']['address']}.json"
+
+
+def write_keystores(wallets: Iterator[Dict[str, Any]], directory: str) -> int:
+    """
+    Write one keystore file per wallet
+
+    Returns:
+        Number of files written
+    """
+    os.makedirs(directory, exist_ok=True)
+    written = 0
+    for wallet in wallets:
+        with open(os.path.join(directory, keystore_filename(wallet)), 'w', opener=_private) as f:
+            json.dump(wallet['keystore'], f)
+        written += 1
+    return written
+
+
+def write_batch(wallets: Iterator[Dict[str, Any]], path: str) -> int:
+    """
+    Write every keystore to one file, one JSON keystore per line
+
+    Returns:
+        Number of keystores written
+    """
+    written = 0
+    with open(path, 'w', opener=_private) as f:
+        for wallet in wallets:
+            f.write(json.dumps(wallet['keystore']) + '\n')
+            written += 1
+    return written
+
+
+def read_batch(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream keystores back from a batch file"""
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)